@@ -0,0 +1,232 @@
+"""
+Benchmarks of enumeration, serialization, evaluation, and output compression
+throughput.
+
+Benchmarks follow the conventions of airspeed velocity (asv): classes define
+methods prefixed time_ (duration), peakmem_ (peak memory), or track_ (a
+returned value), an optional setup method called before each benchmark, an
+optional setup_cache method called once per benchmark process whose result
+is passed to each benchmark, and params/param_names to run each benchmark for
+several parameter values. They are run offline (without asv) by bench/run.py.
+
+Design spaces are synthetic tradespace searches (bin/gen_synthetic.py) of the
+following sizes (number of architectures): tiny (3, as gen_landsat8), small
+(84), medium (2268), and large (38700).
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+import collections
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCH_DIR, os.pardir))
+sys.path.insert(0, os.path.join(BENCH_DIR, os.pardir, "bin"))
+
+import tatc
+import gen_synthetic
+import tse
+import worker
+import orbits_proxy
+
+SIZES = collections.OrderedDict([
+    ("tiny", dict()),
+    ("small", dict(numberSatellites=4, numberPlanes=2, numberAltitudes=2,
+                   numberSatelliteTypes=2, numberStations=3)),
+    ("medium", dict(numberSatellites=12, numberPlanes=4, numberAltitudes=3,
+                    numberSatelliteTypes=3, numberStations=4, stationsPerNetwork=2)),
+    ("large", dict(numberSatellites=24, numberPlanes=6, numberAltitudes=5,
+                   numberSatelliteTypes=4, numberStations=6, stationsPerNetwork=2))
+])
+
+def build_search(size, duration="P0Y0M90D"):
+    """Builds a synthetic tradespace search of a named size (normalized by a
+    JSON round-trip as read by the tradespace search executive)."""
+    return tatc.TradespaceSearch.from_json(gen_synthetic.build_synthetic_tradespace_search(
+        duration=duration, **SIZES[size]).to_json())
+
+class Enumeration(object):
+    """Enumeration of architectures, constellations, and ground networks."""
+    params = [list(SIZES.keys())]
+    param_names = ["size"]
+
+    def setup(self, size):
+        self.designSpace = build_search(size).designSpace
+
+    def time_generate_architectures(self, size):
+        list(self.designSpace.generate_architectures())
+
+    def time_generate_constellations(self, size):
+        for constellation in self.designSpace.constellations:
+            constellation.generate_constellations(self.designSpace.satellites)
+
+    def time_generate_networks(self, size):
+        for network in self.designSpace.groundNetworks:
+            network.generate_networks(self.designSpace.groundStations)
+
+    def peakmem_generate_architectures(self, size):
+        list(self.designSpace.generate_architectures())
+
+    def track_architectures_per_second(self, size):
+        start = time.perf_counter()
+        count = len(list(self.designSpace.generate_architectures()))
+        return count/(time.perf_counter() - start)
+    track_architectures_per_second.unit = "architectures/s"
+
+class Serialization(object):
+    """JSON round-trips of architectures and tradespace searches."""
+    params = [["small", "medium"]]
+    param_names = ["size"]
+
+    def setup(self, size):
+        self.search = build_search(size)
+        self.architectures = list(self.search.designSpace.generate_architectures())
+        self.documents = [architecture.to_json() for architecture in self.architectures]
+
+    def time_architecture_to_json(self, size):
+        for architecture in self.architectures:
+            architecture.to_json()
+
+    def time_architecture_from_json(self, size):
+        for document in self.documents:
+            tatc.Architecture.from_json(document)
+
+    def time_search_round_trip(self, size):
+        tatc.TradespaceSearch.from_json(self.search.to_json())
+
+    def track_architectures_per_second(self, size):
+        start = time.perf_counter()
+        for architecture in self.architectures:
+            tatc.Architecture.from_json(architecture.to_json())
+        return len(self.architectures)/(time.perf_counter() - start)
+    track_architectures_per_second.unit = "architectures/s"
+
+class Evaluation(object):
+    """End-to-end tradespace search executive runs (one-day missions)."""
+    params = [["tiny"]]
+    param_names = ["size"]
+    repeat = 1 # analysis is memoized after the first run in a process
+
+    def setup_cache(self):
+        # one staged run shared by the per-stage benchmarks
+        return run_stages(build_search("tiny", "P1D"))
+
+    def setup(self, *args):
+        self.directory = tempfile.mkdtemp()
+        self.in_path = os.path.join(self.directory, "search.json")
+        with open(self.in_path, "w") as out_file:
+            build_search(args[-1], "P1D").to_json(out_file)
+
+    def teardown(self, *args):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def time_tse(self, stages, size):
+        with open(self.in_path, "r") as in_file:
+            tse.execute(in_file, self.directory)
+
+    def peakmem_tse(self, stages, size):
+        with open(self.in_path, "r") as in_file:
+            tse.execute(in_file, self.directory)
+
+    def track_architectures_per_second(self, stages, size):
+        return stages["architectures"]/sum(stages["times"].values())
+    track_architectures_per_second.unit = "architectures/s"
+
+    def track_stage_enumerate(self, stages, size):
+        return stages["times"]["enumerate"]
+    track_stage_enumerate.unit = "s"
+
+    def track_stage_write(self, stages, size):
+        return stages["times"]["write"]
+    track_stage_write.unit = "s"
+
+    def track_stage_orbits(self, stages, size):
+        return stages["times"]["orbits"]
+    track_stage_orbits.unit = "s"
+
+    def track_stage_instrument(self, stages, size):
+        return stages["times"]["instrument"]
+    track_stage_instrument.unit = "s"
+
+    def track_stage_cost_risk(self, stages, size):
+        return stages["times"]["cost_risk"]
+    track_stage_cost_risk.unit = "s"
+
+    def track_stage_launch(self, stages, size):
+        return stages["times"]["launch"]
+    track_stage_launch.unit = "s"
+
+CODECS = ["none", "gzip"] + (["zstd"] if tatc.is_zstd_available() else [])
+
+class Compression(object):
+    """Throughput and compression ratio of orbital analysis CSV outputs
+    written through streaming compression (one-day mission, tiny size)."""
+    params = [CODECS]
+    param_names = ["codec"]
+
+    def setup(self, codec):
+        self.directory = tempfile.mkdtemp()
+        search = build_search("tiny", "P1D")
+        architecture = next(search.designSpace.generate_architectures())
+        self.constellation = tatc.analyze_constellation(search.mission, architecture.constellation)
+        self.network = tatc.analyze_network(self.constellation, architecture.groundNetwork)
+        self.outputs = tatc.AnalysisOutputs(compression=None if codec == "none" else codec)
+
+    def teardown(self, codec):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def write(self, outputs):
+        """Writes outputs and returns the total size (bytes) of CSV files."""
+        orbits_proxy.write_outputs(self.constellation, self.network, self.directory, outputs)
+        return sum(os.path.getsize(os.path.join(self.directory, name))
+                   for name in os.listdir(self.directory) if ".csv" in name)
+
+    def time_write_outputs(self, codec):
+        self.write(self.outputs)
+
+    def track_compression_ratio(self, codec):
+        return self.write(tatc.AnalysisOutputs())/float(self.write(self.outputs))
+    track_compression_ratio.unit = "ratio"
+
+    def track_write_throughput(self, codec):
+        size = self.write(tatc.AnalysisOutputs())
+        start = time.perf_counter()
+        self.write(self.outputs)
+        return size/2.**20/(time.perf_counter() - start)
+    track_write_throughput.unit = "MiB/s"
+
+    def track_read_throughput(self, codec):
+        self.write(self.outputs)
+        start = time.perf_counter()
+        size = sum(len(chunk) for name in os.listdir(self.directory) if ".csv" in name
+                   for chunk in tatc.iter_frames(os.path.join(self.directory, name)))
+        return size/2.**20/(time.perf_counter() - start)
+    track_read_throughput.unit = "MiB/s"
+
+def run_stages(search):
+    """Runs the stages of the tradespace search executive in sequence (each
+    stage for all architectures) and returns the number of architectures and
+    duration (s) of each stage."""
+    directory = tempfile.mkdtemp()
+    times = collections.OrderedDict()
+    try:
+        start = time.perf_counter()
+        architectures = list(search.designSpace.generate_architectures())
+        tatc.prepare_costs(search.mission, architectures)
+        times["enumerate"] = time.perf_counter() - start
+        start = time.perf_counter()
+        arch_dirs = [
+            tse.write_architecture(architecture, os.path.join(directory, 'arch-{:}'.format(i)))
+            for i, architecture in enumerate(architectures)
+        ]
+        times["write"] = time.perf_counter() - start
+        for name, module in worker.MODULES.items():
+            start = time.perf_counter()
+            for arch_dir in arch_dirs:
+                module.evaluate(search, arch_dir)
+            times[name] = time.perf_counter() - start
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return {"architectures": len(architectures), "times": times}
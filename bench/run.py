@@ -0,0 +1,243 @@
+"""
+Runs the benchmark suite offline and keeps a history of results.
+
+Each benchmark (and parameter combination) runs in a separate process so
+caches do not carry over between benchmarks and the peak resident set size
+(RSS) of the process can be recorded. Results are appended to a JSON history
+file (default: bench/results/<machine>.json) with the commit and date of the
+run, and compared to the previous run in the history: durations (time_) and
+peak memory (peakmem_) exceeding the previous result by more than a
+threshold ratio are reported as regressions.
+
+Usage:
+    python bench/run.py [-b REGEX] [--quick] [--results PATH] [--threshold R]
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import pickle
+import inspect
+import argparse
+import platform
+import datetime
+import itertools
+import subprocess
+import collections
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PREFIXES = ("time_", "peakmem_", "track_")
+
+def get_peak_rss():
+    """Returns the peak resident set size (bytes) of this process."""
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # reported in bytes on macOS and kilobytes elsewhere
+    return rss if sys.platform == "darwin" else rss*1024
+
+def discover():
+    """Returns a list of (benchmark name, parameter values) tuples."""
+    import benchmarks
+    names = []
+    for class_name, cls in inspect.getmembers(benchmarks, inspect.isclass):
+        if cls.__module__ != benchmarks.__name__:
+            continue
+        params = list(itertools.product(*getattr(cls, "params", [[]])))
+        for method_name in sorted(vars(cls)):
+            if method_name.startswith(PREFIXES):
+                for values in params:
+                    names.append(("{0}.{1}".format(class_name, method_name), list(values)))
+    return names
+
+def get_key(name, values):
+    """Returns the result key of a benchmark and its parameter values."""
+    return "{0}({1})".format(name, ", ".join(str(value) for value in values))
+
+def run_setup_cache(class_name, cache_path):
+    """Runs the setup_cache method of a benchmark class (in a separate
+    process) and saves its result."""
+    import benchmarks
+    with open(cache_path, "wb") as out_file:
+        pickle.dump(getattr(benchmarks, class_name)().setup_cache(), out_file)
+
+def run_benchmark(name, values, cache_path=None, quick=False):
+    """Runs a benchmark in this process and returns its result."""
+    import benchmarks
+    class_name, method_name = name.split(".")
+    instance = getattr(benchmarks, class_name)()
+    method = getattr(instance, method_name)
+    args = list(values)
+    if cache_path is not None:
+        with open(cache_path, "rb") as in_file:
+            args = [pickle.load(in_file)] + args
+    if hasattr(instance, "setup"):
+        instance.setup(*args)
+    try:
+        result = collections.OrderedDict()
+        if method_name.startswith("time_"):
+            # repeat a given number of times or otherwise until a minimum
+            # number of repeats and total duration
+            repeat = getattr(method, "repeat", getattr(instance, "repeat", None))
+            minimum = 0 if quick or repeat else 1.
+            repeat = repeat or (1 if quick else 10)
+            samples, total = [], 0.
+            while len(samples) < repeat or (total < minimum and len(samples) < 100):
+                start = time.perf_counter()
+                method(*args)
+                samples.append(time.perf_counter() - start)
+                total += samples[-1]
+            samples.sort()
+            result["value"] = samples[0]
+            result["median"] = samples[len(samples)//2]
+            result["samples"] = len(samples)
+            result["unit"] = "s"
+        elif method_name.startswith("peakmem_"):
+            method(*args)
+            result["value"] = get_peak_rss()
+            result["unit"] = "bytes"
+        else:
+            result["value"] = method(*args)
+            result["unit"] = getattr(method, "unit", "")
+        result["peakRSS"] = get_peak_rss()
+        return result
+    finally:
+        if hasattr(instance, "teardown"):
+            instance.teardown(*args)
+
+def run_process(arguments):
+    """Runs this script with arguments in a new process and returns the
+    decoded JSON output."""
+    output = subprocess.check_output([sys.executable, os.path.abspath(__file__)] + arguments,
+                                     universal_newlines=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+def run_all(pattern=None, quick=False):
+    """Runs all benchmarks (matching a pattern) in separate processes and
+    returns an ordered dictionary of results."""
+    import benchmarks
+    import tempfile
+    results = collections.OrderedDict()
+    caches = {}
+    directory = tempfile.mkdtemp()
+    try:
+        for name, values in discover():
+            key = get_key(name, values)
+            if pattern is not None and not re.search(pattern, key):
+                continue
+            class_name = name.split(".")[0]
+            cache_path = None
+            if hasattr(getattr(benchmarks, class_name), "setup_cache"):
+                if class_name not in caches:
+                    caches[class_name] = os.path.join(directory, class_name + ".pickle")
+                    run_process(["--setup-cache", class_name, caches[class_name]])
+                cache_path = caches[class_name]
+            arguments = ["--child", name, json.dumps(values)]
+            if cache_path is not None:
+                arguments += ["--cache", cache_path]
+            if quick:
+                arguments.append("--quick")
+            try:
+                results[key] = run_process(arguments)
+            except subprocess.CalledProcessError as e:
+                results[key] = {"error": "exit status {0}".format(e.returncode)}
+            print_result(key, results[key])
+    finally:
+        import shutil
+        shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+def format_value(value, unit):
+    """Formats a result value with its unit."""
+    if unit == "s":
+        return "{0:.3g} ms".format(value*1e3) if value < 1 else "{0:.3g} s".format(value)
+    if unit == "bytes":
+        return "{0:.1f} MiB".format(value/2.**20)
+    return "{0:.4g} {1}".format(value, unit)
+
+def print_result(key, result):
+    """Prints a benchmark result."""
+    if "error" in result:
+        print("{0:<60} {1}".format(key, result["error"]))
+    else:
+        print("{0:<60} {1:>16}   (peak RSS {2})".format(key,
+            format_value(result["value"], result["unit"]),
+            format_value(result["peakRSS"], "bytes")))
+    sys.stdout.flush()
+
+def get_commit():
+    """Returns the current git commit hash (or None)."""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=BENCH_DIR,
+            stderr=subprocess.DEVNULL, universal_newlines=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def load_history(path):
+    """Loads the history of benchmark runs."""
+    if not os.path.isfile(path):
+        return []
+    with open(path, "r") as in_file:
+        return json.load(in_file)
+
+def save_history(path, history):
+    """Saves the history of benchmark runs."""
+    if not os.path.isdir(os.path.dirname(path)):
+        os.makedirs(os.path.dirname(path))
+    with open(path, "w") as out_file:
+        json.dump(history, out_file, indent=2)
+
+def get_regressions(previous, results, threshold):
+    """Returns a list of (key, previous value, value) tuples of durations and
+    peak memory exceeding previous results by more than a threshold ratio."""
+    regressions = []
+    for key, result in results.items():
+        name = key.split(".")[1]
+        if (key in previous and "value" in result and "value" in previous[key]
+                and name.startswith(("time_", "peakmem_"))
+                and result["value"] > previous[key]["value"]*(1 + threshold)):
+            regressions.append((key, previous[key]["value"], result["value"]))
+    return regressions
+
+if __name__ == "__main__":
+    sys.path.insert(0, BENCH_DIR)
+    parser = argparse.ArgumentParser(
+        description='Run benchmarks'
+    )
+    parser.add_argument('-b', '--bench', default=None,
+        help = "Regular expression selecting benchmarks to run")
+    parser.add_argument('--quick', action='store_true',
+        help = "Run each benchmark once (not saved to history)")
+    parser.add_argument('--results', default=os.path.join(BENCH_DIR, "results",
+        "{0}.json".format(platform.node() or "machine")),
+        help = "History file of benchmark results")
+    parser.add_argument('--threshold', type=float, default=0.2,
+        help = "Ratio of increase reported as a regression")
+    parser.add_argument('--child', nargs=2, help=argparse.SUPPRESS)
+    parser.add_argument('--cache', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--setup-cache', nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.setup_cache:
+        run_setup_cache(*args.setup_cache)
+        print(json.dumps(None))
+    elif args.child:
+        print(json.dumps(run_benchmark(args.child[0], json.loads(args.child[1]),
+                                       args.cache, args.quick)))
+    else:
+        results = run_all(args.bench, args.quick)
+        history = load_history(args.results)
+        regressions = get_regressions(history[-1]["results"] if history else {},
+                                      results, args.threshold)
+        for key, previous, value in regressions:
+            print("REGRESSION {0}: {1:.4g} -> {2:.4g} (+{3:.0%})".format(
+                key, previous, value, value/previous - 1))
+        if not args.quick:
+            history.append(collections.OrderedDict([
+                ("commit", get_commit()),
+                ("date", datetime.datetime.utcnow().isoformat() + "Z"),
+                ("python", platform.python_version()),
+                ("results", results)
+            ]))
+            save_history(args.results, history)
+        sys.exit(1 if regressions else 0)
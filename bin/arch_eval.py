@@ -1,3 +1,4 @@
+import tatc
 import argparse
 import os, errno
 
@@ -11,8 +12,9 @@ The architecture evalutator (arch_eval) coordinates the execution of analysis
 modules. It takes two arguments as inputs:
     in_file     A JSON formatted document containing the TradespaceSearch.
     arch_dir    A readable directory containing a JSON formatted document
-                containing the Architecture (arch.json) and the location where
-                all analysis outputs shall be written.
+                containing the Architecture (arch.json or the binary
+                arch.bin) and the location where all analysis outputs shall
+                be written.
 
 The execution worksflow processes the following analysis modules using
 proxy interfaces:
@@ -20,14 +22,28 @@ proxy interfaces:
  2. Instrument (instrument_proxy)
  3. Cost and Risk (cost_risk_proxy)
  4. Launch (launch_proxy)
+
+If the trace option is set, the duration of each analysis module (and its
+output writes) is written to a Chrome trace file (readable by chrome://tracing
+or Perfetto) and a summary of stage durations is printed.
 """
 
-def execute(in_file, arch_dir):
-    """Executes the architecture evaluator."""
-    orbits_proxy.execute(in_file, arch_dir)
-    instrument_proxy.execute(in_file, arch_dir)
-    cost_risk_proxy.execute(in_file, arch_dir)
-    launch_proxy.execute(in_file, arch_dir)
+def execute(in_file, arch_dir, modules=None):
+    """Executes the architecture evaluator, optionally running only a list of
+    analysis modules (by name)."""
+    arch = os.path.basename(os.path.normpath(arch_dir))
+    if modules is None or "orbits" in modules:
+        with tatc.span("orbits", arch=arch):
+            orbits_proxy.execute(in_file, arch_dir)
+    if modules is None or "instrument" in modules:
+        with tatc.span("instrument", arch=arch):
+            instrument_proxy.execute(in_file, arch_dir)
+    if modules is None or "cost_risk" in modules:
+        with tatc.span("cost_risk", arch=arch):
+            cost_risk_proxy.execute(in_file, arch_dir)
+    if modules is None or "launch" in modules:
+        with tatc.span("launch", arch=arch):
+            launch_proxy.execute(in_file, arch_dir)
 
 class readable_dir(argparse.Action):
     """Defines a custom argparse Action to identify a readable directory."""
@@ -58,5 +74,15 @@ if __name__ == "__main__":
         action = readable_dir,
         help = "Architecture directory to read inputs/write outputs"
     )
+    parser.add_argument(
+        '--trace',
+        default = None,
+        help = "Write a Chrome trace of stage durations to this file"
+    )
     args = parser.parse_args()
+    if args.trace:
+        tatc.enable_tracing()
     execute(args.infile, args.archdir)
+    if args.trace:
+        tatc.TRACER.write_chrome_trace(args.trace)
+        print(tatc.TRACER.format_summary())
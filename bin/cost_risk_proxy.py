@@ -8,8 +8,9 @@ The cost and risk analysis proxy performs cost and risk analysis for a given
 architecture. It takes two arguments as inputs:
     in_file     A JSON formatted document containing the TradespaceSearch.
     arch_dir    A readable directory containing a JSON formatted document
-                containing the Architecture (arch.json) and the location where
-                all analysis outputs shall be written.
+                containing the Architecture (arch.json or the binary
+                arch.bin) and the location where all analysis outputs shall
+                be written.
 
 Cost and risk analysis writes the following file to the architecture directory:
     CostRisk_output.json    JSON-formatted cost and risk analysis.
@@ -18,41 +19,23 @@ Cost and risk analysis writes the following file to the architecture directory:
 def execute(in_file, arch_dir):
     """Executes the cost and risk analysis proxy."""
     in_file.seek(0) # reset reading from start of file
-    search = tatc.TradespaceSearch.from_json(in_file)
-    arch_path = os.path.join(arch_dir, 'arch.json')
-    with open(arch_path, 'r') as arch_file:
-        arch = tatc.Architecture.from_json(arch_file)
+    evaluate(tatc.TradespaceSearch.from_json(in_file), arch_dir)
 
-    with open(os.path.join(arch_dir, 'CostRisk_output.json'), 'w', newline='') as outfile:
-        json.dump({
-        	"groundCost" : { "estimate" : 0, "fiscalYear" : 0, "standardError" : 0 },
-        	"hardwareCost" : { "estimate" : 0, "fiscalYear" : 0, "standardError" : 0 },
-        	"iatCost" : { "estimate" : 0, "fiscalYear" : 0, "standardError" : 0 },
-        	"launchCost" : { "estimate" : 0, "fiscalYear" : 0, "standardError" : 0 },
-        	"lifecycleCost" : { "estimate" : 0, "fiscalYear" : 0, "standardError" : 0 },
-            "nonRecurringCost" : { "estimate" : 0, "fiscalYear" : 0, "standardError" : 0 },
-            "operationsCost" : { "estimate" : 0, "fiscalYear" : 0, "standardError" : 0 },
-            "programCost" : { "estimate" : 0, "fiscalYear" : 0, "standardError" : 0 },
-            "recurringCost" : { "estimate" : 0, "fiscalYear" : 0, "standardError" : 0 },
-        	# "spacecraftRank" : [ { "fiscalYear" : 2019, "rank" : 0, "spacecraftIndex" : 0, "totalCost" : 0 } ],
-        	"systemRisk" : [
-                 { "category" : "Configuration Risks", "consequence" : 0, "likelihood" : 0, "risk" : "Risk of unforseen risk arising due to lack of flight heritage" },
-                 { "category" : "Configuration Risks", "consequence" : 0, "likelihood" : 0, "risk" : "Risk of 'infant mortality' significantly reducing science return (due to extended on orbit checkouts, assuming a catastrophic failure does not occur)" },
-                 { "category" : "Configuration Risks", "consequence" : 0, "likelihood" : 0, "risk" : "Risk that constellation does not observe intended coverage area following loss of one or more spacecraft" },
-                 { "category" : "Configuration Risks", "consequence" : 0, "likelihood" : 0, "risk" : "Risk of collision with orbital debris" },
-                 { "category" : "Configuration Risks", "consequence" : 0, "likelihood" : 0, "risk" : "Risk of interrupted installation" },
-                 { "category" : "Configuration Risks", "consequence" : 0, "likelihood" : 0, "risk" : "Risk of constellation formation change due to atmospheric drag" },
-                 { "category" : "Configuration Risks", "consequence" : 0, "likelihood" : 0, "risk" : "Risk of improper spacing between adjacent spacecraft due to atmospheric drag" },
-                 { "category" : "Satellite Performance Risks", "consequence" : 0, "likelihood" : 0, "risk" : "Risk of instrument design flaw" },
-                 { "category" : "Satellite Performance Risks", "consequence" : 0, "likelihood" : 0, "risk" : "Risk of instrument deployment failure" },
-                 { "category" : "Satellite Performance Risks", "consequence" : 0, "likelihood" : 0, "risk" : "Risk of premature instrument failure" },
-                 { "category" : "Spacecraft Risks", "consequence" : 0, "likelihood" : 0, "risk" : "Risk of radiation damage to spacecraft instrumentation" },
-                 { "category" : "Power Subsystem Risks", "consequence" : 0, "likelihood" : 0, "risk" : "Risk of excessive power subsystem degradation over lifetime" },
-                 { "category" : "Attitude Determination and Control Subsystem Risks", "consequence" : 0, "likelihood" : 0, "risk" : "Risk of improper attitude alignment" },
-                 { "category" : "Propulsion Subsystem Risks", "consequence" : 0, "likelihood" : 0, "risk" : "Risk of fuel related accident (e.g. propellant tank rupture, propulsion subsystem failure)" },
-                 { "category" : "Thermal Subsystem Risks", "consequence" : 0, "likelihood" : 0, "risk" : "Risk of thermal subsystem failure" }
-             ]
-         }, outfile, indent=2)
+def evaluate(search, arch_dir):
+    """Evaluates the cost and risk analysis proxy for a parsed tradespace search."""
+    # reads the binary architecture format (arch.bin) if available
+    arch = tatc.load_architecture(arch_dir)
+
+    # cost estimates are recalled if prepared in batch for a population of
+    # architectures (e.g. by the tradespace search executive)
+    output = tatc.estimate_cost(search.mission, arch, launchers=search.designSpace.launchers)
+    # system risks are estimated by Monte Carlo with a random stream seeded
+    # by the architecture so results are reproducible
+    output["systemRisk"] = tatc.analyze_risk(search.mission, arch,
+        search.settings.includePropulsion).to_list()
+    with tatc.span("cost_risk.outputs", arch=os.path.basename(os.path.normpath(arch_dir))):
+        with open(os.path.join(arch_dir, 'CostRisk_output.json'), 'w', newline='') as outfile:
+            json.dump(output, outfile, indent=2)
 
 class readable_dir(argparse.Action):
     """Defines a custom argparse Action to identify a readable directory."""
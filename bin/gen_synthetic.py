@@ -0,0 +1,85 @@
+import tatc
+import argparse
+import copy
+import numpy as np
+
+import gen_landsat8
+
+"""
+Generates a synthetic tradespace search of configurable size based on the
+Landsat 8 validation case (gen_landsat8) for benchmarking. The design space is
+extended by ranges of the number of satellites and orbital planes, a number of
+alternative altitudes, satellite variants (scaled Landsat 8), and candidate
+ground stations.
+"""
+
+def build_synthetic_tradespace_search(numberSatellites=2, numberPlanes=2,
+        numberAltitudes=1, numberSatelliteTypes=1, numberStations=1,
+        stationsPerNetwork=1, duration="P0Y0M90D"):
+    """Builds a synthetic TradespaceSearch with constellations of 1 to
+    numberSatellites satellites in 1 to numberPlanes planes at numberAltitudes
+    sun-synchronous altitudes (600-800 km), numberSatelliteTypes satellite
+    variants, and networks of stationsPerNetwork of numberStations stations."""
+    search = gen_landsat8.build_example_tradespace_search()
+    search.mission.duration = duration
+    designSpace = search.designSpace
+    constellation = designSpace.constellations[0]
+    constellation.numberSatellites = list(range(1, numberSatellites + 1))
+    constellation.numberPlanes = list(range(1, numberPlanes + 1))
+    if numberAltitudes > 1:
+        constellation.orbit = tatc.Orbit(
+            orbitType=tatc.OrbitType.SUN_SYNCHRONOUS,
+            altitude=np.linspace(600, 800, numberAltitudes).tolist()
+        )
+    landsat8 = designSpace.satellites[0]
+    designSpace.satellites = []
+    for i in range(numberSatelliteTypes):
+        # variants scale mass, volume, and power and widen the field of view
+        satellite = copy.deepcopy(landsat8)
+        scale = 1 + 0.25*i
+        satellite.name = "{0} ({1:d})".format(landsat8.name, i + 1)
+        satellite.acronym = satellite.name
+        satellite.mass = landsat8.mass*scale
+        satellite.volume = landsat8.volume*scale
+        satellite.power = landsat8.power*scale
+        satellite.payload.fieldOfView = landsat8.payload.fieldOfView*scale
+        designSpace.satellites.append(satellite)
+    station = designSpace.groundStations[0]
+    designSpace.groundStations = []
+    for i in range(numberStations):
+        # stations are spaced evenly in longitude
+        groundStation = copy.deepcopy(station)
+        groundStation.longitude = station.longitude + 360.*i/numberStations
+        groundStation.longitude -= 360. if groundStation.longitude > 180 else 0
+        designSpace.groundStations.append(groundStation)
+    designSpace.groundNetworks = [tatc.GroundNetwork(numberStations=stationsPerNetwork)]
+    return search
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description='Writes a synthetic tradespace search file')
+    parser.add_argument(
+        'outfile',
+        nargs = '?',
+        type = argparse.FileType('w'),
+        default = 'synthetic.json',
+        help = "Tradespace search output file"
+    )
+    parser.add_argument('--satellites', type=int, default=2,
+        help = "Maximum number of satellites per constellation")
+    parser.add_argument('--planes', type=int, default=2,
+        help = "Maximum number of orbital planes per constellation")
+    parser.add_argument('--altitudes', type=int, default=1,
+        help = "Number of alternative altitudes")
+    parser.add_argument('--satellite-types', type=int, default=1,
+        help = "Number of alternative satellite types")
+    parser.add_argument('--stations', type=int, default=1,
+        help = "Number of candidate ground stations")
+    parser.add_argument('--stations-per-network', type=int, default=1,
+        help = "Number of ground stations per network")
+    parser.add_argument('--duration', default="P0Y0M90D",
+        help = "Mission duration in ISO-8601 duration format")
+    args = parser.parse_args()
+    build_synthetic_tradespace_search(args.satellites, args.planes,
+        args.altitudes, args.satellite_types, args.stations,
+        args.stations_per_network, args.duration).to_json(args.outfile, indent=2)
@@ -3,14 +3,18 @@ import argparse
 import os
 import csv
 import json
+import numpy as np
+
+import orbits_proxy
 
 """
 The instrument analysis proxy analyzes instrument performance for a given
 architecture. It takes two arguments as inputs:
     in_file     A JSON formatted document containing the TradespaceSearch.
     arch_dir    A readable directory containing a JSON formatted document
-                containing the Architecture (arch.json) and the location where
-                all analysis outputs shall be written.
+                containing the Architecture (arch.json or the binary
+                arch.bin) and the location where all analysis outputs shall
+                be written.
 
 Instrument analysis writes the following files to the architecture directory:
     coverage_basic_sensor-#.csv  CSV-formatted list of coverage periods
@@ -41,93 +45,108 @@ Instrument analysis writes the following files to the architecture directory:
                 assuming synthetic aperture radar-type instruments.
 """
 
+COVERAGE_HEADERS = {
+    "basic_sensor": [
+        "Incidence angle [deg]", "Look angle [deg]", "Observation Range [km]"
+    ],
+    "optical_scanner": [
+        "Noise-Equivalent Delta T", "DR", "SNR",
+        "Ground Pixel Along-Track Resolution [m]",
+        "Ground Pixel Cross-Track Resolution [m]"
+    ],
+    "synthetic_aperture_radar": [
+        "Noise-Equivalent Sigma Naught", "Ground Pixel Along-Track Resolution [m]",
+        "Ground Pixel Cross-Track Resolution [m]", "Swath Width [m]",
+        "Incidence angle [deg]"
+    ]
+}
+
+LOCAL_METRICS = {
+    "basic_sensor": [
+        ("IncidenceAngle", "Incidence angle [deg]"), ("LookAngle", "Look angle [deg]"),
+        ("ObservationRange", "Observation Range [km]")
+    ],
+    "optical_scanner": [
+        ("NoiseEquivalentDeltaT", "NoiseEquivalentDeltaT"),
+        ("AlongTrackResolution", "AlongTrackResolution"),
+        ("CrossTrackResolution", "CrossTrackResolution"),
+        ("DynamicRange", "DynamicRange"), ("SignalToNoiseRatio", "SignalToNoiseRatio")
+    ],
+    "synthetic_aperture_radar": [
+        ("NoiseEquivalentSigma0", "NoiseEquivalentSigma0"),
+        ("AlongTrackResolution", "AlongTrackResolution"),
+        ("CrossTrackResolution", "CrossTrackResolution"),
+        ("SwathWidth", "SwathWidth"), ("IncidenceAngle", "IncidenceAngle")
+    ]
+}
+
 def execute(in_file, arch_dir):
     """Executes the instrument analysis proxy."""
     in_file.seek(0) # reset reading from start of file
-    search = tatc.TradespaceSearch.from_json(in_file)
-    arch_path = os.path.join(arch_dir, 'arch.json')
-    with open(arch_path, 'r') as arch_file:
-        arch = tatc.Architecture.from_json(arch_file)
+    evaluate(tatc.TradespaceSearch.from_json(in_file), arch_dir)
 
-    ## TODO read orbital outputs
-    for i, satellite in enumerate(arch.constellation[0].satellites):
-        with open(os.path.join(arch_dir, 'coverage_basic_sensor-{:d}.csv'.format(i)), 'w', newline='') as outfile:
-            writer = csv.writer(outfile)
-            writer.writerow([
-                "Access From [s]", "Access To [s]", "Lat[deg]", "Lon[deg]",
-                "POI index", "eventIdx", "Coverage [T/F]", "Incidence angle [deg]",
-                "Look angle [deg]", "Observation Range [km]"
-            ])
-        with open(os.path.join(arch_dir, 'coverage_optical_scanner-{:d}.csv'.format(i)), 'w', newline='') as outfile:
-            writer = csv.writer(outfile)
-            writer.writerow([
-                "Access From [s]", "Access To [s]", "Lat[deg]", "Lon[deg]",
-                "POI index", "eventIdx", "Coverage [T/F]", "Noise-Equivalent Delta T",
-                "DR", "SNR", "Ground Pixel Along-Track Resolution [m]",
-                "Ground Pixel Cross-Track Resolution [m]"
-            ])
-        with open(os.path.join(arch_dir, 'coverage_synthetic_aperture_radar-{:d}.csv'.format(i)), 'w', newline='') as outfile:
+def evaluate(search, arch_dir):
+    """Evaluates the instrument analysis proxy for a parsed tradespace search."""
+    # reads the binary architecture format (arch.bin) if available
+    arch = tatc.load_architecture(arch_dir)
+
+    # reuse orbital analysis from memory (same process) or from the binary
+    # sidecar written by the orbits proxy rather than parsing its CSV outputs
+    constellation = tatc.analyze_constellation(search.mission, arch.constellation,
+        sidecar=os.path.join(arch_dir, orbits_proxy.SIDECAR_FILE),
+        drag=not search.settings.includePropulsion)
+    coverage = tatc.analyze_coverage(constellation, arch.constellation.satellites)
+    with tatc.span("instrument.outputs", arch=os.path.basename(os.path.normpath(arch_dir))):
+        write_outputs(constellation, coverage, arch.constellation.satellites, arch_dir,
+                      search.settings.outputs)
+
+def write_outputs(constellation, coverage, satellites, arch_dir, outputs=None):
+    """Writes instrument analysis outputs to the architecture directory.
+    Outputs disabled or filtered by the analysis outputs settings are not
+    formatted (and files of disabled outputs are removed)."""
+    outputs = outputs or tatc.AnalysisOutputs()
+    latitudes, longitudes = constellation.points
+    points = outputs.get_point_mask(latitudes, longitudes)
+    for name, kernel in tatc.KERNELS.items():
+        for i, satellite in enumerate(satellites):
+            path = os.path.join(arch_dir, 'coverage_{:}-{:d}.csv'.format(name, i))
+            if not (outputs.coveragePeriods and outputs.is_satellite_selected(i)):
+                tatc.remove_output(path)
+                continue
+            results = coverage.get_results(name, i)
+            mask = outputs.get_period_mask(results, points)
+            with tatc.open_output(path, outputs.compression) as outfile:
+                writer = csv.writer(outfile)
+                writer.writerow([
+                    "Access From [s]", "Access To [s]", "Lat[deg]", "Lon[deg]",
+                    "POI index", "eventIdx", "Coverage [T/F]"
+                ] + COVERAGE_HEADERS.get(name, kernel.metrics))
+                point = results["point"][mask].astype(int)
+                writer.writerows(zip(
+                    results["start"][mask].tolist(), results["end"][mask].tolist(),
+                    latitudes[point].tolist(), longitudes[point].tolist(),
+                    point.tolist(), results["access"][mask].astype(int).tolist(),
+                    ["T" if c else "F" for c in results["coverage"][mask]],
+                    *[results[metric][mask].tolist() for metric in kernel.metrics]
+                ))
+        with open(os.path.join(arch_dir, 'gbl_{:}.json'.format(name)), 'w', newline='') as outfile:
+            json.dump(coverage.get_global_metrics(name), outfile, indent=2)
+        path = os.path.join(arch_dir, 'lcl_{:}.csv'.format(name))
+        if not outputs.localMetrics:
+            tatc.remove_output(path)
+            continue
+        metrics = LOCAL_METRICS.get(name, [(metric, metric) for metric in kernel.metrics])
+        local = coverage.get_local_metrics(name, len(latitudes))
+        indices = np.flatnonzero(points)
+        with tatc.open_output(path, outputs.compression) as outfile:
             writer = csv.writer(outfile)
-            writer.writerow([
-                "Access From [s]", "Access To [s]", "Lat[deg]", "Lon[deg]",
-                "POI index", "eventIdx", "Coverage [T/F]", "Noise-Equivalent Sigma Naught",
-                "Ground Pixel Along-Track Resolution [m]",
-                "Ground Pixel Cross-Track Resolution [m]", "Swath Width [m]",
-                "Incidence angle [deg]"
-            ])
-    with open(os.path.join(arch_dir, 'gbl_basic_sensor.json'), 'w', newline='') as outfile:
-        json.dump({
-            "IncidenceAngle" : {"min" : 0, "max" : 0},
-            "LookAngle" : {"min": 0, "max": 0, "avg": 0},
-            "ObservationRange" : {"min": 0, "max": 0, "avg": 0}
-        }, outfile, indent=2)
-    with open(os.path.join(arch_dir, 'lcl_basic_sensor.csv'), 'w', newline='') as outfile:
-        writer = csv.writer(outfile)
-        writer.writerow([
-            "POI index", "[deg]", "[deg]", "Incidence angle [deg]", "", "",
-            "Look angle [deg]", "", "", "Observation Range [km]", "", ""
-        ])
-        writer.writerow([
-            "POI", "lat", "lon", "min", "max", "avg", "min", "max", "avg", "min", "max", "avg"
-        ])
-    with open(os.path.join(arch_dir, 'gbl_optical_scanner.json'), 'w', newline='') as outfile:
-        json.dump({
-            "NoiseEquivalentDeltaT" : {"min": 0, "max": 0, "avg": 0},
-            "AlongTrackResolution" : {"min": 0, "max": 0, "avg": 0},
-            "CrossTrackResolution" : {"min": 0, "max": 0, "avg": 0},
-            "DynamicRange" : {"min": 0, "max": 0, "avg": 0},
-            "SignalToNoiseRatio" : {"min": 0, "max": 0, "avg": 0}
-        }, outfile, indent=2)
-    with open(os.path.join(arch_dir, 'lcl_optical_scanner.csv'), 'w', newline='') as outfile:
-        writer = csv.writer(outfile)
-        writer.writerow([
-            "POI index", "[deg]", "[deg]", "NoiseEquivalentDeltaT", "", "",
-            "AlongTrackResolution", "", "", "CrossTrackResolution", "", "",
-            "DynamicRange", "", "", "SignalToNoiseRatio", "", ""
-        ])
-        writer.writerow([
-            "POI", "lat", "lon", "min", "max", "avg", "min", "max", "avg",
-            "min", "max", "avg", "min", "max", "avg", "min", "max", "avg"
-        ])
-    with open(os.path.join(arch_dir, 'gbl_synthetic_aperture_radar.json'), 'w', newline='') as outfile:
-        json.dump({
-            "NoiseEquivalentSigma0" : {"min": 0, "max": 0, "avg": 0},
-            "AlongTrackResolution" : {"min": 0, "max": 0, "avg": 0},
-            "CrossTrackResolution" : {"min": 0, "max": 0, "avg": 0},
-            "SwathWidth" : {"min": 0, "max": 0, "avg": 0},
-            "IncidenceAngle" : {"min": 0, "max": 0, "avg": 0}
-        }, outfile, indent=2)
-    with open(os.path.join(arch_dir, 'lcl_synthetic_aperture_radar.csv'), 'w', newline='') as outfile:
-        writer = csv.writer(outfile)
-        writer.writerow([
-            "POI index", "[deg]", "[deg]", "NoiseEquivalentSigma0", "", "",
-            "AlongTrackResolution", "", "", "CrossTrackResolution", "", "",
-            "SwathWidth", "", "", "IncidenceAngle", "", ""
-        ])
-        writer.writerow([
-            "POI", "lat", "lon", "min", "max", "avg", "min", "max", "avg",
-            "min", "max", "avg", "min", "max", "avg", "min", "max", "avg"
-        ])
+            writer.writerow(["POI index", "[deg]", "[deg]"]
+                + [item for metric, label in metrics for item in (label, "", "")])
+            writer.writerow(["POI", "lat", "lon"] + ["min", "max", "avg"]*len(metrics))
+            writer.writerows(zip(
+                indices.tolist(), latitudes[indices].tolist(), longitudes[indices].tolist(),
+                *[values[indices].tolist() for metric, label in metrics for values in local[metric]]
+            ))
 
 class readable_dir(argparse.Action):
     """Defines a custom argparse Action to identify a readable directory."""
@@ -1,4 +1,5 @@
 import tatc
+import orbits_proxy
 import argparse
 import os
 import csv
@@ -9,24 +10,46 @@ The launch analysis proxy performs launch vehicle analysis for a given
 architecture. It takes two arguments as inputs:
     in_file     A JSON formatted document containing the TradespaceSearch.
     arch_dir    A readable directory containing a JSON formatted document
-                containing the Architecture (arch.json) and the location where
-                all analysis outputs shall be written.
+                containing the Architecture (arch.json or the binary
+                arch.bin) and the location where all analysis outputs shall
+                be written.
 
 Launch vehicle analysis writes the following file to the architecture directory:
-    launch.json     JSON-formatted placeholder document.
+    launch.json     JSON-formatted launch manifest assigning satellites
+                    (grouped by orbital plane) to launch vehicles and the
+                    deployment schedule with global coverage measures of the
+                    partially-deployed constellation in each phase.
 """
 
 def execute(in_file, arch_dir):
     """Executes the launch analysis proxy."""
     in_file.seek(0) # reset reading from start of file
-    search = tatc.TradespaceSearch.from_json(in_file)
-    arch_path = os.path.join(arch_dir, 'arch.json')
-    with open(arch_path, 'r') as arch_file:
-        arch = tatc.Architecture.from_json(arch_file)
-    with open(os.path.join(arch_dir, 'launch.json'), 'w', newline='') as outfile:
-        json.dump({
-            "launchVehicles" : []
-        }, outfile, indent=2)
+    evaluate(tatc.TradespaceSearch.from_json(in_file), arch_dir)
+
+def evaluate(search, arch_dir):
+    """Evaluates the launch analysis proxy for a parsed tradespace search."""
+    # reads the binary architecture format (arch.bin) if available
+    arch = tatc.load_architecture(arch_dir)
+    # manifests are memoized for architectures with the same plane structure
+    manifest = tatc.plan_launches(arch.constellation.satellites, search.designSpace.launchers)
+    # reuses orbit analysis results written by the orbits proxy (if any)
+    constellation = tatc.analyze_constellation(search.mission, arch.constellation,
+        sidecar=os.path.join(arch_dir, orbits_proxy.SIDECAR_FILE),
+        drag=not search.settings.includePropulsion)
+    schedule = tatc.schedule_launches(manifest, len(arch.constellation.satellites),
+                                      constellation.epoch)
+    deployment = schedule.to_dict()
+    phases = tatc.analyze_deployment(constellation, schedule.deployTimes)
+    deployment["phases"] = tatc.get_deployment_metrics(constellation, phases)
+    with tatc.span("launch.outputs", arch=os.path.basename(os.path.normpath(arch_dir))):
+        with open(os.path.join(arch_dir, 'launch.json'), 'w', newline='') as outfile:
+            json.dump({
+                "launchVehicles" : manifest.to_list(),
+                "launchCost" : manifest.get_cost(),
+                "reliability" : manifest.get_reliability(),
+                "unassignedSatellites" : manifest.unassigned,
+                "deployment" : deployment
+            }, outfile, indent=2)
 
 class readable_dir(argparse.Action):
     """Defines a custom argparse Action to identify a readable directory."""
@@ -3,14 +3,16 @@ import argparse
 import os
 import csv
 import json
+import numpy as np
 
 """
 The orbits analysis proxy performs orbital analysis for a given architecture.
 It takes two arguments as inputs:
     in_file     A JSON formatted document containing the TradespaceSearch.
     arch_dir    A readable directory containing a JSON formatted document
-                containing the Architecture (arch.json) and the location where
-                all analysis outputs shall be written.
+                containing the Architecture (arch.json or the binary
+                arch.bin) and the location where all analysis outputs shall
+                be written.
 
 Orbital analysis writes the following files to the architecture directory:
     access.csv  CSV-formatted list of all access periods for constellation
@@ -24,56 +26,119 @@ Orbital analysis writes the following files to the architecture directory:
     satellite_states-#.csv  CSV-formatted list of time-stamped satellite
                 Cartesian state variables (1 file per satellite, sequential
                 integer ids).
+    orbits.bin  Binary (memory-mappable) sidecar of access intervals and
+                satellite state arrays read by downstream analysis modules
+                running in other processes (only written with the sidecar
+                option).
+
+CSV outputs are toggled, filtered (time step and range of states, points
+of interest, and satellites), and optionally compressed (.gz or .zst) by the
+analysis outputs settings of the tradespace search. The sidecar holds the
+analysis state (not formatted outputs) needed by instrument and launch
+analysis, so it is only written when those modules run in other processes
+(e.g. orchestrated or per-module workers); in the same process, they reuse
+the memoized analysis.
 """
 
-def execute(in_file, arch_dir):
+SIDECAR_FILE = 'orbits.bin'
+
+
+def execute(in_file, arch_dir, sidecar=False):
     """Executes the orbital analysis proxy."""
     in_file.seek(0) # reset reading from start of file
-    search = tatc.TradespaceSearch.from_json(in_file)
-    arch_path = os.path.join(arch_dir, 'arch.json')
-    with open(arch_path, 'r') as arch_file:
-        arch = tatc.Architecture.from_json(arch_file)
-    with open(os.path.join(arch_dir, 'access.csv'), 'w', newline='') as outfile:
-        writer = csv.writer(outfile)
-        writer.writerow([
-            'eventIdx', 'POI index', 'Lat[deg]', 'Long[deg]',
-            'Access From [s]', 'Access To [s]'
-        ])
-    with open(os.path.join(arch_dir, 'gbl.json'), 'w', newline='') as outfile:
-        json.dump({
-            "Time" : {"min" : 0, "max" : 0},
-            "TimeToCoverage" : {"min": 0, "max": 0, "avg": 0},
-            "AccessTime" : {"min": 0, "max": 0, "avg": 0},
-            "RevisitTime" : {"min": 0, "max": 0, "avg": 0},
-            "ResponseTime" : {"min": 0, "max": 0, "avg": 0},
-            "Coverage" : 0,
-            "NumOfPOIpasses" : {"min": 0, "max": 0, "avg": 0},
-            "DataLatency" : {"min": 0, "max": 0, "avg": 0},
-            "NumGSpassesPD" : 0,
-            "TotalDownlinkTimePD" : 0,
-            "DownlinkTimePerPass" : {"min": 0, "max": 0, "avg": 0}
-        }, outfile, indent=2)
-    with open(os.path.join(arch_dir, 'lcl.csv'), 'w', newline='') as outfile:
-        writer = csv.writer(outfile)
-        writer.writerow([
-            "Time [s]", "", "POI", "[deg]", "[deg]", "[km]",
-            "AccessTime [s]", "", "", "RevisitTime [s]", "", "", "ResponseTime [s]", "", "",
-            "TimeToCoverage [s]", "Number of Passes"
-        ])
-        writer.writerow([
-            "t0", "t1", "POI", "lat", "lon", "alt", "ATavg", "ATmin", "ATmax",
-            "RvTavg", "RvTmin", "RvTmax", "RpTavg", "RpTmin", "RpTmax", "TCcov", "numPass"
-        ])
-    for i, satellite in enumerate(arch.constellation[0].satellites):
-        with open(os.path.join(arch_dir, 'obs-{:d}.csv'.format(i)), 'w', newline='') as outfile:
+    evaluate(tatc.TradespaceSearch.from_json(in_file), arch_dir, sidecar)
+
+def evaluate(search, arch_dir, sidecar=False):
+    """Evaluates the orbital analysis proxy for a parsed tradespace search.
+    If sidecar is True (downstream modules run in other processes), the
+    constellation analysis is also written to the binary sidecar unless it
+    already holds the analysis of the same inputs."""
+    # reads the binary architecture format (arch.bin) if available
+    arch = tatc.load_architecture(arch_dir)
+    # constellation-keyed stage is memoized across architectures which share
+    # a constellation (e.g. differing only in ground network)
+    # satellites without propulsion decay due to drag
+    drag = not search.settings.includePropulsion
+    constellation = tatc.analyze_constellation(search.mission, arch.constellation, drag=drag)
+    network = tatc.analyze_network(constellation, arch.groundNetwork)
+    with tatc.span("orbits.outputs", arch=os.path.basename(os.path.normpath(arch_dir))):
+        write_outputs(constellation, network, arch_dir, search.settings.outputs)
+        path = os.path.join(arch_dir, SIDECAR_FILE)
+        key = tatc.get_constellation_key(search.mission, arch.constellation, drag=drag)
+        if sidecar and not tatc.has_constellation_analysis(path, key):
+            tatc.save_constellation_analysis(constellation, path, key)
+
+def write_outputs(constellation, network, arch_dir, outputs=None):
+    """Writes orbital analysis outputs to the architecture directory. Outputs
+    disabled or filtered by the analysis outputs settings are not formatted
+    (and files of disabled outputs are removed)."""
+    outputs = outputs or tatc.AnalysisOutputs()
+    latitudes, longitudes = constellation.points
+    points = outputs.get_point_mask(latitudes, longitudes)
+    path = os.path.join(arch_dir, 'access.csv')
+    if outputs.accessPeriods:
+        with tatc.open_output(path, outputs.compression) as outfile:
             writer = csv.writer(outfile)
             writer.writerow([
-                "Time[s]", "Ecc[deg]", "Inc[deg]", "SMA[km]", "AOP[deg]",
-                "RAAN[deg]", "MA[deg]", "Lat[deg]", "Lon[deg]", "Alt[km]"
+                'eventIdx', 'POI index', 'Lat[deg]', 'Long[deg]',
+                'Access From [s]', 'Access To [s]'
             ])
-        with open(os.path.join(arch_dir, 'satellite_states-{:d}.csv'.format(i)), 'w', newline='') as outfile:
+            access = constellation.access
+            # event indices refer to all access periods of the constellation
+            events = np.flatnonzero(outputs.get_period_mask(access, points))
+            access = access[events]
+            writer.writerows(zip(
+                events.tolist(), access['point'].tolist(),
+                latitudes[access['point']].tolist(), longitudes[access['point']].tolist(),
+                access['start'].tolist(), access['end'].tolist()
+            ))
+    else: tatc.remove_output(path)
+    with open(os.path.join(arch_dir, 'gbl.json'), 'w', newline='') as outfile:
+        json.dump(tatc.get_global_metrics(network), outfile, indent=2)
+    path = os.path.join(arch_dir, 'lcl.csv')
+    if outputs.localMetrics:
+        with tatc.open_output(path, outputs.compression) as outfile:
             writer = csv.writer(outfile)
-            writer.writerow(["Time[s]", "x[km]", "y[km]", "z[km]", "vx[km/s]", "vy[km/s]", "vz[km/s]"])
+            writer.writerow([
+                "Time [s]", "", "POI", "[deg]", "[deg]", "[km]",
+                "AccessTime [s]", "", "", "RevisitTime [s]", "", "", "ResponseTime [s]", "", "",
+                "TimeToCoverage [s]", "Number of Passes"
+            ])
+            writer.writerow([
+                "t0", "t1", "POI", "lat", "lon", "alt", "ATavg", "ATmin", "ATmax",
+                "RvTavg", "RvTmin", "RvTmax", "RpTavg", "RpTmin", "RpTmax", "TCcov", "numPass"
+            ])
+            # metrics are only computed for the access of selected points
+            local = tatc.get_local_metrics(constellation, points)
+            indices = np.flatnonzero(points)
+            size = len(indices)
+            writer.writerows(zip(
+                [constellation.times[0]]*size, [constellation.times[-1]]*size,
+                indices.tolist(), latitudes[indices].tolist(), longitudes[indices].tolist(), [0]*size,
+                *[local[key].tolist() for key in ["ATavg", "ATmin", "ATmax", "RvTavg",
+                    "RvTmin", "RvTmax", "RpTavg", "RpTmin", "RpTmax", "TCcov", "numPass"]]
+            ))
+    else: tatc.remove_output(path)
+    times = outputs.get_time_indices(constellation.times)
+    for i in range(len(constellation.elements)):
+        selected = outputs.is_satellite_selected(i) and outputs.obsTimeStep is not False
+        path = os.path.join(arch_dir, 'obs-{:d}.csv'.format(i))
+        if selected and outputs.keplerianStates:
+            with tatc.open_output(path, outputs.compression) as outfile:
+                writer = csv.writer(outfile)
+                writer.writerow([
+                    "Time[s]", "Ecc[deg]", "Inc[deg]", "SMA[km]", "AOP[deg]",
+                    "RAAN[deg]", "MA[deg]", "Lat[deg]", "Lon[deg]", "Alt[km]"
+                ])
+                writer.writerows(tatc.get_keplerian_states(constellation, i, times).tolist())
+        else: tatc.remove_output(path)
+        path = os.path.join(arch_dir, 'satellite_states-{:d}.csv'.format(i))
+        if selected and outputs.cartesianStates:
+            with tatc.open_output(path, outputs.compression) as outfile:
+                writer = csv.writer(outfile)
+                writer.writerow(["Time[s]", "x[km]", "y[km]", "z[km]", "vx[km/s]", "vy[km/s]", "vz[km/s]"])
+                writer.writerows(tatc.get_cartesian_states(constellation, i, times).tolist())
+        else: tatc.remove_output(path)
 
 class readable_dir(argparse.Action):
     """Defines a custom argparse Action to identify a readable directory."""
@@ -104,5 +169,10 @@ if __name__ == "__main__":
         action = readable_dir,
         help = "Architecture directory to read inputs/write outputs"
     )
+    parser.add_argument(
+        '--sidecar',
+        action = 'store_true',
+        help = "Write the binary sidecar for modules running in other processes"
+    )
     args = parser.parse_args()
-    execute(args.infile, args.archdir)
+    execute(args.infile, args.archdir, args.sidecar)
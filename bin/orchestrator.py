@@ -0,0 +1,225 @@
+import argparse
+import asyncio
+import collections
+import time
+import sys
+import os
+
+"""
+The analysis orchestrator evaluates architectures by running analysis modules
+as external processes (the proxy executables) with asyncio. Modules of each
+architecture run as soon as their dependencies complete (e.g. instrument and
+launch analysis follow orbital analysis while cost and risk analysis does not
+wait), and architectures are pipelined so analysis of one architecture
+overlaps with analysis of the next, subject to a concurrency limit per module
+type. Optionally, the number of architectures in the pipeline is limited to a
+window and each architecture admitted to the pipeline is selected (e.g. by
+estimated cost) as architectures complete, with the measured durations of
+their modules reported (e.g. to learn cost estimates). Module runs which
+fail or exceed a timeout are retried. It takes two
+arguments as inputs:
+    in_file     A JSON formatted document containing the TradespaceSearch.
+    arch_dirs   One or more readable directories containing a JSON formatted
+                document containing the Architecture (arch.json or
+                the binary arch.bin) and the location where all analysis
+                outputs shall be written.
+"""
+
+BIN_DIR = os.path.dirname(os.path.abspath(__file__))
+
+class AnalysisModule(object):
+    """An analysis module run as an external process.
+
+    Attributes:
+        name            Name of the module.
+        command         List of program arguments preceding the tradespace
+                        search file and architecture directory.
+        dependencies    List of names of modules which must complete first.
+        concurrency     Maximum number of concurrent runs.
+    """
+    def __init__(self, name, command, dependencies=None, concurrency=1):
+        self.name = name
+        self.command = command
+        self.dependencies = dependencies or []
+        self.concurrency = concurrency
+
+def get_proxy_command(script):
+    """Returns the command to run a proxy script in this directory."""
+    return [sys.executable, os.path.join(BIN_DIR, script)]
+
+def get_default_modules():
+    """Returns the proxy analysis modules. Orbital and instrument analysis are
+    CPU-intensive and limited to one run per CPU; cost and risk and launch
+    analysis are lighter and allowed more concurrent runs."""
+    cpus = os.cpu_count() or 1
+    return collections.OrderedDict((module.name, module) for module in [
+        # downstream modules read orbital analysis from the binary sidecar
+        AnalysisModule("orbits", get_proxy_command("orbits_proxy.py") + ["--sidecar"], [], cpus),
+        AnalysisModule("instrument", get_proxy_command("instrument_proxy.py"), ["orbits"], cpus),
+        AnalysisModule("cost_risk", get_proxy_command("cost_risk_proxy.py"), [], 2*cpus),
+        AnalysisModule("launch", get_proxy_command("launch_proxy.py"), ["orbits"], 2*cpus)
+    ])
+
+class ModuleError(Exception):
+    """An analysis module failed to evaluate an architecture."""
+    def __init__(self, module, arch_dir, message):
+        self.module = module
+        self.arch_dir = arch_dir
+        super(ModuleError,self).__init__('{0} failed for {1}: {2}'.format(
+            module, arch_dir, message))
+
+class Orchestrator(object):
+    """Runs analysis modules for architectures with asyncio.
+
+    Attributes:
+        modules     Ordered dictionary of analysis modules by name.
+        timeout     Maximum duration (s) of each module run (None for no
+                    limit).
+        retries     Number of times a failed module run is retried.
+        runs        Counter of module runs (including retries) by name.
+    """
+    def __init__(self, modules=None, timeout=None, retries=1):
+        self.modules = modules if modules is not None else get_default_modules()
+        self.timeout = timeout
+        self.retries = retries
+        self.runs = collections.Counter()
+
+    async def run_module(self, module, in_path, arch_dir, semaphore):
+        """Runs a module for an architecture (with retries), returns the
+        duration (s) of the successful run, and raises a ModuleError if all
+        attempts fail."""
+        for attempt in range(self.retries + 1):
+            async with semaphore:
+                self.runs[module.name] += 1
+                start = time.perf_counter()
+                process = await asyncio.create_subprocess_exec(
+                    *(module.command + [in_path, arch_dir]),
+                    stdout=asyncio.subprocess.DEVNULL,
+                    stderr=asyncio.subprocess.PIPE)
+                try:
+                    stdout, stderr = await asyncio.wait_for(
+                        process.communicate(), self.timeout)
+                except asyncio.TimeoutError:
+                    process.kill()
+                    await process.wait()
+                    message = 'timed out after {0} s'.format(self.timeout)
+                else:
+                    if process.returncode == 0:
+                        return time.perf_counter() - start
+                    message = 'exit status {0}\n{1}'.format(process.returncode,
+                        stderr.decode('utf-8', 'replace').strip())
+        raise ModuleError(module.name, arch_dir, message)
+
+    async def evaluate(self, in_path, arch_dir, semaphores, modules=None):
+        """Runs all modules (or a list of modules) for an architecture as soon
+        as their dependencies complete and returns an ordered dictionary of
+        the durations (s) of the module runs by name. Dependencies which are
+        not run are assumed to be complete."""
+        tasks = collections.OrderedDict()
+        async def run(module):
+            # a failed dependency fails its dependents
+            for name in module.dependencies:
+                if name in tasks:
+                    await tasks[name]
+            return await self.run_module(module, in_path, arch_dir, semaphores[module.name])
+        for module in self.modules.values():
+            if modules is None or module.name in modules:
+                tasks[module.name] = asyncio.ensure_future(run(module))
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return collections.OrderedDict(zip(tasks.keys(), results))
+
+    async def evaluate_all(self, in_path, arch_dirs, modules=None, window=None,
+                           select=None, observe=None):
+        """Evaluates architectures (pipelined), optionally running only a list
+        of modules for each architecture, and returns a list of exceptions of
+        architectures which failed. At most a window of architectures
+        (default: all) are in the pipeline; select(pending indices) returns
+        the index of the next architecture to admit (default: in order) and
+        observe(index, durations) receives the module durations (s) of each
+        architecture which completes."""
+        semaphores = dict((name, asyncio.Semaphore(module.concurrency))
+                          for name, module in self.modules.items())
+        pending = list(range(len(arch_dirs)))
+        running = {}
+        failures = []
+        while pending or running:
+            while pending and (window is None or len(running) < window):
+                i = select(pending) if select is not None else pending[0]
+                pending.remove(i)
+                running[asyncio.ensure_future(self.evaluate(
+                    os.path.abspath(in_path), os.path.abspath(arch_dirs[i]), semaphores,
+                    modules[i] if modules is not None else None))] = i
+            done, _ = await asyncio.wait(list(running.keys()),
+                                         return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                i = running.pop(task)
+                if task.exception() is not None:
+                    failures.append(task.exception())
+                elif observe is not None:
+                    observe(i, task.result())
+        return failures
+
+def execute(in_path, arch_dirs, timeout=None, retries=1, concurrency=None, modules=None,
+            window=None, select=None, observe=None):
+    """Executes the analysis orchestrator and raises the first failure (if
+    any) after all architectures are evaluated. Modules optionally lists the
+    modules to run for each architecture; window, select, and observe
+    optionally control admission of architectures to the pipeline (see
+    Orchestrator.evaluate_all)."""
+    orchestrator = Orchestrator(timeout=timeout, retries=retries)
+    for name, limit in (concurrency or {}).items():
+        if name not in orchestrator.modules:
+            raise ValueError('{0} is not a valid analysis module'.format(name))
+        orchestrator.modules[name].concurrency = limit
+    failures = asyncio.run(orchestrator.evaluate_all(in_path, arch_dirs, modules,
+                                                     window, select, observe))
+    if failures:
+        raise failures[0]
+
+def parse_concurrency(value):
+    """Parses a concurrency limit formatted as module=limit."""
+    name, sep, limit = value.partition('=')
+    if not sep or not limit.isdigit() or int(limit) < 1:
+        raise argparse.ArgumentTypeError(
+            '{0} is not formatted as module=limit'.format(value)
+        )
+    return name, int(limit)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description='Run analysis orchestrator'
+    )
+    parser.add_argument(
+        'infile',
+        help = "Tradespace search input JSON file"
+    )
+    parser.add_argument(
+        'archdirs',
+        nargs = '+',
+        help = "Architecture directories to read inputs/write outputs"
+    )
+    parser.add_argument(
+        '--timeout',
+        type = float,
+        default = None,
+        help = "Maximum duration (s) of each module run"
+    )
+    parser.add_argument(
+        '--retries',
+        type = int,
+        default = 1,
+        help = "Number of retries of a failed module run"
+    )
+    parser.add_argument(
+        '--concurrency',
+        type = parse_concurrency,
+        action = 'append',
+        default = [],
+        help = "Maximum concurrent runs of a module (e.g. orbits=2)"
+    )
+    args = parser.parse_args()
+    execute(args.infile, args.archdirs, args.timeout, args.retries,
+            dict(args.concurrency))
@@ -1,12 +1,20 @@
 import tatc
 import argparse
 import os, errno
+import shutil
+import json
+import numpy as np
+import subprocess
+import time
+import sys
 
 import orbits_proxy
 import cost_risk_proxy
 import instrument_proxy
 import launch_proxy
 import arch_eval
+import worker
+import orchestrator
 
 """
 The tradespace search exeutive (tse) coordinates the end-to-end execution of a
@@ -18,15 +26,224 @@ takes two arguments as inputs:
 
 Each architecture is stored in a unique directory labeled with a sequential
 integer (arch-1/, arch-2/, etc.), containing the architecture specification
-(arch.json) and any outputs generated by the architecture evaluator (arch_eval).
+(arch.json or, if the binary option is set, the memory-mapped arch.bin which
+is written without expanding member satellites) and any outputs generated by
+the architecture evaluator (arch_eval). If the workers option is set, each
+analysis module instead runs as a long-lived worker process (worker) which
+evaluates all architectures. If the queue option is set, architectures are
+instead published as jobs to a job queue directory on a shared filesystem
+which workers on any node (worker --queue) evaluate, optionally starting a
+number of local workers. If the orchestrate option is set, analysis modules
+instead run as external processes managed by the asyncio-based orchestrator
+(orchestrator) which pipelines evaluation of architectures. With the queue or
+orchestrate option, architectures are evaluated longest-first by estimated
+cost, learned from measured module durations as architectures complete, and
+progress is reported with an estimated time to completion.
+
+With the SOBOL search strategy, architectures are sampled at the points of a
+scrambled Sobol sequence (up to maxNFE architectures, scrambled by the seed
+search parameter) and labeled and evaluated in sequence order, so the
+architectures evaluated before stopping early are a space-filling sample.
+
+Each run is recorded (run.json) with the structural fingerprint of the
+architecture in each directory and a key of the inputs of each analysis
+module. When a modified tradespace search is run again in the same output
+directory, architectures already evaluated keep their directory and outputs
+and only new architectures are evaluated (numbered after the previous
+directories); changes to the mission or settings re-run only the analysis
+modules which depend on them and directories of architectures no longer in
+the design space are removed. The full option re-evaluates all
+architectures.
+
+If the trace option is set, the duration of each stage (parse, enumerate,
+write, and each analysis module and its outputs per architecture) is written
+to a Chrome trace file (readable by chrome://tracing or Perfetto) and a
+summary of stage durations is printed. Stages of analysis modules running in
+worker or orchestrated processes are not traced.
 """
 
-def execute(in_file, out_dir):
+def execute(in_file, out_dir, binary=False, workers=False, orchestrate=False,
+            queue_dir=None, local_workers=0, incremental=True):
     """Executes the example tradespace search executive."""
-    search = tatc.TradespaceSearch.from_json(in_file)
-    for i, architecture in enumerate(search.designSpace.generate_architectures()):
-        arch_label = 'arch-{:}'.format(i)
-        arch_dir = os.path.join(out_dir, arch_label)
+    with tatc.span("parse"):
+        search = tatc.TradespaceSearch.from_json(in_file)
+    sampled = is_sampled(search)
+    with tatc.span("enumerate"):
+        architectures = generate_architectures(search)
+        # estimate costs of all architectures in one vectorized batch
+        tatc.prepare_costs(search.mission, architectures,
+                           launchers=search.designSpace.launchers)
+    # architectures are generated constellation-major (so architectures
+    # sharing a constellation are evaluated consecutively) or, if sampled, in
+    # sequence order so any prefix of evaluations is space-filling
+    order = list(range(len(architectures)))
+    # match architectures to the outputs of the previous run (if any)
+    previous = tatc.RunRecord.load(out_dir) if incremental else tatc.RunRecord()
+    keys = tatc.get_module_keys(search)
+    fingerprints = [architecture.fingerprint() for architecture in architectures]
+    assignments = assign_directories(previous, fingerprints, order, keys)
+    record = tatc.RunRecord(json.loads(search.to_json()))
+    for i, name, modules in assignments:
+        record.set_architecture(name, fingerprints[i],
+            [(module, key) for module, key in keys.items() if module not in modules])
+    for name in previous.architectures:
+        # remove outputs of architectures no longer in the design space
+        if name not in record.architectures:
+            shutil.rmtree(os.path.join(out_dir, name), ignore_errors=True)
+    record.save(out_dir)
+    if previous.architectures:
+        sys.stderr.write('{0} architectures reused, {1} re-evaluated, {2} new (changed: {3})\n'.format(
+            sum(1 for i, name, modules in assignments if not modules),
+            sum(1 for i, name, modules in assignments if modules and name in previous.architectures),
+            sum(1 for i, name, modules in assignments if name not in previous.architectures),
+            ', '.join(previous.get_changes(search)) or 'none'))
+    pending = [(i, name, modules) for i, name, modules in assignments if modules]
+    arch_dirs = [
+        write_architecture(architectures[i], os.path.join(out_dir, name), binary)
+        for i, name, modules in pending
+    ]
+    # modules to run for each architecture (None for all modules)
+    modules = [None if len(m) == len(keys) else m for i, name, m in pending]
+    if queue_dir or orchestrate:
+        # features to estimate evaluation costs for longest-first dispatch
+        numberPoints, days = tatc.get_mission_features(search.mission)
+        features = [tatc.get_job_features(architectures[i], numberPoints, days) for i, name, m in pending]
+    if queue_dir:
+        # workers on any node sharing the queue directory evaluate
+        # architectures
+        publish(in_file.name, arch_dirs, features, queue_dir, local_workers,
+                ordered=sampled, modules=modules)
+    elif orchestrate:
+        # analysis modules run as external processes pipelined across
+        # architectures, admitting the longest next (unless sampled)
+        orchestrate_all(in_file.name, arch_dirs, features, ordered=sampled, modules=modules)
+    elif workers:
+        # one long-lived worker per analysis module (in evaluation order)
+        workers = [worker.Worker([name]) for name in worker.MODULES.keys()]
+        try:
+            for arch_dir, m in zip(arch_dirs, modules):
+                for w in workers:
+                    if m is None or w.modules[0] in m:
+                        w.evaluate(in_file.name, arch_dir)
+        finally:
+            for w in workers:
+                w.close()
+    else:
+        for arch_dir, m in zip(arch_dirs, modules):
+            arch_eval.execute(in_file, arch_dir, m)
+    for i, name, m in pending:
+        record.set_architecture(name, fingerprints[i], keys)
+    record.save(out_dir)
+
+def assign_directories(previous, fingerprints, order, keys):
+    """Returns a list of (architecture index, directory name, list of modules
+    to run) tuples in order. Architectures are assigned to the directories of
+    a previous run by fingerprint and run the modules whose keys changed; new
+    architectures are numbered after the previous directories and run all
+    modules."""
+    if not previous.architectures:
+        return [(i, 'arch-{:}'.format(i), list(keys)) for i in order]
+    directories = previous.get_directories()
+    numbers = [int(name.split('-')[-1]) for name in previous.architectures
+               if name.split('-')[-1].isdigit()]
+    number = max(numbers) + 1 if numbers else 0
+    assignments = []
+    for i in order:
+        if directories.get(fingerprints[i]):
+            name = directories[fingerprints[i]].pop(0)
+            assignments.append((i, name, previous.get_stale_modules(name, keys)))
+        else:
+            assignments.append((i, 'arch-{:}'.format(number), list(keys)))
+            number += 1
+    return assignments
+
+def publish(in_path, arch_dirs, features, queue_dir, local_workers=0, poll=1.,
+            ordered=False, modules=None):
+    """Publishes architecture evaluation jobs to a job queue, starts a number
+    of local worker processes, and waits until all jobs are finished. Jobs
+    are claimed longest-first by estimated cost, re-estimated from measured
+    durations as jobs complete, or in order of publication if ordered.
+    Modules optionally lists the modules to run for each architecture."""
+    queue = tatc.JobQueue(queue_dir)
+    # jobs and failures of earlier runs in the queue directory are ignored
+    queue.start()
+    estimator = tatc.CostEstimator()
+    if ordered:
+        priorities = list(range(len(arch_dirs), 0, -1))
+    else:
+        priorities = estimator.estimate(features).tolist()
+    payloads = [{"infile": os.path.abspath(in_path), "archdir": os.path.abspath(arch_dir)}
+                for arch_dir in arch_dirs]
+    for payload, m in zip(payloads, modules or []):
+        if m is not None:
+            payload["modules"] = m
+    ids = queue.put(payloads, priorities)
+    queue.close()
+    features = dict(zip(ids, features))
+    processes = [
+        subprocess.Popen([sys.executable, os.path.abspath(worker.__file__), '--queue', queue_dir])
+        for i in range(local_workers)
+    ]
+    try:
+        finished = 0
+        while not queue.is_finished():
+            time.sleep(poll)
+            completed = queue.get_completed(finished)
+            if not completed:
+                continue
+            for id, payload, duration, stages, finished in completed:
+                if id in features:
+                    estimator.observe(features[id], stages or {"total": duration})
+            # re-prioritize pending jobs with the updated estimates
+            pending = [id for id, payload in queue.get_pending() if id in features]
+            if pending and not ordered:
+                queue.set_priorities(dict(zip(pending,
+                    estimator.estimate([features[id] for id in pending]).tolist())))
+            active = queue.get_active()
+            remaining = pending + [id for id, w in active if id in features]
+            eta = estimator.get_eta([features[id] for id in remaining],
+                                    len(set(w for id, w in active)))
+            sys.stderr.write('{0}/{1} architectures finished, ETA {2:.0f} s\n'.format(
+                len(ids) - len(remaining), len(ids), eta))
+    finally:
+        for process in processes:
+            process.wait()
+    failures = queue.get_failures()
+    if failures:
+        raise RuntimeError('{0} architectures failed, e.g. {1}:\n{2}'.format(
+            len(failures), failures[0][0]["archdir"], failures[0][1]))
+
+def orchestrate_all(in_path, arch_dirs, features, ordered=False, modules=None):
+    """Evaluates architectures with the analysis orchestrator. Architectures
+    are admitted to a bounded pipeline longest-first by estimated cost,
+    re-estimated from measured module durations as architectures complete,
+    or in order if ordered. Modules optionally lists the modules to run for
+    each architecture."""
+    cpus = os.cpu_count() or 1
+    estimator = tatc.CostEstimator()
+    estimates = estimator.estimate(features) if len(features) else np.zeros(0)
+    unfinished = set(range(len(arch_dirs)))
+    def select(pending):
+        if ordered:
+            return pending[0]
+        return max(pending, key=lambda i: estimates[i])
+    def observe(i, stages):
+        estimator.observe(features[i], stages)
+        unfinished.discard(i)
+        if not ordered and unfinished:
+            # re-estimate architectures not yet admitted with the updated model
+            estimates[:] = estimator.estimate(features)
+        eta = estimator.get_eta([features[j] for j in sorted(unfinished)], cpus)
+        sys.stderr.write('{0}/{1} architectures finished, ETA {2:.0f} s\n'.format(
+            len(arch_dirs) - len(unfinished), len(arch_dirs), eta))
+    # the window keeps each module busy while leaving architectures to select
+    orchestrator.execute(in_path, arch_dirs, modules=modules, window=2*cpus,
+                         select=select, observe=observe)
+
+def write_architecture(architecture, arch_dir, binary=False):
+    """Writes an architecture to its architecture directory and returns the
+    directory."""
+    with tatc.span("write", arch=os.path.basename(arch_dir)):
         try:
             # try to create directory (checking in advance exposes race condition)
             os.makedirs(arch_dir)
@@ -34,10 +251,39 @@ def execute(in_file, out_dir):
             # ignore error if directory already exists
             if e.errno != errno.EEXIST:
                 raise
-        with open(os.path.join(arch_dir, 'arch.json'), 'w') as out_file:
-            architecture.to_json(out_file, indent=2)
-        with open(os.path.join(arch_dir, 'arch.json'), 'r') as arch_file:
-            arch_eval.execute(in_file, arch_dir)
+        json_path = os.path.join(arch_dir, tatc.ARCHITECTURE_JSON)
+        bin_path = os.path.join(arch_dir, tatc.ARCHITECTURE_BIN)
+        if binary:
+            tatc.write_architecture(bin_path, architecture)
+            # remove a stale JSON architecture (tsv converts between formats)
+            if os.path.isfile(json_path):
+                os.remove(json_path)
+        else:
+            with open(json_path, 'w') as out_file:
+                architecture.to_json(out_file, indent=2)
+            # remove a stale binary architecture which would take precedence
+            if os.path.isfile(bin_path):
+                os.remove(bin_path)
+        return arch_dir
+
+def is_sampled(search):
+    """Returns True if a tradespace search samples (rather than enumerates)
+    its design space."""
+    return (search.settings is not None
+            and search.settings.searchStrategy == tatc.SearchStrategy.SOBOL)
+
+def generate_architectures(search):
+    """Returns the list of architectures of a tradespace search: all
+    architectures in the design space or, for the SOBOL search strategy, a
+    space-filling sample of up to maxNFE (default: all) architectures in
+    sequence order. Member satellites are generated as ConstellationStates
+    (expanded only when written to arch.json)."""
+    if not is_sampled(search):
+        return list(search.designSpace.generate_architectures(state=True))
+    plan = search.designSpace.compile()
+    parameters = search.settings.searchParameters or tatc.SearchParameters()
+    numberSamples = parameters.maxNFE or plan.count()
+    return list(plan.sample_architectures(numberSamples, parameters.seed, state=True))
 
 class readable_dir(argparse.Action):
     """Defines a custom argparse Action to identify a readable directory."""
@@ -70,5 +316,47 @@ if __name__ == "__main__":
         default = '.',
         help = "Architecture output directory"
     )
+    parser.add_argument(
+        '--binary',
+        action = 'store_true',
+        help = "Write binary architecture files (arch.bin) instead of arch.json"
+    )
+    parser.add_argument(
+        '--workers',
+        action = 'store_true',
+        help = "Evaluate architectures with long-lived analysis worker processes"
+    )
+    parser.add_argument(
+        '--orchestrate',
+        action = 'store_true',
+        help = "Evaluate architectures with concurrent analysis module processes"
+    )
+    parser.add_argument(
+        '--trace',
+        default = None,
+        help = "Write a Chrome trace of stage durations to this file"
+    )
+    parser.add_argument(
+        '--queue',
+        default = None,
+        help = "Publish architectures to this job queue directory for workers"
+    )
+    parser.add_argument(
+        '--local-workers',
+        type = int,
+        default = 0,
+        help = "Number of local workers to start for the job queue"
+    )
+    parser.add_argument(
+        '--full',
+        action = 'store_true',
+        help = "Re-evaluate all architectures (ignoring outputs of the previous run)"
+    )
     args = parser.parse_args()
-    execute(args.infile, args.outdir)
+    if args.trace:
+        tatc.enable_tracing()
+    execute(args.infile, args.outdir, args.binary, args.workers, args.orchestrate,
+            args.queue, args.local_workers, not args.full)
+    if args.trace:
+        tatc.TRACER.write_chrome_trace(args.trace)
+        print(tatc.TRACER.format_summary())
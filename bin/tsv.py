@@ -1,5 +1,6 @@
 from tatc import Architecture
 from tatc import TradespaceSearch
+from tatc import read_architecture, write_architecture
 import argparse
 import os
 import json
@@ -10,6 +11,9 @@ tradespace search JSON document by removing unused keys and assigning default
 values for missing keys. It takes two arguments as inputs:
     in_file     A JSON formatted document containing the TradespaceSearch.
     out_file    The new file name for the validated JSON formatted document.
+
+If either file name has a .bin extension, the validator instead converts an
+Architecture between the JSON (arch.json) and binary (arch.bin) formats.
 """
 
 def execute(in_file, out_file):
@@ -17,19 +21,35 @@ def execute(in_file, out_file):
     search = TradespaceSearch.from_json(in_file)
     search.to_json(out_file, indent=2)
 
+def convert(in_path, out_path):
+    """Converts an architecture between JSON and binary formats (selected by
+    the .bin file extension)."""
+    if in_path.endswith('.bin'):
+        architecture = read_architecture(in_path)
+    else:
+        with open(in_path, 'r') as in_file:
+            architecture = Architecture.from_json(in_file)
+    if out_path.endswith('.bin'):
+        write_architecture(out_path, architecture)
+    else:
+        with open(out_path, 'w') as out_file:
+            architecture.to_json(out_file, indent=2)
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description='Run tradespace search validator'
     )
     parser.add_argument(
         'infile',
-        type = argparse.FileType('r'),
-        help = "Tradespace search input JSON file"
+        help = "Tradespace search input JSON file (or architecture file)"
     )
     parser.add_argument(
         'outfile',
-        type = argparse.FileType('w'),
-        help = "Validated tradespace search JSON file"
+        help = "Validated tradespace search JSON file (or architecture file)"
     )
     args = parser.parse_args()
-    execute(args.infile, args.outfile)
+    if args.infile.endswith('.bin') or args.outfile.endswith('.bin'):
+        convert(args.infile, args.outfile)
+    else:
+        with open(args.infile, 'r') as in_file, open(args.outfile, 'w') as out_file:
+            execute(in_file, out_file)
@@ -0,0 +1,226 @@
+import tatc
+import argparse
+import collections
+import subprocess
+import traceback
+import json
+import time
+import sys
+import os
+
+import orbits_proxy
+import cost_risk_proxy
+import instrument_proxy
+import launch_proxy
+
+"""
+The analysis worker runs one or more analysis modules as a long-lived process
+which serves evaluation requests read from a pipe, avoiding the interpreter
+startup, package import, and tradespace search parsing of a proxy invocation
+per architecture. Analysis caches (e.g. memoized orbital analysis and parsed
+tradespace searches) are kept warm between requests. It takes one argument as
+input:
+    modules     Names of analysis modules to run (in order) for each request
+                (default: all modules).
+
+Requests and responses are JSON-formatted documents, one per line, read from
+standard input and written to standard output:
+    request     {"id": 1, "infile": "search.json", "archdir": "arch-1"} to
+                evaluate an architecture (optionally with "modules", a list
+                restricting the modules to run) or {"command": "shutdown"}
+                to stop.
+    response    {"id": 1, "status": "ok"} or, if the evaluation fails,
+                {"id": 1, "status": "error", "message": "..."}.
+
+The Worker class launches and communicates with a worker process (e.g. from
+the tradespace search executive).
+
+If the queue option is set, the worker instead claims batches of jobs from a
+job queue directory on a shared filesystem (published by the tradespace
+search executive) until the queue is finished, so workers on several nodes
+can share a tradespace search. Each job payload is a request as above.
+"""
+
+MODULES = collections.OrderedDict([
+    ("orbits", orbits_proxy),
+    ("instrument", instrument_proxy),
+    ("cost_risk", cost_risk_proxy),
+    ("launch", launch_proxy)
+])
+# modules which read orbital analysis (from the sidecar in other processes)
+SIDECAR_MODULES = ("instrument", "launch")
+
+def evaluate(name, search, arch_dir, modules):
+    """Evaluates an analysis module for an architecture in a worker running
+    a list of modules. Orbital analysis writes its binary sidecar only if
+    modules which read it are not run by this worker."""
+    if name == "orbits":
+        sidecar = any(module not in modules for module in SIDECAR_MODULES)
+        MODULES[name].evaluate(search, arch_dir, sidecar)
+    else:
+        MODULES[name].evaluate(search, arch_dir)
+
+class SearchCache(object):
+    """Cache of parsed tradespace searches keyed by file path and modification
+    time (so modified files are parsed again)."""
+    def __init__(self):
+        self.searches = {}
+
+    def get(self, path):
+        """Returns the parsed tradespace search of a file."""
+        key = (os.path.abspath(path), os.path.getmtime(path))
+        if key not in self.searches:
+            with open(path, 'r') as in_file:
+                self.searches[key] = tatc.TradespaceSearch.from_json(in_file)
+        return self.searches[key]
+
+def serve(modules, in_stream, out_stream):
+    """Serves evaluation requests until shutdown or end of input."""
+    searches = SearchCache()
+    for line in in_stream:
+        if not line.strip():
+            continue
+        request = {}
+        try:
+            request = json.loads(line)
+            if request.get("command") == "shutdown":
+                response = {"id": request.get("id"), "status": "ok"}
+                out_stream.write(json.dumps(response) + "\n")
+                out_stream.flush()
+                break
+            search = searches.get(request["infile"])
+            for name in modules:
+                if name in request.get("modules", modules):
+                    evaluate(name, search, request["archdir"], modules)
+            response = {"id": request.get("id"), "status": "ok"}
+        except Exception:
+            response = {"id": request.get("id"), "status": "error",
+                        "message": traceback.format_exc()}
+        out_stream.write(json.dumps(response) + "\n")
+        out_stream.flush()
+
+def serve_queue(modules, queue, batchSize=1, poll=1.):
+    """Evaluates jobs claimed from a job queue until the queue is finished."""
+    searches = SearchCache()
+    while True:
+        jobs = queue.claim(batchSize=batchSize)
+        if not jobs:
+            if queue.is_finished():
+                break
+            time.sleep(poll)
+            continue
+        # leases of all jobs of the batch (including the job being evaluated)
+        # are renewed by a heartbeat until each job is completed or failed
+        with tatc.LeaseKeeper(queue, jobs) as keeper:
+            for job in jobs:
+                # durations of each module are reported to learn job costs
+                stages = collections.OrderedDict()
+                try:
+                    search = searches.get(job.payload["infile"])
+                    for name in modules:
+                        if name not in job.payload.get("modules", modules):
+                            continue
+                        start = time.perf_counter()
+                        evaluate(name, search, job.payload["archdir"], modules)
+                        stages[name] = time.perf_counter() - start
+                except Exception:
+                    keeper.release(job)
+                    queue.fail(job, traceback.format_exc())
+                else:
+                    keeper.release(job)
+                    queue.complete(job, sum(stages.values()), stages=stages)
+
+class Worker(object):
+    """A long-lived analysis worker process.
+
+    Attributes:
+        modules     List of analysis module names run by the worker.
+        process     Worker process.
+        requests    Number of requests sent to the worker.
+    """
+    def __init__(self, modules=None):
+        self.modules = list(modules or MODULES.keys())
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__)] + self.modules,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            universal_newlines=True)
+        self.requests = 0
+
+    def send(self, request):
+        """Sends a request and returns the response."""
+        self.requests += 1
+        request["id"] = self.requests
+        self.process.stdin.write(json.dumps(request) + "\n")
+        self.process.stdin.flush()
+        line = self.process.stdout.readline()
+        if not line:
+            raise RuntimeError('worker {0} exited unexpectedly'.format(self.modules))
+        return json.loads(line)
+
+    def evaluate(self, in_path, arch_dir, modules=None):
+        """Evaluates an architecture directory for a tradespace search file
+        (optionally running only a list of the worker's modules)."""
+        request = {"infile": os.path.abspath(in_path), "archdir": os.path.abspath(arch_dir)}
+        if modules is not None:
+            request["modules"] = list(modules)
+        response = self.send(request)
+        if response["status"] != "ok":
+            raise RuntimeError('worker {0} failed to evaluate {1}:\n{2}'.format(
+                self.modules, arch_dir, response.get("message")))
+
+    def close(self):
+        """Shuts down the worker process."""
+        if self.process.poll() is None:
+            try:
+                self.send({"command": "shutdown"})
+            except (IOError, OSError, RuntimeError):
+                pass
+            self.process.stdin.close()
+            self.process.stdout.close()
+            self.process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description='Run analysis worker'
+    )
+    parser.add_argument(
+        'modules',
+        nargs = '*',
+        help = "Analysis modules to run for each request ({0})".format(
+            ", ".join(MODULES.keys()))
+    )
+    parser.add_argument(
+        '--queue',
+        default = None,
+        help = "Job queue directory to claim jobs from (instead of standard input)"
+    )
+    parser.add_argument(
+        '--batch',
+        type = int,
+        default = 1,
+        help = "Number of jobs claimed from the queue at a time"
+    )
+    parser.add_argument(
+        '--lease',
+        type = float,
+        default = 600,
+        help = "Duration (s) of job leases"
+    )
+    args = parser.parse_args()
+    for name in args.modules:
+        if name not in MODULES:
+            parser.error('{0} is not a valid analysis module'.format(name))
+    if args.queue:
+        serve_queue(args.modules or list(MODULES.keys()),
+            tatc.JobQueue(args.queue, leaseDuration=args.lease), args.batch)
+    else:
+        # reserve standard output for responses
+        out_stream = sys.stdout
+        sys.stdout = sys.stderr
+        serve(args.modules or list(MODULES.keys()), sys.stdin, out_stream)
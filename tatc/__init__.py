@@ -14,7 +14,11 @@ __maintainer__ = "Paul Grogan"
 __email__ = "pgrogan@stevens.edu"
 __status__ = "Prototype"
 
+import types
+
 from .util import *
+from .sampling import *
+from .constants import *
 from .agency import *
 from .space import *
 from .ground import *
@@ -23,3 +27,45 @@ from .instrument import *
 from .mission import *
 from .analysis import *
 from .resources import *
+from .storage import *
+from .compression import *
+from .drag import *
+from .orbits import *
+from .coverage import *
+from .cost import *
+from .risk import *
+from .manifest import *
+from .trace import *
+from .jobs import *
+from .runs import *
+
+LAZY_MODULES = {"isodate": "isodate"} # third-party modules loaded on access
+
+def __getattr__(name):
+    """Loads resources and heavy third-party modules on first access (PEP
+    562) so they are not loaded by `import tatc`."""
+    if name in resources.RESOURCES:
+        return getattr(resources, name)
+    if name in LAZY_MODULES:
+        import importlib
+        globals()[name] = importlib.import_module(LAZY_MODULES[name])
+        return globals()[name]
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
+
+def __dir__():
+    return sorted(set(globals()) | set(resources.RESOURCES) | set(LAZY_MODULES))
+
+def _is_public(name, value):
+    """Returns True if a global is a public name defined by a tatc module
+    (rather than an imported module or a class or function of another
+    package)."""
+    if name.startswith("_") or name == "LAZY_MODULES" or isinstance(value, types.ModuleType):
+        return False
+    if isinstance(value, (type, types.FunctionType, types.BuiltinFunctionType)):
+        return value.__module__.split(".")[0] == __name__
+    return True
+
+# star imports (`from tatc import *`) bind the public names of tatc modules
+# but not resources and lazy modules, which are only loaded on access (e.g.
+# `tatc.DSN` or `tatc.isodate`)
+__all__ = sorted(name for name, value in list(globals().items()) if _is_public(name, value))
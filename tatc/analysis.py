@@ -5,8 +5,11 @@
 """
 
 import json
+from numbers import Number
+import numpy as np
 
-from .util import Entity, EnumEntity
+from .util import Entity, EnumEntity, QuantitativeValue
+from .ground import Region
 from .mission import MissionConcept, DesignSpace
 
 class SearchStrategy(EnumEntity):
@@ -14,6 +17,7 @@ class SearchStrategy(EnumEntity):
     FF = "FF"
     GA = "GA"
     KDO = "KDO"
+    SOBOL = "SOBOL"
 
 class SearchParameters(Entity):
     """Aggregates search parameters needed to set up the genetic algorithm.
@@ -32,11 +36,12 @@ class SearchParameters(Entity):
         dOperators      List of domain-dependent operators.
         nfeTriggerDM    Number of evaluations between successive rule mining algorithm applications.
         nOperRepl       Number of operators to replace after each rule mining.
+        seed            Seed of the random scrambling of sampled architectures.
     """
     def __init__(self, maxNFE=None, populationSize=None, epsilons=None,
             sizeTournament=None, pCrossover=None, pMutation=None, alpha=None,
             beta=None, pMin=None, iOperators=None, dOperators=None,
-            nfeTriggerDM=None, nOperRepl=None, _id=None):
+            nfeTriggerDM=None, nOperRepl=None, seed=None, _id=None):
         self.maxNFE = maxNFE
         self.populationSize = populationSize
         self.epsilons = epsilons
@@ -50,6 +55,7 @@ class SearchParameters(Entity):
         self.dOperators = dOperators
         self.nfeTriggerDM = nfeTriggerDM
         self.nOperRepl = nOperRepl
+        self.seed = seed
         super(SearchParameters,self).__init__(_id, "SearchParameters")
 
     @staticmethod
@@ -68,27 +74,128 @@ class SearchParameters(Entity):
             dOperators = d.get("dOperators", None),
             nfeTriggerDM = d.get("nfeTriggerDM", None),
             nOperRepl = d.get("nOperRepl", None),
+            seed = d.get("seed", None),
             _id = d.get("@id", None)
         )
 
+def get_bounds(value):
+    """Returns the (minimum, maximum) bounds of a number or quantitative
+    value where an unspecified (None) bound is open (infinite)."""
+    if isinstance(value, Number):
+        return value, value
+    return (-np.inf if value.minValue is None else value.minValue,
+            np.inf if value.maxValue is None else value.maxValue)
+
 class AnalysisOutputs(Entity):
     """Configuration options to filter analysis outputs based on ranges of parameters.
 
     Attributes:
-        obsTimeStep         Desired time step to record spacecraft state
+        obsTimeStep         Desired time step (s) to record spacecraft state
                             observations. True uses minimum simulation time
                             step. False toggles outputs off.
                             (default: True)
+        keplerianStates     Toggles satellite Keplerian state outputs
+                            (obs-#.csv). (default: True)
+        cartesianStates     Toggles satellite Cartesian state outputs
+                            (satellite_states-#.csv). (default: True)
+        accessPeriods       Toggles access period outputs (access.csv).
+                            (default: True)
+        localMetrics        Toggles performance measures local to points of
+                            interest (lcl*.csv). (default: True)
+        coveragePeriods     Toggles instrument coverage period outputs
+                            (coverage_*-#.csv). (default: True)
+        timeRange           Range of elapsed mission time (s) of state
+                            observations and access and coverage periods
+                            (periods overlapping the range are kept) where
+                            an unspecified bound is open.
+                            (default: None, all times)
+        region              Region bounding the points of interest of access,
+                            coverage, and local outputs.
+                            (default: None, all points)
+        satellites          List of indices of constellation member
+                            satellites of per-satellite outputs.
+                            (default: None, all satellites)
+        compression         Compression of CSV outputs: gzip or zstd (gzip
+                            if the zstandard package is not installed).
+                            (default: None, uncompressed)
     """
-    def __init__(self, obsTimeStep=True, _id=None):
+    def __init__(self, obsTimeStep=True, keplerianStates=True, cartesianStates=True,
+            accessPeriods=True, localMetrics=True, coveragePeriods=True,
+            timeRange=None, region=None, satellites=None, compression=None, _id=None):
         self.obsTimeStep = obsTimeStep
+        self.keplerianStates = keplerianStates
+        self.cartesianStates = cartesianStates
+        self.accessPeriods = accessPeriods
+        self.localMetrics = localMetrics
+        self.coveragePeriods = coveragePeriods
+        self.timeRange = timeRange
+        self.region = region
+        self.satellites = satellites
+        self.compression = compression
         super(AnalysisOutputs,self).__init__(_id, "AnalysisOutputs")
 
+    def is_satellite_selected(self, satellite):
+        """Returns True if outputs of a satellite (index) are selected."""
+        return self.satellites is None or satellite in self.satellites
+
+    def get_time_indices(self, times):
+        """Returns the array of indices of the time steps (s) of state
+        observations: the first step at or after each multiple of the
+        observation time step (all steps if True or none if False) within the
+        time range."""
+        times = np.asarray(times)
+        if self.obsTimeStep is False or len(times) == 0:
+            return np.zeros(0, dtype=int)
+        if self.obsTimeStep is True or not self.obsTimeStep:
+            indices = np.arange(len(times))
+        else:
+            samples = np.arange(times[0], times[-1] + 1e-9, self.obsTimeStep)
+            indices = np.unique(np.searchsorted(times, samples - 1e-9))
+            indices = indices[indices < len(times)]
+        if self.timeRange is not None:
+            minValue, maxValue = get_bounds(self.timeRange)
+            indices = indices[(times[indices] >= minValue) & (times[indices] <= maxValue)]
+        return indices
+
+    def get_point_mask(self, latitudes, longitudes):
+        """Returns a boolean array selecting points of interest within the
+        region."""
+        mask = np.ones(len(latitudes), dtype=bool)
+        if self.region is not None:
+            for values, bounds in ((latitudes, self.region.latitude),
+                                   (longitudes, self.region.longitude)):
+                if bounds is None:
+                    continue
+                minValue, maxValue = get_bounds(bounds)
+                mask &= (np.asarray(values) >= minValue) & (np.asarray(values) <= maxValue)
+        return mask
+
+    def get_period_mask(self, periods, pointMask=None):
+        """Returns a boolean array selecting periods (structured array or
+        dictionary of point, start, and end arrays) of points of interest
+        within a point mask which overlap the time range."""
+        mask = np.ones(len(periods["point"]), dtype=bool)
+        if pointMask is not None:
+            mask &= pointMask[np.asarray(periods["point"], dtype=int)]
+        if self.timeRange is not None:
+            minValue, maxValue = get_bounds(self.timeRange)
+            mask &= (periods["end"] >= minValue) & (periods["start"] <= maxValue)
+        return mask
+
     @staticmethod
     def from_dict(d):
         """Parses analysis outputs from a normalized JSON dictionary."""
         return AnalysisOutputs(
             obsTimeStep = d.get("obsTimeStep", True),
+            keplerianStates = d.get("keplerianStates", True),
+            cartesianStates = d.get("cartesianStates", True),
+            accessPeriods = d.get("accessPeriods", True),
+            localMetrics = d.get("localMetrics", True),
+            coveragePeriods = d.get("coveragePeriods", True),
+            timeRange = QuantitativeValue.from_json(d.get("timeRange", None)),
+            region = Region.from_json(d.get("region", None)),
+            satellites = d.get("satellites", None),
+            compression = d.get("compression", None),
             _id = d.get("@id", None)
         )
 
@@ -106,16 +213,18 @@ class AnalysisSettings(Entity):
                                     FF (full factorial)
                                     GA (genetic algorithm)
                                     KDO (knowledge-driven optimization)
+                                    SOBOL (Sobol sequence sampling of up to
+                                    maxNFE architectures)
                                 (default: FF)
         searchParameters        Parameters for the intelligent search strategy.
     """
 
-    def __init__(self, includePropulsion=True, outputs=AnalysisOutputs(), searchStrategy="FF",
+    def __init__(self, includePropulsion=True, outputs=None, searchStrategy="FF",
             searchParameters=None, _id=None):
         """Initialize a tradespace search object.
         """
         self.includePropulsion = includePropulsion
-        self.outputs = outputs
+        self.outputs = outputs if outputs is not None else AnalysisOutputs()
         self.searchStrategy = SearchStrategy.get(searchStrategy)
         self.searchParameters = searchParameters
         super(AnalysisSettings,self).__init__(_id, "AnalysisSettings")
@@ -140,12 +249,12 @@ class TradespaceSearch(Entity):
         settings       Settings specific to TAT-C analysis.
     """
 
-    def __init__(self, mission=MissionConcept(), designSpace=DesignSpace(), settings=AnalysisSettings(), _id=None):
+    def __init__(self, mission=None, designSpace=None, settings=None, _id=None):
         """Initialize a tradespace search object.
         """
-        self.mission = mission
-        self.designSpace = designSpace
-        self.settings = settings
+        self.mission = mission if mission is not None else MissionConcept()
+        self.designSpace = designSpace if designSpace is not None else DesignSpace()
+        self.settings = settings if settings is not None else AnalysisSettings()
         super(TradespaceSearch,self).__init__(_id, "TradespaceSearch")
 
     @staticmethod
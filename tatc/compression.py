@@ -0,0 +1,207 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Methods for streaming compression of large text (CSV) outputs.
+
+Compressed outputs are written as a sequence of independently compressed
+frames (gzip members or, if the zstandard package is installed, zstd frames)
+each holding up to FRAME_SIZE bytes of whole rows. Concatenated frames are a
+valid gzip (.gz) or zstd (.zst) file readable by standard tools (e.g. zcat),
+a file can be appended to by writing more frames, and a file can be read in
+chunks of whole rows (one frame at a time) without decompressing to disk.
+"""
+
+import io
+import os
+import gzip
+import zlib
+
+FRAME_SIZE = 1 << 20 # maximum uncompressed bytes per frame
+READ_SIZE = 1 << 16 # bytes read from compressed files per call
+GZIP_LEVEL = 6 # gzip compression level
+ZSTD_LEVEL = 3 # zstd compression level
+EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+def is_zstd_available():
+    """Returns True if the (optional) zstandard package is installed."""
+    try:
+        import zstandard
+    except ImportError:
+        return False
+    return True
+
+def get_codec(compression):
+    """Returns the codec (None, gzip, or zstd) used for a compression option.
+    zstd falls back to gzip if the zstandard package is not installed."""
+    if not compression:
+        return None
+    if compression not in EXTENSIONS:
+        raise ValueError("{0} is not a valid compression".format(compression))
+    if compression == "zstd" and not is_zstd_available():
+        return "gzip"
+    return compression
+
+def get_codec_of(path):
+    """Returns the codec of a file from its extension."""
+    for codec, extension in EXTENSIONS.items():
+        if path.endswith(extension):
+            return codec
+    return None
+
+def compress_frame(data, codec):
+    """Compresses data (bytes) to one frame."""
+    if codec == "gzip":
+        # gzip.compress only accepts mtime (for reproducible output) as of
+        # Python 3.8
+        out = io.BytesIO()
+        with gzip.GzipFile(fileobj=out, mode='wb', compresslevel=GZIP_LEVEL, mtime=0) as stream:
+            stream.write(data)
+        return out.getvalue()
+    import zstandard
+    return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+
+def get_decompressor(codec):
+    """Returns a decompression object for one frame."""
+    if codec == "gzip":
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+    import zstandard
+    return zstandard.ZstdDecompressor().decompressobj()
+
+class FrameWriter(object):
+    """A text file which writes compressed frames of whole rows. Only closing
+    the file writes a final row without a line ending.
+
+    Attributes:
+        path        Path of the compressed file.
+        codec       Compression codec (gzip or zstd).
+        file        Underlying binary file.
+        buffer      List of encoded text (bytes) not yet compressed.
+        size        Number of bytes in the buffer.
+    """
+    def __init__(self, path, codec, mode='w'):
+        self.path = path
+        self.codec = codec
+        self.file = open(path, mode + 'b')
+        self.buffer = []
+        self.size = 0
+
+    def write(self, text):
+        """Writes text (compressed once a frame of whole rows is buffered)."""
+        data = text.encode('utf-8')
+        self.buffer.append(data)
+        self.size += len(data)
+        if self.size >= FRAME_SIZE:
+            self.write_frame()
+        return len(text)
+
+    def write_frame(self, partial=False):
+        """Compresses and writes buffered whole rows (and, if partial, any
+        trailing partial row) as a frame."""
+        data = b"".join(self.buffer)
+        end = len(data) if partial else data.rfind(b"\n") + 1
+        if end > 0:
+            self.file.write(compress_frame(data[:end], self.codec))
+        self.buffer = [data[end:]] if end < len(data) else []
+        self.size = len(data) - end
+
+    def flush(self):
+        """Compresses and writes buffered whole rows as a frame (keeping any
+        partial row buffered)."""
+        if self.size > 0:
+            self.write_frame()
+        self.file.flush()
+
+    def close(self):
+        """Writes all buffered text and closes the file."""
+        if not self.file.closed:
+            if self.size > 0:
+                self.write_frame(partial=True)
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+def get_output_paths(path):
+    """Returns the paths of the uncompressed and compressed variants of an
+    output file."""
+    return [path] + [path + extension for extension in EXTENSIONS.values()]
+
+def find_output(path):
+    """Returns the path of the existing (uncompressed or compressed) variant
+    of an output file or None if none exists."""
+    for variant in get_output_paths(path):
+        if os.path.isfile(variant):
+            return variant
+    return None
+
+def remove_output(path):
+    """Removes all variants of an output file (if they exist)."""
+    for variant in get_output_paths(path):
+        if os.path.isfile(variant):
+            os.remove(variant)
+
+def open_output(path, compression=None, mode='w'):
+    """Opens an output file for writing (or appending) text, compressed with
+    the codec of a compression option (adding its extension to the path). In
+    write mode, variants with other compression are removed."""
+    codec = get_codec(compression)
+    target = path + EXTENSIONS[codec] if codec else path
+    if mode == 'w':
+        for variant in get_output_paths(path):
+            if variant != target and os.path.isfile(variant):
+                os.remove(variant)
+    if codec is None:
+        return open(target, mode, newline='')
+    return FrameWriter(target, codec, mode)
+
+def iter_frames(path):
+    """Generates the uncompressed data (bytes) of each frame of a compressed
+    file (or blocks of whole rows of an uncompressed file)."""
+    codec = get_codec_of(path)
+    with open(path, 'rb') as infile:
+        if codec is None:
+            rest = b""
+            for block in iter(lambda: infile.read(FRAME_SIZE), b""):
+                data = rest + block
+                end = data.rfind(b"\n") + 1
+                if end > 0:
+                    yield data[:end]
+                rest = data[end:]
+            if rest:
+                yield rest
+            return
+        data = infile.read(READ_SIZE)
+        while data:
+            decompressor = get_decompressor(codec)
+            chunks = []
+            while True:
+                chunks.append(decompressor.decompress(data))
+                if decompressor.eof:
+                    data = decompressor.unused_data or infile.read(READ_SIZE)
+                    break
+                data = infile.read(READ_SIZE)
+                if not data:
+                    raise EOFError("{0} ends within a frame".format(path))
+            yield b"".join(chunks)
+
+def iter_chunks(path):
+    """Generates chunks of whole rows (text) of an output file."""
+    for frame in iter_frames(path):
+        yield frame.decode('utf-8')
+
+def open_input(path):
+    """Opens an (uncompressed or compressed) output file for streaming
+    reading of text."""
+    codec = get_codec_of(path)
+    if codec is None:
+        return open(path, 'r', newline='')
+    if codec == "gzip":
+        stream = gzip.open(path, 'rb')
+    else:
+        import zstandard
+        stream = zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'),
+            read_across_frames=True, closefd=True)
+    return io.TextIOWrapper(stream, encoding='utf-8', newline='')
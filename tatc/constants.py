@@ -0,0 +1,15 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Physical constants shared by object models and analysis methods.
+"""
+
+EARTH_RADIUS = 6378.14 # radius of the earth (km)
+EARTH_MU = 3.98600440*(10**5) # gravitational constant (km^3/s^2)
+EARTH_J2 = 1.08262668e-3 # second zonal harmonic coefficient
+EARTH_ROTATION_RATE = 7.2921158553e-5 # sidereal rotation rate (rad/s)
+SSO_COEFFICIENT = 10.10949 # sun-synchronous inclination coefficient
+
+SPEED_OF_LIGHT = 299792458. # speed of light (m/s)
+PLANCK_CONSTANT = 6.62607015e-34 # Planck constant (J s)
+BOLTZMANN_CONSTANT = 1.380649e-23 # Boltzmann constant (J/K)
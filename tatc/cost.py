@@ -0,0 +1,282 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Object models and methods for parametric cost estimation.
+
+Costs are estimated with cost estimating relationships (CERs) evaluated over
+all satellites of a population of architectures at once. Each CER carries a
+fractional standard error of the estimate (SEE) which is propagated
+analytically: errors of one CER are fully correlated across the satellites
+and derived (wrap) costs to which it contributes and independent of errors
+of other CERs.
+
+CER coefficients are nominal values (FY2019 thousands of dollars) following
+the forms of the Unmanned Space Vehicle Cost Model (USCM8) for the spacecraft
+bus, the NASA Instrument Cost Model (NICM) for payloads, and the Small
+Satellite Cost Model (SSCM) for wrap factors; estimates are reported in
+dollars.
+"""
+
+import collections
+import numpy as np
+
+from .orbits import get_mission_period, AnalysisCache
+from .coverage import get_payload
+from .manifest import plan_launches
+
+FISCAL_YEAR = 2019 # fiscal year of cost estimates
+COST_UNITS = 1000. # dollars per CER unit (thousands of dollars)
+SECONDS_PER_YEAR = 365.25*86400.
+
+class CostEstimatingRelationship(object):
+    """A power-law cost estimating relationship of the form:
+        cost = fixed + scale*(x1/ref1)^exp1*(x2/ref2)^exp2*...
+    where undefined (NaN) drivers take their reference value.
+
+    Attributes:
+        name            Name of this relationship.
+        drivers         List of (driver name, reference value, exponent).
+        scale           Scale coefficient (FY$K).
+        fixed           Fixed cost coefficient (FY$K).
+        standardError   Fractional standard error of the estimate.
+    """
+    def __init__(self, name, drivers, scale, fixed=0., standardError=0.):
+        self.name = name
+        self.drivers = drivers
+        self.scale = scale
+        self.fixed = fixed
+        self.standardError = standardError
+
+    def evaluate(self, values):
+        """Evaluates this relationship for a dictionary of driver arrays."""
+        cost = self.scale
+        for driver, reference, exponent in self.drivers:
+            x = np.asarray(values[driver], dtype=float)
+            cost = cost*np.power(np.where(np.isnan(x), reference, x)/reference, exponent)
+        return self.fixed + cost
+
+BUS_NONRECURRING_CER = CostEstimatingRelationship(
+    "Spacecraft bus non-recurring", [("busMass", 1., 1.)], 110.2, standardError=0.38)
+BUS_RECURRING_CER = CostEstimatingRelationship(
+    "Spacecraft bus theoretical first unit", [("busMass", 1., 0.716)], 283.5, standardError=0.44)
+PAYLOAD_CER = CostEstimatingRelationship(
+    "Payload development and first unit", [("payloadPower", 61.5, 0.32),
+    ("payloadMass", 53.8, 0.26), ("payloadDataRate", 40.4, 0.11)], 25600., standardError=0.40)
+
+PAYLOAD_NONRECURRING_FRACTION = 0.7 # fraction of payload cost non-recurring
+TRL_COST_GROWTH = 0.1 # non-recurring cost growth per TRL below 9
+IAT_WRAP = 0.139 # integration, assembly and test (fraction of hardware)
+PROGRAM_WRAP = 0.229 # program level (fraction of hardware)
+GSE_WRAP = 0.066 # ground support equipment (fraction of hardware)
+LOOS_WRAP = 0.061 # launch and orbital operations support (fraction of hardware)
+LAUNCH_COST_PER_KG = 20. # launch cost (FY$K/kg) if not otherwise specified
+GROUND_STATION_COST = 1000. # non-recurring cost per ground station (FY$K)
+GROUND_STATION_OPERATIONS_COST = 250. # cost per ground station-year (FY$K)
+SATELLITE_OPERATIONS_COST = 500. # cost per satellite-year (FY$K)
+
+COST_ELEMENTS = [
+    "groundCost", "hardwareCost", "iatCost", "launchCost", "lifecycleCost",
+    "nonRecurringCost", "operationsCost", "programCost", "recurringCost"
+]
+ERROR_SOURCES = [BUS_NONRECURRING_CER, BUS_RECURRING_CER, PAYLOAD_CER]
+
+def get_learning_slope(numberUnits):
+    """Returns the learning curve slope (fraction of cost per doubling of
+    units produced) based on the number of units of a design."""
+    numberUnits = np.asarray(numberUnits)
+    return np.where(numberUnits < 10, 0.95, np.where(numberUnits <= 50, 0.90, 0.85))
+
+def get_unit_numbers(designs):
+    """Returns the unit number (starting at 1) of each unit given an array of
+    design indices in production order and the total number of units of the
+    design of each unit."""
+    designs = np.asarray(designs, dtype=int)
+    order = np.argsort(designs, kind='stable')
+    sortedDesigns = designs[order]
+    first = np.flatnonzero(np.r_[True, sortedDesigns[1:] != sortedDesigns[:-1]]) \
+        if len(designs) else np.zeros(0, dtype=int)
+    counts = np.diff(np.r_[first, len(designs)]).astype(int)
+    units = np.empty(len(designs), dtype=int)
+    numberUnits = np.empty(len(designs), dtype=int)
+    units[order] = np.arange(len(designs)) - np.repeat(first, counts) + 1
+    numberUnits[order] = np.repeat(counts, counts)
+    return units, numberUnits
+
+def get_learning_factors(units, numberUnits):
+    """Returns the learning curve factor (unit cost as a fraction of the
+    theoretical first unit cost) of each unit."""
+    return np.power(np.asarray(units, dtype=float), np.log2(get_learning_slope(numberUnits)))
+
+def get_satellite_drivers(satellites):
+    """Returns a dictionary of cost driver arrays (one element per satellite)
+    including the design index of each satellite."""
+    drivers = collections.defaultdict(list)
+    designs = {}
+    # drivers are evaluated once per satellite object (e.g. templates shared
+    # by the members of a ConstellationState)
+    evaluated = {}
+    for satellite in satellites:
+        if id(satellite) in evaluated:
+            for name, value in evaluated[id(satellite)]:
+                drivers[name].append(value)
+            continue
+        payload = get_payload(satellite)
+        payloadMass = sum(instrument.mass or 0 for instrument in payload)
+        drivers["mass"].append(satellite.mass or 0)
+        drivers["busMass"].append(max((satellite.mass or 0) - payloadMass, 0))
+        drivers["power"].append(satellite.power or 0)
+        drivers["payloadMass"].append(payloadMass)
+        drivers["payloadPower"].append(sum(instrument.power or 0 for instrument in payload))
+        drivers["payloadDataRate"].append(sum(instrument.dataRate or 0 for instrument in payload)
+            if any(instrument.dataRate for instrument in payload) else np.nan)
+        drivers["payloadCount"].append(len(payload))
+        drivers["techReadinessLevel"].append(satellite.techReadinessLevel or 9)
+        drivers["payloadTechReadinessLevel"].append(min(
+            [instrument.techReadinessLevel or 9 for instrument in payload] or [9]))
+        # satellites with identical cost drivers share a design
+        key = tuple(drivers[name][-1] for name in sorted(drivers) if name != "design")
+        drivers["design"].append(designs.setdefault(key, len(designs)))
+        evaluated[id(satellite)] = [(name, values[-1]) for name, values in drivers.items()]
+    return dict((name, np.array(values, dtype=float)) for name, values in drivers.items())
+
+class CostAnalysis(object):
+    """Results of cost analysis for a population of architectures.
+
+    Attributes:
+        estimates       Dictionary of cost element name to an array of
+                        estimates (dollars) with one element per architecture.
+        errors          Dictionary of cost element name to an array of error
+                        contributions (dollars) with one row per architecture
+                        and one column per independent error source.
+        fiscalYear      Fiscal year of cost estimates.
+    """
+    def __init__(self, estimates, errors, fiscalYear=FISCAL_YEAR):
+        self.estimates = estimates
+        self.errors = errors
+        self.fiscalYear = fiscalYear
+
+    def get_standard_error(self, name):
+        """Returns the standard error of a cost element for each architecture."""
+        return np.sqrt(np.sum(np.square(self.errors[name]), axis=1))
+
+    def to_dict(self, index):
+        """Returns the cost estimates of one architecture as a dictionary
+        formatted for the cost and risk analysis outputs."""
+        return collections.OrderedDict(
+            (name, {
+                "estimate": float(self.estimates[name][index]),
+                "fiscalYear": self.fiscalYear,
+                "standardError": float(self.get_standard_error(name)[index])
+            }) for name in COST_ELEMENTS)
+
+def get_launch_costs(architectures, launchers):
+    """Returns launch costs (dollars, one element per architecture) of the
+    launch manifests of architectures planned over launch vehicles (or None
+    if there are no launch vehicles). Satellites which cannot be carried by
+    any launch vehicle are estimated by mass."""
+    if not launchers:
+        return None
+    costs = np.zeros(len(architectures))
+    for i, architecture in enumerate(architectures):
+        satellites = (architecture.constellation.satellites
+                      if architecture.constellation is not None else None) or []
+        if not satellites: continue
+        manifest = plan_launches(satellites, launchers)
+        costs[i] = manifest.get_cost() + sum(satellites[s].mass or 0
+            for s in manifest.unassigned)*LAUNCH_COST_PER_KG*COST_UNITS
+    return costs
+
+def estimate_costs(mission, architectures, launchCosts=None):
+    """Estimates costs for a population of architectures in one vectorized
+    evaluation over all member satellites. Launch costs (dollars, one element
+    per architecture) are estimated by mass if not specified."""
+    size = len(architectures)
+    satellites, index, stations = [], [], np.zeros(size)
+    for i, architecture in enumerate(architectures):
+        members = (architecture.constellation.satellites
+                   if architecture.constellation is not None else None) or []
+        satellites.extend(members)
+        index.extend([i]*len(members))
+        network = architecture.groundNetwork
+        stations[i] = len((network.groundStations if network is not None else None) or [])
+    index = np.array(index, dtype=int)
+    drivers = get_satellite_drivers(satellites) if satellites \
+        else collections.defaultdict(lambda: np.zeros(0))
+    # learning applies to units of the same design within an architecture
+    designs = index*(int(np.max(drivers["design"])) + 1 if len(index) else 1) \
+        + drivers["design"].astype(int)
+    units, numberUnits = get_unit_numbers(designs)
+    learning = get_learning_factors(units, numberUnits)
+    # non-recurring costs are incurred once per design
+    firstUnit = units == 1
+    busGrowth = 1 + TRL_COST_GROWTH*np.clip(9 - drivers["techReadinessLevel"], 0, None)
+    payloadGrowth = 1 + TRL_COST_GROWTH*np.clip(9 - drivers["payloadTechReadinessLevel"], 0, None)
+    payload = np.where(drivers["payloadCount"] > 0, PAYLOAD_CER.evaluate(drivers), 0)
+    def total(values):
+        return np.bincount(index, weights=values, minlength=size)*COST_UNITS
+    # hardware costs with one column per independent error source
+    zeros = np.zeros(size)
+    nonRecurring = np.stack([
+        total(np.where(firstUnit, BUS_NONRECURRING_CER.evaluate(drivers)*busGrowth, 0)),
+        zeros,
+        total(np.where(firstUnit, PAYLOAD_NONRECURRING_FRACTION*payload*payloadGrowth, 0))
+    ], axis=1)
+    recurring = np.stack([
+        zeros,
+        total(BUS_RECURRING_CER.evaluate(drivers)*learning),
+        total((1 - PAYLOAD_NONRECURRING_FRACTION)*payload*learning)
+    ], axis=1)
+    hardware = nonRecurring + recurring
+    standardErrors = np.array([cer.standardError for cer in ERROR_SOURCES])
+    # mission duration (years) for operations costs
+    years = get_mission_period(mission)[1]/SECONDS_PER_YEAR
+    if launchCosts is None:
+        launch = total(drivers["mass"]*LAUNCH_COST_PER_KG)
+    else:
+        launch = np.asarray(launchCosts, dtype=float)
+    operations = (np.bincount(index, minlength=size)*SATELLITE_OPERATIONS_COST
+        + stations*GROUND_STATION_OPERATIONS_COST)*years*COST_UNITS
+    stationCost = stations*GROUND_STATION_COST*COST_UNITS
+    wraps = 1 + IAT_WRAP + PROGRAM_WRAP + GSE_WRAP
+    components = collections.OrderedDict([
+        ("hardwareCost", (hardware, 0)),
+        ("iatCost", (IAT_WRAP*hardware, 0)),
+        ("programCost", (PROGRAM_WRAP*hardware, 0)),
+        ("groundCost", (GSE_WRAP*hardware, stationCost)),
+        ("launchCost", (LOOS_WRAP*hardware, launch)),
+        ("operationsCost", (0*hardware, operations)),
+        ("nonRecurringCost", (wraps*nonRecurring, stationCost)),
+        ("recurringCost", (wraps*recurring + LOOS_WRAP*hardware, launch + operations)),
+        ("lifecycleCost", ((wraps + LOOS_WRAP)*hardware, launch + operations + stationCost))
+    ])
+    # estimated costs are the sum of CER-derived costs (with standard errors
+    # proportional to each source) and other costs (without error)
+    return CostAnalysis(
+        collections.OrderedDict((name, np.sum(cer, axis=1) + other)
+            for name, (cer, other) in components.items()),
+        collections.OrderedDict((name, cer*standardErrors)
+            for name, (cer, other) in components.items()))
+
+COST_CACHE = AnalysisCache(maxSize=2**16)
+
+def get_cost_key(mission, architecture, launchers=None):
+    """Returns the memoization key of the cost estimates of an architecture."""
+    return (mission.fingerprint(), architecture.fingerprint(),
+            tuple(launcher.fingerprint() for launcher in launchers or []))
+
+def estimate_cost(mission, architecture, cache=COST_CACHE, launchers=None):
+    """Returns (or recalls) the cost estimates of one architecture formatted
+    for the cost and risk analysis outputs. Launch costs follow the launch
+    manifest over launch vehicles (if any)."""
+    return collections.OrderedDict(cache.get(get_cost_key(mission, architecture, launchers),
+        lambda: estimate_costs(mission, [architecture],
+                               get_launch_costs([architecture], launchers)).to_dict(0)))
+
+def prepare_costs(mission, architectures, cache=COST_CACHE, launchers=None):
+    """Estimates costs for a population of architectures in one batch and
+    stores the results so subsequent calls to estimate_cost are recalled."""
+    keys = [get_cost_key(mission, architecture, launchers) for architecture in architectures]
+    analysis = estimate_costs(mission, architectures, get_launch_costs(architectures, launchers))
+    for i, key in enumerate(keys):
+        cache.get(key, lambda: analysis.to_dict(i))
+    return analysis
@@ -0,0 +1,417 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Object models and methods for instrument coverage analysis.
+
+The coverage engine evaluates every sample of every per-satellite access
+window exactly once to compute the shared viewing geometry (look angle,
+incidence angle, observation range, and target direction in the satellite
+body frame). Sensor-specific performance measures are computed from the
+shared geometry by pluggable kernels registered per instrument type.
+
+The satellite body frame is nadir-pointing with the z-axis towards nadir,
+the y-axis along-track (towards the velocity direction), and the x-axis
+completing a right-handed frame (cross-track).
+"""
+
+import math
+import collections
+import numpy as np
+from numbers import Number
+
+from .instrument import (FieldOfView, SensorGeometry, OrientationConvention,
+    OpticalScanner, SyntheticApertureRadar)
+from .constants import EARTH_RADIUS, SPEED_OF_LIGHT, PLANCK_CONSTANT, BOLTZMANN_CONSTANT
+from .orbits import get_unit_vectors, get_summary
+
+
+class CoverageGeometry(object):
+    """Viewing geometry for each sample of each per-satellite access window.
+
+    Attributes:
+        access          Index of the per-satellite access interval.
+        satellite       Satellite index.
+        point           Point of interest index.
+        time            Sample time (s) after the epoch.
+        direction       Unit direction to the point of interest in the
+                        satellite body frame (samples x 3).
+        lookAngle       Off-nadir look angle (deg).
+        incidenceAngle  Incidence angle (deg) at the point of interest.
+        range           Observation range (km).
+        groundSpeed     Speed (km/s) of the sub-satellite point.
+    """
+    def __init__(self, access, satellite, point, time, direction, lookAngle,
+                 incidenceAngle, range, groundSpeed):
+        self.access = access
+        self.satellite = satellite
+        self.point = point
+        self.time = time
+        self.direction = direction
+        self.lookAngle = lookAngle
+        self.incidenceAngle = incidenceAngle
+        self.range = range
+        self.groundSpeed = groundSpeed
+
+    def select(self, mask):
+        """Returns the geometry of a subset of samples."""
+        return CoverageGeometry(self.access[mask], self.satellite[mask],
+            self.point[mask], self.time[mask], self.direction[mask],
+            self.lookAngle[mask], self.incidenceAngle[mask], self.range[mask],
+            self.groundSpeed[mask])
+
+def compute_geometry(analysis):
+    """Computes the viewing geometry for every sample of every per-satellite
+    access interval of a constellation analysis in a single vectorized pass."""
+    access = analysis.satelliteAccess
+    times = analysis.times
+    # expand access intervals to (inclusive) sample indices
+    first = np.searchsorted(times, access['start'])
+    last = np.minimum(np.searchsorted(times, access['end']), len(times) - 1)
+    counts = np.maximum(last - first + 1, 0)
+    index = np.repeat(np.arange(len(access)), counts)
+    offset = np.arange(len(index)) - np.repeat(np.cumsum(counts) - counts, counts)
+    timeIndex = first[index] + offset
+    satellite = access['satellite'][index]
+    point = access['point'][index]
+    # rotate Earth-fixed positions to the inertial frame
+    cT, sT = analysis.get_rotation(timeIndex)
+    def to_inertial(v):
+        return np.column_stack((cT*v[:, 0] - sT*v[:, 1], sT*v[:, 0] + cT*v[:, 1], v[:, 2]))
+    position = to_inertial(analysis.positions[satellite, timeIndex])
+    velocity = analysis.velocities[satellite, timeIndex]
+    target = to_inertial(EARTH_RADIUS*get_unit_vectors(
+        analysis.points[0][point], analysis.points[1][point]))
+    radius = np.linalg.norm(position, axis=1)
+    nadir = -position/radius[:, np.newaxis]
+    alongTrack = velocity - np.sum(velocity*nadir, axis=1)[:, np.newaxis]*nadir
+    alongTrack /= np.linalg.norm(alongTrack, axis=1)[:, np.newaxis]
+    crossTrack = np.cross(alongTrack, nadir)
+    los = target - position
+    distance = np.linalg.norm(los, axis=1)
+    los /= distance[:, np.newaxis]
+    direction = np.column_stack((
+        np.sum(los*crossTrack, axis=1), np.sum(los*alongTrack, axis=1), np.sum(los*nadir, axis=1)
+    ))
+    return CoverageGeometry(
+        access=index, satellite=satellite, point=point, time=times[timeIndex],
+        direction=direction,
+        lookAngle=np.degrees(np.arccos(np.clip(direction[:, 2], -1, 1))),
+        incidenceAngle=np.degrees(np.arccos(np.clip(
+            -np.sum(los*target, axis=1)/EARTH_RADIUS, -1, 1))),
+        range=distance,
+        groundSpeed=np.linalg.norm(velocity, axis=1)*EARTH_RADIUS/radius
+    )
+
+def get_rotation(orientation):
+    """Returns the rotation matrix from the sensor frame to the satellite body
+    frame for an instrument orientation."""
+    def rotate(axis, angle):
+        c, s = math.cos(math.radians(angle or 0)), math.sin(math.radians(angle or 0))
+        if axis == 0: return np.array([[1, 0, 0], [0, c, -s], [0, s, c]])
+        if axis == 1: return np.array([[c, 0, s], [0, 1, 0], [-s, 0, c]])
+        return np.array([[c, -s, 0], [s, c, 0], [0, 0, 1]])
+    if orientation is None:
+        return np.eye(3)
+    if orientation.convention == OrientationConvention.SIDE_LOOK:
+        return rotate(1, orientation.sideLookAngle)
+    return np.dot(np.dot(rotate(0, orientation.xRotation),
+                         rotate(1, orientation.yRotation)), rotate(2, orientation.zRotation))
+
+def get_fov_mask(fieldOfView, orientation, direction, access=None):
+    """Returns a boolean mask of body-frame directions within a field of view.
+
+    For rectangular fields of view, samples of the same access (if provided)
+    which straddle the along-track boresight plane are also tested at the
+    interpolated crossing so narrow along-track (e.g. pushbroom or radar)
+    sensors are not missed between time samples.
+    """
+    if fieldOfView is None:
+        return np.ones(len(direction), dtype=bool)
+    if isinstance(fieldOfView, Number):
+        fieldOfView = FieldOfView.from_dict(fieldOfView)
+    sensor = np.dot(direction, get_rotation(orientation))
+    if fieldOfView.sensorGeometry != SensorGeometry.RECTANGULAR:
+        return np.degrees(np.arccos(np.clip(sensor[:, 2], -1, 1))) <= (fieldOfView.fullConeAngle or 0)/2.
+    crossTrack = np.degrees(np.arctan2(sensor[:, 0], sensor[:, 2]))
+    alongTrack = np.degrees(np.arctan2(sensor[:, 1], sensor[:, 2]))
+    crossLimit = (fieldOfView.crossTrackFieldOfView or 0)/2.
+    mask = ((sensor[:, 2] > 0) & (np.abs(crossTrack) <= crossLimit)
+            & (np.abs(alongTrack) <= (fieldOfView.alongTrackFieldOfView or 0)/2.))
+    if access is not None and len(access) > 1:
+        # find consecutive samples of one access on opposite sides of the plane
+        straddle = ((access[1:] == access[:-1]) & (sensor[1:, 2] > 0) & (sensor[:-1, 2] > 0)
+                    & (np.sign(alongTrack[1:]) != np.sign(alongTrack[:-1])))
+        k = np.flatnonzero(straddle)
+        weight = alongTrack[k]/(alongTrack[k] - alongTrack[k + 1])
+        crossing = crossTrack[k] + weight*(crossTrack[k + 1] - crossTrack[k])
+        covered = k[np.abs(crossing) <= crossLimit]
+        nearest = np.where(weight[np.abs(crossing) <= crossLimit] <= 0.5, covered, covered + 1)
+        mask[nearest] = True
+    return mask
+
+def _value(value):
+    """Returns a numeric value or NaN if undefined."""
+    return np.nan if value is None else float(value)
+
+def _from_db(value):
+    """Converts a decibel value to a linear ratio (NaN if undefined)."""
+    return 10**(_value(value)/10.)
+
+class CoverageKernel(object):
+    """Base coverage kernel reporting basic sensor viewing geometry.
+
+    Attributes:
+        name        Kernel name used to label outputs.
+        metrics     Ordered list of metric names computed by the kernel.
+    """
+    name = "basic_sensor"
+    metrics = ["IncidenceAngle", "LookAngle", "ObservationRange"]
+
+    def applies(self, instrument):
+        """Returns True if this kernel applies to an instrument."""
+        return True
+
+    def get_field_of_view(self, instrument):
+        """Returns the field of view of an instrument."""
+        return instrument.fieldOfView
+
+    def evaluate(self, instrument, geometry):
+        """Evaluates metrics for each sample of the viewing geometry. Returns a
+        dictionary of metric arrays."""
+        return {
+            "IncidenceAngle": geometry.incidenceAngle,
+            "LookAngle": geometry.lookAngle,
+            "ObservationRange": geometry.range
+        }
+
+    def is_covered(self, instrument, geometry, metrics):
+        """Returns a boolean mask of samples satisfying performance thresholds."""
+        return np.ones(len(geometry.range), dtype=bool)
+
+class OpticalScannerKernel(CoverageKernel):
+    """Coverage kernel for passive optical scanners.
+
+    Assumes SI units for focal length, detector width, operating wavelength,
+    and bandwidth (m) and target black body temperature (K).
+    """
+    name = "optical_scanner"
+    metrics = ["NoiseEquivalentDeltaT", "DynamicRange", "SignalToNoiseRatio",
+               "AlongTrackResolution", "CrossTrackResolution"]
+
+    def applies(self, instrument):
+        return isinstance(instrument, OpticalScanner)
+
+    def evaluate(self, instrument, geometry):
+        rangeM = geometry.range*1e3
+        ifov = _value(instrument.detectorWidth)/_value(instrument.focalLength)
+        alongTrack = ifov*rangeM
+        crossTrack = ifov*rangeM/np.cos(np.radians(geometry.incidenceAngle))
+        # integration time limited by the along-track pixel dwell time
+        integration = alongTrack/(geometry.groundSpeed*1e3)
+        if instrument.scanTechnique == "WHISKBROOM":
+            integration = integration/_value(instrument.numberDetectorsCrossTrack)
+        wavelength = _value(instrument.operatingWavelength)
+        temperature = _value(instrument.targetBlackBodyTemp)
+        x = PLANCK_CONSTANT*SPEED_OF_LIGHT/(wavelength*BOLTZMANN_CONSTANT*temperature)
+        # black body spectral radiance (W/m2/sr/m) integrated over bandwidth
+        radiance = 2*PLANCK_CONSTANT*SPEED_OF_LIGHT**2/wavelength**5/np.expm1(x) \
+            * _value(instrument.bandwidth)
+        aperture = math.pi/4*(_value(instrument.focalLength)/_value(instrument.fNumber))**2
+        photons = radiance*aperture*ifov**2*integration/(PLANCK_CONSTANT*SPEED_OF_LIGHT/wavelength)
+        signal = photons*_value(instrument.opticalTransmissionFactor)*_value(instrument.quantumEfficiency)
+        readNoise = _value(instrument.numberReadOutElectrons)
+        noise = np.sqrt(signal + readNoise**2)
+        # temperature derivative of the black body signal
+        derivative = signal*x/temperature*np.exp(x)/np.expm1(x)
+        return {
+            "NoiseEquivalentDeltaT": noise/derivative,
+            "DynamicRange": signal/readNoise,
+            "SignalToNoiseRatio": signal/noise,
+            "AlongTrackResolution": alongTrack,
+            "CrossTrackResolution": crossTrack
+        }
+
+class SyntheticApertureRadarKernel(CoverageKernel):
+    """Coverage kernel for synthetic aperture radars.
+
+    Assumes SI units for antenna dimensions (m), operating frequency and chirp
+    bandwidth (Hz), peak transmit power (W), pulse width (s), and scene noise
+    temperature (K); noise figure, losses, and threshold sigma naught in dB.
+    The field of view is the antenna main lobe oriented by the instrument.
+    """
+    name = "synthetic_aperture_radar"
+    metrics = ["NoiseEquivalentSigma0", "AlongTrackResolution",
+               "CrossTrackResolution", "SwathWidth", "IncidenceAngle"]
+
+    def applies(self, instrument):
+        return isinstance(instrument, SyntheticApertureRadar)
+
+    def get_field_of_view(self, instrument):
+        wavelength = SPEED_OF_LIGHT/_value(instrument.operatingFrequency)
+        return FieldOfView(
+            sensorGeometry="RECTANGULAR",
+            alongTrackFieldOfView=math.degrees(wavelength/_value(instrument.antennaDimensionAlongTrack)),
+            crossTrackFieldOfView=math.degrees(wavelength/_value(instrument.antennaDimensionCrossTrack))
+        )
+
+    def evaluate(self, instrument, geometry):
+        wavelength = SPEED_OF_LIGHT/_value(instrument.operatingFrequency)
+        rangeM = geometry.range*1e3
+        incidence = np.radians(geometry.incidenceAngle)
+        area = _value(instrument.antennaDimensionAlongTrack)*_value(instrument.antennaDimensionCrossTrack)
+        gain = 4*math.pi*_value(instrument.antennaApertureEfficiency)*area/wavelength**2
+        prf = _value(instrument.minPulseRepetitionFrequency)
+        nesz = (2*(4*math.pi)**3*rangeM**3*geometry.groundSpeed*1e3*BOLTZMANN_CONSTANT
+            *_value(instrument.sceneNoiseTemp)*_from_db(instrument.systemNoiseFigure)
+            *_value(instrument.chirpBandwidth)*_from_db(instrument.radarLosses)*np.sin(incidence)
+            /(_value(instrument.peakTransmitPower)*gain**2*wavelength**3*SPEED_OF_LIGHT
+              *_value(instrument.pulseWidth)*prf))
+        return {
+            "NoiseEquivalentSigma0": 10*np.log10(nesz),
+            "AlongTrackResolution": np.full(len(rangeM), _value(instrument.antennaDimensionAlongTrack)/2),
+            "CrossTrackResolution": SPEED_OF_LIGHT/(2*_value(instrument.chirpBandwidth)*np.sin(incidence)),
+            "SwathWidth": wavelength/_value(instrument.antennaDimensionCrossTrack)*rangeM/np.cos(incidence),
+            "IncidenceAngle": geometry.incidenceAngle
+        }
+
+    def is_covered(self, instrument, geometry, metrics):
+        if instrument.thresholdSigmaNEZ0 is None:
+            return np.ones(len(geometry.range), dtype=bool)
+        return metrics["NoiseEquivalentSigma0"] <= instrument.thresholdSigmaNEZ0
+
+KERNELS = collections.OrderedDict()
+
+def register_kernel(kernel):
+    """Registers a coverage kernel (replacing any kernel of the same name)."""
+    KERNELS[kernel.name] = kernel
+
+register_kernel(CoverageKernel())
+register_kernel(OpticalScannerKernel())
+register_kernel(SyntheticApertureRadarKernel())
+
+def get_payload(satellite):
+    """Returns the list of instruments carried by a satellite."""
+    if satellite.payload is None: return []
+    if isinstance(satellite.payload, list): return satellite.payload
+    return [satellite.payload]
+
+class CoverageAnalysis(object):
+    """Results of instrument coverage analysis.
+
+    Attributes:
+        geometry        Shared viewing geometry (CoverageGeometry).
+        results         Dictionary of kernel name to a list of per-access
+                        results (one dictionary of arrays per satellite
+                        instrument) with keys satellite, instrument, access
+                        (index of the access period of the satellite), point,
+                        start, end, coverage, and kernel metrics.
+    """
+    def __init__(self, geometry, results):
+        self.geometry = geometry
+        self.results = results
+
+    def get_results(self, name, satellite):
+        """Returns the concatenated per-access results of a kernel for one
+        satellite (all instruments) as a dictionary of arrays. Accesses are
+        numbered sequentially over the concatenated results so each row of
+        a satellite has a distinct access (event) index."""
+        kernel = KERNELS[name]
+        rows = [r for r in self.results.get(name, []) if r["satellite"] == satellite]
+        keys = ["access", "point", "start", "end", "coverage"] + kernel.metrics
+        if not rows:
+            return dict((key, np.zeros(0)) for key in keys)
+        results = dict((key, np.concatenate([r[key] for r in rows])) for key in keys)
+        results["access"] = np.arange(len(results["point"]))
+        return results
+
+    def get_covered(self, name, deployTimes=None):
+        """Returns a list of (row, covered mask) pairs of a kernel. If the
+        deployment time (s) of each satellite is given, only accesses
+        beginning after deployment are covered."""
+        rows = self.results.get(name, [])
+        if deployTimes is None:
+            return [(r, r["coverage"]) for r in rows]
+        deployTimes = np.asarray(deployTimes, dtype=float)
+        return [(r, r["coverage"] & (r["start"] >= deployTimes[r["satellite"]]))
+                for r in rows]
+
+    def get_global_metrics(self, name, deployTimes=None):
+        """Returns min/max/avg summaries of kernel metrics over covered
+        accesses (optionally of a partially-deployed constellation)."""
+        kernel = KERNELS[name]
+        rows = self.get_covered(name, deployTimes)
+        summary = collections.OrderedDict()
+        for metric in kernel.metrics:
+            values = [r[metric][covered] for r, covered in rows]
+            summary[metric] = get_summary(np.concatenate(values) if values else [])
+        return summary
+
+    def get_local_metrics(self, name, numberPoints, deployTimes=None):
+        """Returns per-point min/max/avg kernel metrics over covered accesses
+        (optionally of a partially-deployed constellation) as a dictionary of
+        metric name to (min, max, avg) arrays."""
+        kernel = KERNELS[name]
+        rows = self.get_covered(name, deployTimes)
+        point = np.concatenate([r["point"][covered] for r, covered in rows]) if rows else np.zeros(0, dtype=int)
+        local = collections.OrderedDict()
+        for metric in kernel.metrics:
+            values = np.concatenate([r[metric][covered] for r, covered in rows]) if rows else np.zeros(0)
+            valid = ~np.isnan(values)
+            p, v = point[valid].astype(int), values[valid]
+            count = np.bincount(p, minlength=numberPoints)
+            minimum = np.full(numberPoints, np.nan)
+            maximum = np.full(numberPoints, np.nan)
+            np.fmin.at(minimum, p, v)
+            np.fmax.at(maximum, p, v)
+            average = np.where(count > 0, np.bincount(p, weights=v, minlength=numberPoints)
+                / np.maximum(count, 1), np.nan)
+            local[metric] = (minimum, maximum, average)
+        return local
+
+def analyze_coverage(analysis, satellites, kernels=None):
+    """Performs instrument coverage analysis for the satellites of a
+    constellation analysis. Geometry is computed once for all access samples;
+    each registered kernel is evaluated only for instruments it applies to."""
+    kernels = list(KERNELS.values()) if kernels is None else kernels
+    geometry = compute_geometry(analysis)
+    access = analysis.satelliteAccess
+    results = collections.OrderedDict((kernel.name, []) for kernel in kernels)
+    for s, satellite in enumerate(satellites):
+        selected = geometry.satellite == s
+        satelliteGeometry = geometry.select(selected)
+        accessIndex = np.flatnonzero(access['satellite'] == s)
+        for j, instrument in enumerate(get_payload(satellite)):
+            for kernel in kernels:
+                if not kernel.applies(instrument): continue
+                mask = get_fov_mask(kernel.get_field_of_view(instrument), instrument.orientation,
+                                    satelliteGeometry.direction, satelliteGeometry.access)
+                # undefined instrument parameters propagate as NaN metrics
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    metrics = kernel.evaluate(instrument, satelliteGeometry)
+                    mask &= kernel.is_covered(instrument, satelliteGeometry, metrics)
+                results[kernel.name].append(_aggregate(
+                    s, j, accessIndex, access, satelliteGeometry, mask, metrics, kernel.metrics))
+    return CoverageAnalysis(geometry, results)
+
+def _aggregate(satellite, instrument, accessIndex, access, geometry, mask, metrics, names):
+    """Aggregates sample metrics to one row per access using the covered
+    sample with minimum look angle (or minimum look angle if uncovered)."""
+    key = geometry.lookAngle + np.where(mask, 0, 360)
+    order = np.lexsort((key, geometry.access))
+    sortedAccess = geometry.access[order]
+    best = order[np.flatnonzero(np.r_[True, sortedAccess[1:] != sortedAccess[:-1]])] \
+        if len(order) else order
+    row = np.searchsorted(accessIndex, geometry.access[best])
+    size = len(accessIndex)
+    result = {
+        "satellite": satellite, "instrument": instrument,
+        "access": np.arange(size), "point": access['point'][accessIndex],
+        "start": access['start'][accessIndex], "end": access['end'][accessIndex],
+        "coverage": np.zeros(size, dtype=bool)
+    }
+    result["coverage"][row] = mask[best]
+    for name in names:
+        values = np.full(size, np.nan)
+        values[row] = np.asarray(metrics[name], dtype=float)[best]
+        result[name] = values
+    return result
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Methods for semi-analytic orbital decay due to atmospheric drag.
+
+Drag is modeled for satellites without propulsion (which cannot make up the
+lost energy). Atmospheric density follows a piecewise exponential model
+(Vallado, 2013, Table 8-4) precomputed on a uniform altitude grid so density
+is looked up by index rather than evaluated per sample. The semimajor axis of
+each satellite decays at the rate of a near-circular orbit, da/dt = -B rho
+sqrt(mu a), where the ballistic coefficient B = Cd A/m is estimated from
+satellite mass and volume. Decay is slow compared to the simulation time
+step, so it is integrated on a coarse (hourly) grid and interpolated.
+"""
+
+import numpy as np
+from numbers import Number
+
+from .constants import EARTH_RADIUS, EARTH_MU
+from .space import ConstellationState
+
+DRAG_COEFFICIENT = 2.2 # drag coefficient of a satellite
+DENSITY_TABLE_STEP = 1.0 # altitude spacing (km) of the density table
+DENSITY_TABLE_MAX = 1500.0 # maximum altitude (km) of the density table
+DRAG_TIME_STEP = 3600.0 # time step (s) of decay integration
+
+# base altitude (km), nominal density (kg/m^3), and scale height (km) of
+# the bands of the exponential atmosphere model
+ATMOSPHERE_MODEL = (
+    (0, 1.225, 7.249),
+    (25, 3.899e-2, 6.349),
+    (30, 1.774e-2, 6.682),
+    (40, 3.972e-3, 7.554),
+    (50, 1.057e-3, 8.382),
+    (60, 3.206e-4, 7.714),
+    (70, 8.770e-5, 6.549),
+    (80, 1.905e-5, 5.799),
+    (90, 3.396e-6, 5.382),
+    (100, 5.297e-7, 5.877),
+    (110, 9.661e-8, 7.263),
+    (120, 2.438e-8, 9.473),
+    (130, 8.484e-9, 12.636),
+    (140, 3.845e-9, 16.149),
+    (150, 2.070e-9, 22.523),
+    (180, 5.464e-10, 29.740),
+    (200, 2.789e-10, 37.105),
+    (250, 7.248e-11, 45.546),
+    (300, 2.418e-11, 53.628),
+    (350, 9.518e-12, 53.298),
+    (400, 3.725e-12, 58.515),
+    (450, 1.585e-12, 60.828),
+    (500, 6.967e-13, 63.822),
+    (600, 1.454e-13, 71.835),
+    (700, 3.614e-14, 88.667),
+    (800, 1.170e-14, 124.64),
+    (900, 5.245e-15, 181.05),
+    (1000, 3.019e-15, 268.00)
+)
+
+def get_model_density(altitudes):
+    """Returns the atmospheric density (kg/m^3) of the exponential model at
+    altitudes (km)."""
+    altitudes = np.asarray(altitudes, dtype=float)
+    base, density, height = [np.array(column, dtype=float) for column in zip(*ATMOSPHERE_MODEL)]
+    band = np.clip(np.searchsorted(base, altitudes, side='right') - 1, 0, len(base) - 1)
+    return density[band]*np.exp(-(altitudes - base[band])/height[band])
+
+# natural logarithm of density at each altitude of the density table (which
+# is exact at altitudes between grid points as bands are exponential)
+LOG_DENSITY_TABLE = np.log(get_model_density(
+    np.arange(0, DENSITY_TABLE_MAX + DENSITY_TABLE_STEP/2, DENSITY_TABLE_STEP)))
+
+def get_density(altitudes):
+    """Returns the atmospheric density (kg/m^3) at altitudes (km) by
+    interpolation of the density table (clamped to its altitude limits)."""
+    x = np.clip(np.asarray(altitudes, dtype=float)/DENSITY_TABLE_STEP,
+                0, len(LOG_DENSITY_TABLE) - 1)
+    j = np.minimum(x.astype(int), len(LOG_DENSITY_TABLE) - 2)
+    return np.exp(LOG_DENSITY_TABLE[j] + (x - j)*(LOG_DENSITY_TABLE[j + 1] - LOG_DENSITY_TABLE[j]))
+
+def get_ballistic_coefficient(satellite):
+    """Returns the ballistic coefficient (m^2/kg) of a satellite with a
+    cross-sectional area of a face of a cube of its volume (or 0 if its mass
+    or volume is not known)."""
+    mass, volume = satellite.mass, satellite.volume
+    if not isinstance(mass, Number) or not isinstance(volume, Number) \
+            or mass <= 0 or volume <= 0:
+        return 0.
+    return DRAG_COEFFICIENT*volume**(2./3)/mass
+
+def get_ballistic_coefficients(satellites):
+    """Returns an array of the ballistic coefficient (m^2/kg) of each of a
+    list of satellites (or a ConstellationState, evaluated once per
+    template)."""
+    if isinstance(satellites, ConstellationState):
+        coefficients = np.array([get_ballistic_coefficient(satellite)
+                                 for satellite in satellites.templates], dtype=float)
+        return coefficients[satellites.template] if len(coefficients) else np.zeros(0)
+    return np.array([get_ballistic_coefficient(satellite) for satellite in satellites],
+                    dtype=float).reshape(-1)
+
+def get_decay_rate(semimajorAxes, ballisticCoefficients):
+    """Returns the rate of change (km/s) of semimajor axes (km) of
+    near-circular orbits due to drag."""
+    # rho (kg/m^3) * B (m^2/kg) * sqrt(mu a) (km^2/s) is in units of 1e3 km/s
+    return -1e3*get_density(semimajorAxes - EARTH_RADIUS)*ballisticCoefficients \
+        *np.sqrt(EARTH_MU*semimajorAxes)
+
+def decay_semimajor_axes(semimajorAxes, ballisticCoefficients, times):
+    """Integrates the decay of the initial semimajor axes (km) of a
+    constellation over simulation times (s). Returns a (satellites x times)
+    array of semimajor axes (km) which are held at the surface of the Earth
+    after re-entry. Decay is integrated on a grid of DRAG_TIME_STEP (or the
+    simulation times if coarser) and interpolated to simulation times."""
+    times = np.asarray(times, dtype=float)
+    a = np.empty((len(semimajorAxes), len(times)))
+    if len(times) == 0: return a
+    grid = np.append(np.arange(times[0], times[-1], DRAG_TIME_STEP), times[-1])
+    if len(grid) >= len(times):
+        grid = times
+    decay = np.empty((len(semimajorAxes), len(grid)))
+    decay[:, 0] = semimajorAxes
+    # advances all satellites together by each grid step (midpoint method)
+    for j in range(1, len(grid)):
+        step = grid[j] - grid[j - 1]
+        midpoint = np.maximum(decay[:, j - 1] + 0.5*step*get_decay_rate(decay[:, j - 1], ballisticCoefficients),
+                              EARTH_RADIUS)
+        decay[:, j] = np.maximum(decay[:, j - 1] + step*get_decay_rate(midpoint, ballisticCoefficients),
+                                 EARTH_RADIUS)
+    if grid is times:
+        return decay
+    # linear interpolation of grid values at simulation times
+    j = np.clip(np.searchsorted(grid, times, side='right') - 1, 0, len(grid) - 2)
+    w = (times - grid[j])/(grid[j + 1] - grid[j])
+    a[:] = decay[:, j]
+    a += (decay[:, j + 1] - decay[:, j])*w
+    return a
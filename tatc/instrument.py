@@ -50,9 +50,9 @@ class Orientation(Entity):
         """Parses an orientation from a normalized JSON dictionary."""
         return Orientation(
             convention = d.get("convention", "XYZ"),
-            xRotation = d.get("xRotation ", None),
-            yRotation = d.get("yRotation ", None),
-            zRotation = d.get("zRotation ", None),
+            xRotation = d.get("xRotation", None),
+            yRotation = d.get("yRotation", None),
+            zRotation = d.get("zRotation", None),
             sideLookAngle = d.get("sideLookAngle", None),
             _id = d.get("@id", None)
         )
@@ -110,6 +110,10 @@ class FieldOfView(Entity):
             _id = d.get("@id", None)
         )
 
+# default argument (so an explicit None is kept) for which a new object is
+# created per instance rather than sharing one mutable default
+_DEFAULT = object()
+
 class Instrument(Entity):
     """A payload component that performs scientific observation functions.
 
@@ -131,8 +135,8 @@ class Instrument(Entity):
     """
 
     def __init__(self, name=None, acronym=None, agency=None, mass=None,
-            volume=None, power=None, orientation=Orientation(),
-            fieldOfView=FieldOfView(), dataRate=None, techReadinessLevel=9,
+            volume=None, power=None, orientation=_DEFAULT,
+            fieldOfView=_DEFAULT, dataRate=None, techReadinessLevel=9,
             mountType="BODY", _id=None, _type="Instrument"):
         """Initialize an instrument object.
         """
@@ -142,8 +146,8 @@ class Instrument(Entity):
         self.mass = mass
         self.volume = volume
         self.power = power
-        self.orientation = orientation
-        self.fieldOfView = fieldOfView
+        self.orientation = Orientation() if orientation is _DEFAULT else orientation
+        self.fieldOfView = FieldOfView() if fieldOfView is _DEFAULT else fieldOfView
         self.dataRate = dataRate
         self.techReadinessLevel = techReadinessLevel
         self.mountType = MountType.get(mountType)
@@ -231,8 +235,8 @@ class ScanTechnique(EnumEntity):
 
 class OpticalScanner(Instrument):
     def __init__(self, name=None, acronym=None, agency=None, mass=None,
-            volume=None, power=None, orientation=Orientation(),
-            fieldOfView=FieldOfView(), dataRate=None, scanTechnique=None,
+            volume=None, power=None, orientation=_DEFAULT,
+            fieldOfView=_DEFAULT, dataRate=None, scanTechnique=None,
             numberDetectorsAlongTrack=None, numberDetectorsCrossTrack=None,
             fNumber=None, focalLength=None, operatingWavelength=None, bandwidth=None,
             quantumEfficiency=None, opticalTransmissionFactor=None,
@@ -259,7 +263,7 @@ class OpticalScanner(Instrument):
 
 class SyntheticApertureRadar(Instrument):
     def __init__(self, name=None, acronym=None, agency=None, mass=None,
-            volume=None, power=None, orientation=Orientation(),
+            volume=None, power=None, orientation=_DEFAULT,
             dataRate=None, pulseWidth=None, antennaDimensionAlongTrack=None,
             antennaDimensionCrossTrack=None, antennaApertureEfficiency=None,
             operatingFrequency=None, peakTransmitPower=None, chirpBandwidth=None,
@@ -0,0 +1,433 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Object models and methods for a job queue shared by processes on several
+nodes.
+
+Jobs (JSON-serializable payloads, e.g. architecture directories to evaluate)
+are stored in a SQLite database in a queue directory on a shared filesystem.
+Workers claim batches of pending jobs under a lease which expires after a
+fixed duration unless renewed; jobs with expired leases (e.g. of a worker
+which crashed or lost its node) are re-queued on the next claim, and jobs
+which fail or are abandoned more than a maximum number of attempts are marked
+failed. Workers renew the leases of all jobs they hold from a heartbeat
+thread (LeaseKeeper) so jobs which run longer than a lease are not claimed
+again. All state transitions occur in exclusive (immediate) transactions so
+each job is leased to at most one worker at a time. Lease expiry uses wall
+clock time so node clocks are assumed to be synchronized.
+
+A queue directory may be reused by several runs (e.g. successive tradespace
+searches). Each run is a generation of jobs: starting a run opens the queue
+for new jobs and jobs of earlier runs are no longer claimed, counted, or
+reported as failures, so stale jobs do not affect a new run.
+
+Jobs are claimed in decreasing priority. For longest-job-first scheduling,
+priorities are estimated evaluation durations of architectures from a linear
+model of job features (number of satellites, ground stations, and points of
+interest and the mission duration) per stage which is learned from measured
+stage durations of completed jobs as a run progresses.
+"""
+
+import os
+import json
+import time
+import socket
+import sqlite3
+import heapq
+import threading
+import collections
+import numpy as np
+
+from .orbits import generate_points, get_mission_period
+
+QUEUE_FILE = "queue.sqlite" # database file name in the queue directory
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+class Job(object):
+    """A unit of work claimed from a job queue.
+
+    Attributes:
+        id          Identifier of the job.
+        payload     JSON-serializable payload of the job.
+        attempts    Number of times the job has been claimed (including
+                    this claim).
+    """
+    def __init__(self, id, payload, attempts):
+        self.id = id
+        self.payload = payload
+        self.attempts = attempts
+
+def get_worker_id():
+    """Returns an identifier of this worker process (host name and process
+    id)."""
+    return "{0}:{1:d}".format(socket.gethostname(), os.getpid())
+
+class JobQueue(object):
+    """A job queue stored in a SQLite database in a shared directory.
+
+    Attributes:
+        path            Path of the database file.
+        leaseDuration   Duration (s) of a job lease.
+        maxAttempts     Maximum number of times a job is claimed before it is
+                        marked failed.
+        timeout         Duration (s) to wait for a lock on the database.
+    """
+    def __init__(self, directory, leaseDuration=600, maxAttempts=3, timeout=60):
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self.path = os.path.join(directory, QUEUE_FILE)
+        self.leaseDuration = leaseDuration
+        self.maxAttempts = maxAttempts
+        self.timeout = timeout
+        with self.transaction() as db:
+            db.execute("""CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY, payload TEXT NOT NULL,
+                priority REAL NOT NULL DEFAULT 0, state TEXT NOT NULL,
+                worker TEXT, expiry REAL, attempts INTEGER NOT NULL DEFAULT 0,
+                duration REAL, stages TEXT, finished INTEGER, error TEXT,
+                run INTEGER NOT NULL DEFAULT 0)""")
+            if "run" not in [row[1] for row in db.execute("PRAGMA table_info(jobs)")]:
+                # databases created before runs have one (initial) run
+                db.execute("ALTER TABLE jobs ADD COLUMN run INTEGER NOT NULL DEFAULT 0")
+            db.execute("""CREATE INDEX IF NOT EXISTS jobs_run
+                ON jobs (run, state, priority, id)""")
+            db.execute("""CREATE TABLE IF NOT EXISTS attributes (
+                name TEXT PRIMARY KEY, value TEXT)""")
+
+    def transaction(self):
+        """Returns a connection in an exclusive (immediate) transaction
+        which commits on exit (or rolls back on error) and closes."""
+        return Transaction(sqlite3.connect(self.path, timeout=self.timeout,
+                                           isolation_level=None))
+
+    def get_run(self, db):
+        """Returns the identifier of the current run in a transaction."""
+        row = db.execute("SELECT value FROM attributes WHERE name = 'run'").fetchone()
+        return json.loads(row[0]) if row is not None else 0
+
+    def start(self):
+        """Starts a new run: the queue is open for jobs of the run and jobs
+        of earlier runs are ignored. Returns the identifier of the run."""
+        with self.transaction() as db:
+            run = self.get_run(db) + 1
+            db.execute("INSERT OR REPLACE INTO attributes (name, value) VALUES ('run', ?)",
+                       (json.dumps(run),))
+            # jobs of earlier runs which are still pending are never claimed
+            db.execute("UPDATE jobs SET state = ?, error = 'run superseded' WHERE state = ? AND run < ?",
+                       (FAILED, PENDING, run))
+        return run
+
+    def put(self, payloads, priorities=None):
+        """Adds jobs with payloads (and priorities, claimed in decreasing
+        order) to the current run and returns their identifiers."""
+        priorities = priorities if priorities is not None else [0]*len(payloads)
+        ids = []
+        with self.transaction() as db:
+            run = self.get_run(db)
+            for payload, priority in zip(payloads, priorities):
+                ids.append(db.execute(
+                    "INSERT INTO jobs (payload, priority, state, run) VALUES (?, ?, ?, ?)",
+                    (json.dumps(payload), float(priority), PENDING, run)).lastrowid)
+        return ids
+
+    def close(self):
+        """Marks the current run closed: no more jobs will be added so
+        workers may exit once no jobs of the run remain."""
+        with self.transaction() as db:
+            db.execute("INSERT OR REPLACE INTO attributes (name, value) VALUES ('closed', ?)",
+                       (json.dumps(self.get_run(db)),))
+
+    def is_closed(self):
+        """Returns True if the current run is closed."""
+        with self.transaction() as db:
+            row = db.execute("SELECT value FROM attributes WHERE name = 'closed'").fetchone()
+            closed = json.loads(row[0]) if row is not None else None
+            # closed is the identifier of the last closed run
+            return type(closed) is int and closed == self.get_run(db)
+
+    def set_attribute(self, name, value):
+        """Sets a JSON-serializable attribute of the queue."""
+        with self.transaction() as db:
+            db.execute("INSERT OR REPLACE INTO attributes (name, value) VALUES (?, ?)",
+                       (name, json.dumps(value)))
+
+    def get_attribute(self, name, default=None):
+        """Returns an attribute of the queue."""
+        with self.transaction() as db:
+            row = db.execute("SELECT value FROM attributes WHERE name = ?", (name,)).fetchone()
+        return json.loads(row[0]) if row is not None else default
+
+    def requeue_expired(self, db, now):
+        """Re-queues (or fails) jobs with expired leases."""
+        db.execute("""UPDATE jobs SET state = ?, worker = NULL, expiry = NULL,
+            error = 'lease expired' WHERE state = ? AND expiry < ? AND attempts >= ?""",
+            (FAILED, LEASED, now, self.maxAttempts))
+        db.execute("""UPDATE jobs SET state = ?, worker = NULL, expiry = NULL
+            WHERE state = ? AND expiry < ?""", (PENDING, LEASED, now))
+
+    def claim(self, worker=None, batchSize=1):
+        """Claims a batch of pending jobs (in decreasing priority) under a
+        lease and returns a list of jobs (empty if none are pending)."""
+        worker = worker or get_worker_id()
+        now = time.time()
+        with self.transaction() as db:
+            self.requeue_expired(db, now)
+            rows = db.execute("""SELECT id, payload, attempts FROM jobs WHERE run = ?
+                AND state = ? ORDER BY priority DESC, id LIMIT ?""",
+                (self.get_run(db), PENDING, batchSize)).fetchall()
+            db.executemany("""UPDATE jobs SET state = ?, worker = ?, expiry = ?,
+                attempts = attempts + 1 WHERE id = ?""",
+                [(LEASED, worker, now + self.leaseDuration, row[0]) for row in rows])
+        return [Job(id, json.loads(payload), attempts + 1) for id, payload, attempts in rows]
+
+    def renew(self, jobs, worker=None):
+        """Extends the leases of jobs held by a worker and returns the
+        number of leases renewed."""
+        worker = worker or get_worker_id()
+        with self.transaction() as db:
+            return db.executemany("UPDATE jobs SET expiry = ? WHERE id = ? AND state = ? AND worker = ?",
+                [(time.time() + self.leaseDuration, job.id, LEASED, worker) for job in jobs]).rowcount
+
+    def complete(self, job, duration=None, worker=None, stages=None):
+        """Marks a job done (with its measured duration in s and an optional
+        dictionary of durations by stage)."""
+        with self.transaction() as db:
+            # jobs are numbered in order of completion
+            db.execute("""UPDATE jobs SET state = ?, worker = ?, expiry = NULL,
+                duration = ?, stages = ?, error = NULL,
+                finished = (SELECT COALESCE(MAX(finished), 0) + 1 FROM jobs)
+                WHERE id = ? AND state != ?""",
+                (DONE, worker or get_worker_id(), duration,
+                 json.dumps(stages) if stages is not None else None, job.id, DONE))
+
+    def get_completed(self, after=0):
+        """Returns a list of (id, payload, duration, stages, finished) tuples
+        of jobs of the current run done in order of completion after a
+        completion number."""
+        with self.transaction() as db:
+            return [(id, json.loads(payload), duration, json.loads(stages) if stages else None, finished)
+                for id, payload, duration, stages, finished in db.execute(
+                    """SELECT id, payload, duration, stages, finished FROM jobs
+                    WHERE run = ? AND state = ? AND finished > ? ORDER BY finished""",
+                    (self.get_run(db), DONE, after))]
+
+    def get_active(self):
+        """Returns a list of (id, worker) tuples of leased jobs of the
+        current run."""
+        with self.transaction() as db:
+            return db.execute("SELECT id, worker FROM jobs WHERE run = ? AND state = ? ORDER BY id",
+                              (self.get_run(db), LEASED)).fetchall()
+
+    def get_pending(self):
+        """Returns a list of (id, payload) tuples of pending jobs of the
+        current run."""
+        with self.transaction() as db:
+            return [(id, json.loads(payload)) for id, payload in db.execute(
+                "SELECT id, payload FROM jobs WHERE run = ? AND state = ? ORDER BY id",
+                (self.get_run(db), PENDING))]
+
+    def set_priorities(self, priorities):
+        """Sets the priorities of pending jobs from a dictionary of
+        priorities by job identifier."""
+        with self.transaction() as db:
+            db.executemany("UPDATE jobs SET priority = ? WHERE id = ? AND state = ?",
+                [(float(priority), id, PENDING) for id, priority in priorities.items()])
+
+    def fail(self, job, error, worker=None):
+        """Re-queues a failed job or marks it failed after the maximum number
+        of attempts."""
+        state = FAILED if job.attempts >= self.maxAttempts else PENDING
+        with self.transaction() as db:
+            db.execute("""UPDATE jobs SET state = ?, worker = NULL, expiry = NULL,
+                error = ? WHERE id = ? AND state = ? AND worker = ?""",
+                (state, str(error), job.id, LEASED, worker or get_worker_id()))
+
+    def get_counts(self):
+        """Returns an ordered dictionary of the number of jobs of the
+        current run by state."""
+        with self.transaction() as db:
+            self.requeue_expired(db, time.time())
+            counts = dict(db.execute("SELECT state, COUNT(*) FROM jobs WHERE run = ? GROUP BY state",
+                                     (self.get_run(db),)).fetchall())
+        return collections.OrderedDict((state, counts.get(state, 0))
+                                       for state in (PENDING, LEASED, DONE, FAILED))
+
+    def get_failures(self):
+        """Returns a list of (payload, error) tuples of failed jobs of the
+        current run."""
+        with self.transaction() as db:
+            return [(json.loads(payload), error) for payload, error in db.execute(
+                "SELECT payload, error FROM jobs WHERE run = ? AND state = ? ORDER BY id",
+                (self.get_run(db), FAILED))]
+
+    def is_finished(self):
+        """Returns True if the current run is closed and none of its jobs
+        are pending or leased."""
+        counts = self.get_counts()
+        return self.is_closed() and counts[PENDING] + counts[LEASED] == 0
+
+class LeaseKeeper(object):
+    """A heartbeat thread which renews the leases of jobs held by a worker
+    (e.g. a claimed batch) at a fraction of the lease duration until each
+    job is released (completed or failed) or the keeper is stopped.
+
+    Attributes:
+        queue       Job queue of the jobs.
+        jobs        Ordered dictionary of held jobs by identifier.
+        worker      Identifier of the worker holding the jobs.
+        interval    Duration (s) between renewals.
+    """
+    def __init__(self, queue, jobs, worker=None, interval=None):
+        self.queue = queue
+        self.jobs = collections.OrderedDict((job.id, job) for job in jobs)
+        self.worker = worker or get_worker_id()
+        self.interval = interval if interval is not None else queue.leaseDuration/3.
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                jobs = list(self.jobs.values())
+            if jobs:
+                self.queue.renew(jobs, self.worker)
+
+    def start(self):
+        """Starts renewing leases."""
+        self._thread.start()
+
+    def release(self, job):
+        """Stops renewing the lease of a job."""
+        with self._lock:
+            self.jobs.pop(job.id, None)
+
+    def stop(self):
+        """Stops renewing all leases and waits for the heartbeat thread."""
+        self._stopped.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+FEATURES = ("constant", "satellites", "satelliteDays",
+            "satellitePointDays", "satelliteStationDays")
+
+def get_job_features(architecture, numberPoints, days):
+    """Returns the array of features of an architecture evaluation job for a
+    number of points of interest and a mission duration (days)."""
+    constellation = architecture.constellation
+    network = architecture.groundNetwork
+    satellites = len(constellation.satellites) if constellation is not None and \
+        constellation.satellites is not None else 0
+    stations = len(network.groundStations) if network is not None and \
+        network.groundStations is not None else 0
+    return np.array([1., satellites, satellites*days,
+                     satellites*numberPoints*days, satellites*stations*days])
+
+def get_mission_features(mission):
+    """Returns the number of points of interest and duration (days) of a
+    mission used by job features."""
+    latitudes, longitudes = generate_points(mission.target)
+    days = get_mission_period(mission)[1]/86400
+    return len(latitudes), days
+
+def get_makespan(durations, workers):
+    """Returns the duration (s) to complete jobs of durations (s) with a
+    number of workers each claiming the longest remaining job."""
+    loads = [0.]*max(1, workers)
+    for duration in sorted(durations, reverse=True):
+        heapq.heappush(loads, heapq.heappop(loads) + duration)
+    return max(loads)
+
+class CostEstimator(object):
+    """Estimates the evaluation duration of jobs from a linear model of job
+    features for each stage learned from measured stage durations. Until a
+    stage has more observations than features, its model is the prior model
+    scaled to fit the observations.
+
+    Attributes:
+        prior           Array of prior model coefficients (s per feature).
+        observations    Ordered dictionary of lists of (features, duration)
+                        tuples by stage.
+        coefficients    Ordered dictionary of arrays of fitted model
+                        coefficients by stage.
+    """
+    PRIOR = np.array([0.05, 0.01, 0., 2e-3, 1e-3])
+
+    def __init__(self, prior=None):
+        self.prior = np.array(prior if prior is not None else CostEstimator.PRIOR, dtype=float)
+        self.observations = collections.OrderedDict()
+        self.coefficients = collections.OrderedDict()
+
+    def observe(self, features, stages):
+        """Records the measured durations (s) of stages (a dictionary of
+        durations by stage) of a job with features and updates the model of
+        each stage."""
+        for stage, duration in stages.items():
+            self.observations.setdefault(stage, []).append((np.asarray(features, dtype=float), duration))
+            self.coefficients[stage] = self.fit(self.observations[stage])
+
+    def fit(self, observations):
+        """Returns non-negative model coefficients fitted to a list of
+        (features, duration) observations."""
+        features = np.array([f for f, d in observations])
+        durations = np.array([d for f, d in observations])
+        if len(observations) <= len(self.prior):
+            # scale the prior model to the observations
+            predicted = np.dot(features, self.prior)
+            return self.prior*np.sum(durations)/max(np.sum(predicted), 1e-12)
+        # non-negative least squares by removing negative coefficients
+        active = np.ones(len(self.prior), dtype=bool)
+        coefficients = np.zeros(len(self.prior))
+        while np.any(active):
+            solution = np.linalg.lstsq(features[:, active], durations, rcond=None)[0]
+            if np.all(solution >= 0):
+                coefficients[active] = solution
+                break
+            active[np.flatnonzero(active)[np.argmin(solution)]] = False
+        return coefficients
+
+    def estimate(self, features):
+        """Returns the estimated duration (s) of a job with features (or an
+        array of durations for a 2-D array of features)."""
+        features = np.asarray(features, dtype=float)
+        if not self.coefficients:
+            return np.dot(features, self.prior)
+        return sum(np.dot(features, coefficients) for coefficients in self.coefficients.values())
+
+    def get_eta(self, features, workers):
+        """Returns the estimated duration (s) to complete jobs with features
+        (a 2-D array) with a number of workers scheduled longest-first."""
+        if len(features) == 0:
+            return 0.
+        return get_makespan(np.atleast_1d(self.estimate(features)).tolist(), workers)
+
+class Transaction(object):
+    """An exclusive transaction on a SQLite connection.
+
+    Attributes:
+        connection  SQLite connection (in autocommit mode).
+    """
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, type, value, traceback):
+        try:
+            self.connection.execute("COMMIT" if type is None else "ROLLBACK")
+        finally:
+            self.connection.close()
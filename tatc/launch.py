@@ -5,7 +5,6 @@
 """
 
 import json
-import isodate
 import datetime
 from numbers import Number
 
@@ -51,6 +50,7 @@ class LaunchVehicle(Entity):
         self.reliability = reliability
         self.cost = cost
         if isinstance(meanTimeBetweenLaunches, Number):
+            import isodate
             self.meanTimeBetweenLaunches = isodate.duration_isoformat(datetime.timedelta(days=meanTimeBetweenLaunches))
         else:
             self.meanTimeBetweenLaunches = meanTimeBetweenLaunches
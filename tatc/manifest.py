@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Object models and methods for launch manifest planning.
+
+Satellites are grouped by orbital plane and each plane is packed into
+launches (one plane per launch) to minimize total launch cost subject to the
+payload mass and volume of each launch vehicle. Planes are packed with a
+cost-aware first-fit decreasing heuristic or, for small planes, an exact
+branch-and-bound search. Manifests are memoized on the plane structure,
+satellite mass and volume, and the available launch vehicles so
+architectures with the same structure reuse one solution.
+
+Deployment schedules assume launches of each launch vehicle occur
+sequentially at its mean time between launches (with launches of different
+vehicles in parallel) and each satellite becomes operational on launch.
+"""
+
+import numpy as np
+
+from .orbits import get_orbital_elements, get_planes, AnalysisCache, parse_duration
+from .space import ConstellationState
+
+EXACT_LIMIT = 8 # maximum number of satellites per plane for exact search
+
+class Launch(object):
+    """A launch of one or more satellites to an orbital plane.
+
+    Attributes:
+        vehicle         Index of the launch vehicle.
+        plane           Index of the orbital plane.
+        satellites      List of satellite indices.
+        mass            Total satellite mass (kg).
+        volume          Total satellite volume (m3).
+    """
+    def __init__(self, vehicle, plane, satellites, mass, volume):
+        self.vehicle = vehicle
+        self.plane = plane
+        self.satellites = satellites
+        self.mass = mass
+        self.volume = volume
+
+class LaunchManifest(object):
+    """An assignment of satellites to launches.
+
+    Attributes:
+        launchers       List of available launch vehicles.
+        launches        List of launches.
+        unassigned      List of satellite indices which cannot be carried by
+                        any launch vehicle.
+    """
+    def __init__(self, launchers, launches, unassigned=None):
+        self.launchers = launchers
+        self.launches = launches
+        self.unassigned = unassigned or []
+
+    def get_cost(self):
+        """Returns the total launch cost."""
+        return sum(self.launchers[launch.vehicle].cost or 0 for launch in self.launches)
+
+    def get_reliability(self):
+        """Returns the probability that all launches succeed."""
+        return float(np.prod([1 if self.launchers[launch.vehicle].reliability is None
+            else self.launchers[launch.vehicle].reliability for launch in self.launches]))
+
+    def to_list(self):
+        """Returns launches formatted for the launch analysis outputs."""
+        launches = []
+        for launch in self.launches:
+            d = self.launchers[launch.vehicle].to_dict()
+            d.update({
+                "plane": int(launch.plane),
+                "satellites": [int(s) for s in launch.satellites],
+                "manifestMass": float(launch.mass),
+                "manifestVolume": float(launch.volume)
+            })
+            launches.append(d)
+        return launches
+
+def get_vehicle_capacities(launchers):
+    """Returns arrays of payload mass capacity (kg), payload volume capacity
+    (m3), and cost of each launch vehicle. Payload mass defaults to the mass
+    to low Earth orbit; undefined volumes are unconstrained."""
+    mass = np.array([(v.payloadMass if v.payloadMass is not None else v.massToLEO) or 0.
+                     for v in launchers], dtype=float)
+    volume = np.array([v.payloadVolume if v.payloadVolume is not None else np.inf
+                       for v in launchers], dtype=float)
+    cost = np.array([v.cost or 0. for v in launchers], dtype=float)
+    return mass, volume, cost
+
+def get_cheapest_vehicle(capacities, mass, volume):
+    """Returns the index of the least-cost vehicle able to carry a mass and
+    volume (or -1 if none)."""
+    vehicleMass, vehicleVolume, cost = capacities
+    feasible = (vehicleMass >= mass - 1e-9) & (vehicleVolume >= volume - 1e-9)
+    if not np.any(feasible):
+        return -1
+    return int(np.flatnonzero(feasible)[np.argmin(cost[feasible])])
+
+def pack_first_fit(items, capacities):
+    """Packs items (arrays of mass and volume) into launches with a
+    cost-aware first-fit decreasing heuristic. Returns a list of
+    (vehicle, item indices) tuples."""
+    mass, volume = items
+    vehicleMass, vehicleVolume, cost = capacities
+    order = np.lexsort((-volume, -mass))
+    minMass, minVolume = np.min(mass), np.min(volume)
+    bins = [] # list of [vehicle, mass, volume, items]
+    available = [] # bins able to carry at least the smallest item
+    for k, i in enumerate(order):
+        for j, b in enumerate(available):
+            if (b[1] + mass[i] <= vehicleMass[b[0]] + 1e-9
+                    and b[2] + volume[i] <= vehicleVolume[b[0]] + 1e-9):
+                b[1] += mass[i]; b[2] += volume[i]; b[3].append(i)
+                if (b[1] + minMass > vehicleMass[b[0]] + 1e-9
+                        or b[2] + minVolume > vehicleVolume[b[0]] + 1e-9):
+                    del available[j]
+                break
+        else:
+            # open a launch with the vehicle of least cost per satellite for
+            # the remaining (largest first) satellites
+            remaining = order[k:]
+            fits = np.minimum(
+                np.searchsorted(np.cumsum(mass[remaining]), vehicleMass + 1e-9, side='right'),
+                np.searchsorted(np.cumsum(volume[remaining]), vehicleVolume + 1e-9, side='right'))
+            if not np.any(fits > 0):
+                continue
+            vehicle = int(np.argmin(np.where(fits > 0, cost/np.maximum(fits, 1), np.inf)))
+            bins.append([vehicle, mass[i], volume[i], [i]])
+            available.append(bins[-1])
+    # downsize each launch to the least-cost vehicle able to carry it
+    return [(get_cheapest_vehicle(capacities, b[1], b[2]), sorted(b[3])) for b in bins]
+
+def pack_branch_and_bound(items, capacities, incumbent=None):
+    """Packs items into launches with minimum total cost by exhaustive
+    branch-and-bound search over set partitions. Returns a list of
+    (vehicle, item indices) tuples."""
+    mass, volume = items
+    cost = capacities[2]
+    order = list(np.lexsort((-volume, -mass)))
+    best = {"cost": np.inf, "bins": None}
+    if incumbent is not None:
+        best["cost"] = sum(cost[vehicle] for vehicle, indices in incumbent)
+        best["bins"] = incumbent
+    def search(k, bins, total):
+        # bin costs never decrease as items are added so the partial total
+        # is a lower bound on any completion
+        if total >= best["cost"] - 1e-9:
+            return
+        if k == len(order):
+            best["cost"] = total
+            best["bins"] = [(vehicle, sorted(indices)) for vehicle, m, v, indices in bins]
+            return
+        i = order[k]
+        for b, (vehicle, m, v, indices) in enumerate(bins):
+            upgrade = get_cheapest_vehicle(capacities, m + mass[i], v + volume[i])
+            if upgrade < 0: continue
+            bins[b] = (upgrade, m + mass[i], v + volume[i], indices + [i])
+            search(k + 1, bins, total - cost[vehicle] + cost[upgrade])
+            bins[b] = (vehicle, m, v, indices)
+        vehicle = get_cheapest_vehicle(capacities, mass[i], volume[i])
+        if vehicle >= 0:
+            bins.append((vehicle, mass[i], volume[i], [i]))
+            search(k + 1, bins, total + cost[vehicle])
+            bins.pop()
+    search(0, [], 0.)
+    return best["bins"] or []
+
+def pack_plane(items, capacities, exact=True):
+    """Packs the items of one plane into launches using exact search for
+    small planes (if enabled) or the first-fit decreasing heuristic."""
+    # items which cannot be carried by any vehicle are left unassigned
+    feasible = np.flatnonzero([get_cheapest_vehicle(capacities, m, v) >= 0
+                               for m, v in zip(*items)])
+    if len(feasible) == 0:
+        return []
+    items = (items[0][feasible], items[1][feasible])
+    bins = pack_first_fit(items, capacities)
+    if exact and len(feasible) <= EXACT_LIMIT:
+        bins = pack_branch_and_bound(items, capacities, bins)
+    return [(vehicle, feasible[indices].tolist()) for vehicle, indices in bins]
+
+def get_satellite_values(satellites, name):
+    """Returns an array of a numeric attribute (0 if not known) of each of a
+    list of satellites (or a ConstellationState, evaluated once per
+    template)."""
+    if isinstance(satellites, ConstellationState):
+        values = np.array([getattr(satellite, name) or 0. for satellite in satellites.templates],
+                          dtype=float)
+        return values[satellites.template] if len(values) else np.zeros(0)
+    return np.array([getattr(satellite, name) or 0. for satellite in satellites],
+                    dtype=float).reshape(-1)
+
+MANIFEST_CACHE = AnalysisCache(maxSize=1024)
+
+def plan_launches(satellites, launchers, exact=True, cache=MANIFEST_CACHE):
+    """Assigns satellites (grouped by orbital plane) to launches minimizing
+    total launch cost subject to launch vehicle mass and volume capacities."""
+    launchers = launchers or []
+    elements = get_orbital_elements(satellites)
+    planes = get_planes(elements)
+    mass = get_satellite_values(satellites, "mass")
+    volume = get_satellite_values(satellites, "volume")
+    members = [np.flatnonzero(planes == p) for p in range(len(set(planes.tolist())))]
+    # solutions are expressed relative to the satellites of each plane so
+    # they can be shared by architectures with the same plane structure
+    key = (
+        tuple(tuple(zip(mass[m].tolist(), volume[m].tolist())) for m in members),
+        tuple(launcher.fingerprint() for launcher in launchers), exact
+    )
+    def factory():
+        capacities = get_vehicle_capacities(launchers)
+        # planes with identical satellites are packed once
+        solutions = {}
+        for planeKey, m in zip(key[0], members):
+            if planeKey not in solutions:
+                solutions[planeKey] = pack_plane((mass[m], volume[m]), capacities, exact)
+        return [solutions[planeKey] for planeKey in key[0]]
+    solution = factory() if cache is None else cache.get(key, factory)
+    launches, assigned = [], set()
+    for p, (m, bins) in enumerate(zip(members, solution)):
+        for vehicle, indices in bins:
+            launches.append(Launch(vehicle, p, m[indices].tolist(),
+                                   float(np.sum(mass[m][indices])), float(np.sum(volume[m][indices]))))
+            assigned.update(m[indices].tolist())
+    return LaunchManifest(launchers, launches,
+                          [s for s in range(len(satellites)) if s not in assigned])
+
+class DeploymentSchedule(object):
+    """A schedule of launches deploying the satellites of a constellation.
+
+    Attributes:
+        launchTimes     Array of launch times (s) after the epoch.
+        deployTimes     Array of satellite deployment times (s) after the
+                        epoch (infinite for unassigned satellites).
+    """
+    def __init__(self, launchTimes, deployTimes):
+        self.launchTimes = launchTimes
+        self.deployTimes = deployTimes
+
+    def get_operational_time(self):
+        """Returns the time (s) until the full constellation is operational
+        (infinite if any satellite cannot be launched)."""
+        return float(np.max(self.deployTimes)) if len(self.deployTimes) else 0.
+
+    def get_phases(self):
+        """Returns a list of (time, number of operational satellites) tuples
+        for each deployment phase."""
+        times, counts = np.unique(self.deployTimes[np.isfinite(self.deployTimes)],
+                                  return_counts=True)
+        return list(zip(times.tolist(), np.cumsum(counts).tolist()))
+
+    def to_dict(self):
+        """Returns the schedule formatted for the launch analysis outputs."""
+        operationalTime = self.get_operational_time()
+        return {
+            "launchTimes" : self.launchTimes.tolist(),
+            "operationalTime" : operationalTime if np.isfinite(operationalTime) else None,
+            "phases" : [{"time": t, "numberSatellites": n} for t, n in self.get_phases()]
+        }
+
+def get_launch_interval(launcher, epoch):
+    """Returns the mean time (s) between launches of a launch vehicle (zero
+    if undefined)."""
+    if launcher.meanTimeBetweenLaunches is None:
+        return 0.
+    return parse_duration(launcher.meanTimeBetweenLaunches, epoch)
+
+def schedule_launches(manifest, numberSatellites, epoch):
+    """Schedules the launches of a manifest starting at the epoch and returns
+    the deployment schedule of its satellites."""
+    intervals = [get_launch_interval(launcher, epoch) for launcher in manifest.launchers]
+    counts = np.zeros(len(manifest.launchers), dtype=int)
+    launchTimes = np.zeros(len(manifest.launches))
+    deployTimes = np.full(numberSatellites, np.inf)
+    for k, launch in enumerate(manifest.launches):
+        launchTimes[k] = counts[launch.vehicle]*intervals[launch.vehicle]
+        counts[launch.vehicle] += 1
+        deployTimes[launch.satellites] = launchTimes[k]
+    return DeploymentSchedule(launchTimes, deployTimes)
@@ -5,12 +5,12 @@
 """
 
 import json
-import isodate
 import datetime
 from numbers import Number
 import itertools
 
-from .util import Entity, EnumEntity
+from .util import Entity, EnumEntity, QuantitativeRange, get_fingerprint
+from .sampling import SobolSequence, get_index
 from .agency import Agency
 from .space import Satellite, Constellation
 from .ground import GroundStation, GroundNetwork, Region, GLOBAL_REGION
@@ -34,15 +34,16 @@ class MissionConcept(Entity):
     """
 
     def __init__(self, name=None, acronym=None, agency=None,
-                start=datetime.date.today().isoformat(), duration="P90D",
+                start=None, duration="P90D",
                 target=GLOBAL_REGION, objectives=None, _id=None):
         """Initialize a mission concept object.
         """
         self.name = name
         self.acronym = acronym if acronym else name
         self.agency = agency
-        self.start = start
+        self.start = start if start is not None else datetime.date.today().isoformat()
         if isinstance(duration, Number):
+            import isodate
             self.duration = isodate.duration_isoformat(datetime.timedelta(days=duration))
         else: self.duration = duration
         self.target = target
@@ -141,26 +142,21 @@ class DesignSpace(Entity):
         else: self.groundStations = groundStations
         super(DesignSpace,self).__init__(_id, "DesignSpace")
 
-    def generate_architectures(self):
-        """Generates architectures in this design space."""
-        # merge lists of iterated constellations
-        constellationsList = iter(iter(i) for i in self.constellations)
-        constellationsIter = iter(set().union(*constellationsList))
-        # merge lists of iterated ground networks
-        groundNetworksList = iter(iter(i) for i in self.groundNetworks)
-        groundNetworksIter = iter(set().union(*groundNetworksList))
+    def generate_architectures(self, state=False):
+        """Generates architectures in this design space (with member
+        satellites as a ConstellationState if state is True)."""
+        return iter(self.compile().generate_architectures(state))
 
-        return iter([
-                Architecture(
-                    constellation=constellation,
-                    groundNetwork=groundNetwork
-                )
-                for constellation, groundNetwork
-                in itertools.product(
-                    [i.generate_constellations(self.satellites) for i in constellationsIter],
-                    [i.generate_networks(self.groundStations) for i in groundNetworksIter]
-                )
-            ])
+    def sample_architectures(self, numberSamples, seed=None, state=False):
+        """Generates a space-filling sample of architectures in this design
+        space (with member satellites as a ConstellationState if state is
+        True)."""
+        return self.compile().sample_architectures(numberSamples, seed, state)
+
+    def compile(self):
+        """Compiles this design space to a plan for enumeration, counting, and
+        encoding of architectures."""
+        return DesignSpacePlan(self)
 
     @staticmethod
     def from_dict(d):
@@ -174,6 +170,143 @@ class DesignSpace(Entity):
                 _id = d.get("@id", None)
             )
 
+class DesignSpacePlan(object):
+    """A compiled design space holding the materialized values of each axis.
+    Values are computed once and should be treated as immutable.
+
+    Attributes:
+        designSpace     Design space.
+        constellations  Tuple of constellation plans.
+        satellites      Tuple of available satellites.
+        networks        Tuple of generated ground networks.
+    """
+    # genes of the architecture encoding
+    GENES = ("constellation", "numberSatellites", "structure",
+             "satelliteInterval", "orbit", "satellite", "network")
+    # axes of sampled architectures (orbit split into altitude and inclination)
+    SAMPLE_AXES = ("constellation", "numberSatellites", "structure",
+                   "satelliteInterval", "altitude", "inclination", "satellite", "network")
+    MAX_DRAWS = 64 # maximum number of sample points drawn per architecture
+
+    def __init__(self, designSpace):
+        self.designSpace = designSpace
+        self.constellations = tuple(constellation.compile()
+            for constellation in designSpace.constellations or [])
+        self.satellites = tuple(designSpace.satellites or [])
+        self.networks = tuple(itertools.chain.from_iterable(
+            network.generate_networks(designSpace.groundStations or [])
+            for network in designSpace.groundNetworks or []))
+
+    def count(self):
+        """Returns the number of architectures without enumerating them."""
+        return sum(plan.count(len(self.satellites)) for plan in self.constellations)*len(self.networks)
+
+    def generate_architectures(self, state=False):
+        """Returns the list of architectures in this design space (with
+        member satellites as a ConstellationState if state is True)."""
+        # pair each generated constellation with each generated network
+        # (constellation-major order so that all network variants of one
+        # constellation are enumerated consecutively)
+        return [
+                Architecture(
+                    constellation=constellation,
+                    groundNetwork=groundNetwork
+                )
+                for constellation, groundNetwork
+                in itertools.product(
+                    itertools.chain.from_iterable(
+                        plan.generate_constellations(self.satellites, state)
+                        for plan in self.constellations),
+                    self.networks
+                )
+            ]
+
+    def get_bounds(self):
+        """Returns the number of values of each gene of the architecture
+        encoding (the maximum over constellation plans)."""
+        plans = self.constellations
+        return (
+            len(plans),
+            max([len(plan.numberSatellites) for plan in plans] or [0]),
+            max([len(plan.structures) for plan in plans] or [0]),
+            max([len(plan.satelliteIntervals) for plan in plans] or [0]),
+            max([len(plan.orbits) for plan in plans] or [0]),
+            max([plan.count_selections(n, len(self.satellites))
+                 for plan in plans for n in plan.numberSatellites] or [0]),
+            len(self.networks)
+        )
+
+    def decode(self, genome):
+        """Decodes a genome (one index per gene) to an architecture. Returns
+        None if the genome does not encode a valid architecture."""
+        c, n, p, i, o, s, g = [int(gene) for gene in genome]
+        if not (0 <= c < len(self.constellations) and 0 <= g < len(self.networks)):
+            return None
+        plan = self.constellations[c]
+        if plan.constellation.satellites is not None:
+            constellation = plan.constellation
+        else:
+            if not (0 <= n < len(plan.numberSatellites) and 0 <= p < len(plan.structures)
+                    and 0 <= i < len(plan.satelliteIntervals) and 0 <= o < len(plan.orbits)):
+                return None
+            numberSatellites = plan.numberSatellites[n]
+            if plan.structures[p] not in plan.get_structures(numberSatellites):
+                return None
+            constellation = plan.get_constellation(numberSatellites, plan.structures[p],
+                plan.satelliteIntervals[i], plan.orbits[o])
+        if not 0 <= s < plan.count_selections(constellation.numberSatellites, len(self.satellites)):
+            return None
+        constellation = constellation.select_combination(self.satellites, s)
+        return Architecture(constellation=constellation, groundNetwork=self.networks[g])
+
+    def sample(self, point, state=False):
+        """Returns the architecture at a point of the unit hypercube (one
+        coordinate per sample axis). Continuous axes (quantitative ranges of
+        altitude and inclination) are sampled between their minimum and
+        maximum values and discrete axes are divided into equal intervals.
+        Returns None if the point does not map to a valid architecture.
+        Member satellites are a ConstellationState if state is True."""
+        if not (self.constellations and self.networks and self.satellites):
+            return None
+        plan = self.constellations[get_index(point[0], len(self.constellations))]
+        constellation = plan.sample_constellation(point[1:6])
+        if constellation is None:
+            return None
+        s = get_index(point[6], plan.count_selections(constellation.numberSatellites, len(self.satellites)))
+        constellation = constellation.select_combination(self.satellites, s, state)
+        return Architecture(constellation=constellation,
+            groundNetwork=self.networks[get_index(point[7], len(self.networks))])
+
+    def is_continuous(self):
+        """Returns True if any orbit axis is a quantitative range (with an
+        unbounded number of sampled values)."""
+        return any(isinstance(axis, QuantitativeRange)
+                   for plan in self.constellations for orbitPlan in plan.orbitPlans
+                   if orbitPlan is not None
+                   for axis in (orbitPlan.orbit.altitude, orbitPlan.orbit.inclination))
+
+    def sample_architectures(self, numberSamples, seed=None, state=False):
+        """Generates up to a number of distinct architectures at the points
+        of a scrambled Sobol sequence. Architectures are generated in sequence
+        order so any prefix is a space-filling sample. Fewer architectures are
+        generated if the design space is smaller or distinct architectures are
+        not found within a bounded number of draws. Member satellites are a
+        ConstellationState if state is True."""
+        if not self.is_continuous():
+            numberSamples = min(numberSamples, self.count())
+        sequence = SobolSequence(len(self.SAMPLE_AXES), seed)
+        fingerprints = set()
+        for draw in range(self.MAX_DRAWS*numberSamples):
+            if len(fingerprints) >= numberSamples:
+                break
+            architecture = self.sample(next(sequence), state)
+            if architecture is None:
+                continue
+            fingerprint = architecture.fingerprint()
+            if fingerprint not in fingerprints:
+                fingerprints.add(fingerprint)
+                yield architecture
+
 class Architecture(Entity):
     """Instantiation of a space mission including satellites and ground stations.
 
@@ -189,6 +322,20 @@ class Architecture(Entity):
         self.groundNetwork = groundNetwork
         super(Architecture, self).__init__(_id, "Architecture")
 
+    def fingerprint(self):
+        """Returns a structural fingerprint of this architecture including the
+        (columnar) fingerprint of its constellation."""
+        constellation = self.constellation
+        if constellation is None:
+            return super(Architecture, self).fingerprint()
+        try:
+            self.constellation = None
+            d = self.to_dict()
+        finally:
+            self.constellation = constellation
+        d["constellation"] = constellation.fingerprint()
+        return get_fingerprint(d)
+
     @staticmethod
     def from_dict(d):
         """Parses an architecture from a normalized JSON dictionary."""
@@ -0,0 +1,946 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Object models and methods for orbital analysis including propagation,
+    point of interest access, and ground station contacts.
+
+Orbital analysis is split into two stages:
+ 1. a constellation-keyed stage (propagation and point of interest access)
+    which depends only on the mission and constellation and is memoized, and
+ 2. a network-keyed stage (ground station contacts) which is re-evaluated for
+    each ground network paired with a constellation.
+
+The time grid and Earth rotation of a mission are computed once per time
+step in a shared (read-only) time base. Time bases are memoized in memory
+and shared only by the architectures analyzed in one process (other
+processes recompute them, which takes far less time than propagation); the
+Sun ephemeris is only computed when first read.
+"""
+
+import math
+import json
+import datetime
+import collections
+import numpy as np
+from numbers import Number
+
+from .util import Entity
+from .constants import EARTH_RADIUS, EARTH_MU, EARTH_J2, EARTH_ROTATION_RATE
+from .storage import write_arrays, read_arrays, read_header
+from .drag import get_ballistic_coefficients, decay_semimajor_axes
+from .space import Orbit, ConstellationState
+from .instrument import FieldOfView
+
+MAX_TIME_STEP = 60.0 # maximum simulation time step (s)
+MIN_TIME_STEP = 1.0 # minimum simulation time step (s)
+DEFAULT_GRID_SPACING = 1.0 # point of interest grid spacing (deg)
+DEFAULT_MIN_ELEVATION = 10.0 # minimum ground station elevation angle (deg)
+BLOCK_SIZE = 2**22 # maximum number of (time x point) samples per block
+
+ACCESS_DTYPE = np.dtype([
+    ('satellite', 'i4'), ('point', 'i4'), ('start', 'f8'), ('end', 'f8')
+])
+CONTACT_DTYPE = np.dtype([
+    ('satellite', 'i4'), ('station', 'i4'), ('start', 'f8'), ('end', 'f8')
+])
+
+def parse_epoch(start):
+    """Parses an ISO-8601 date or datetime to a naive UTC datetime."""
+    import isodate
+    try:
+        epoch = isodate.parse_datetime(start)
+    except (ValueError, isodate.ISO8601Error):
+        date = isodate.parse_date(start)
+        epoch = datetime.datetime(date.year, date.month, date.day)
+    if epoch.tzinfo is not None:
+        epoch = epoch.astimezone(isodate.UTC).replace(tzinfo=None)
+    return epoch
+
+def parse_duration(duration, epoch):
+    """Parses an ISO-8601 duration to a number of seconds after an epoch."""
+    if isinstance(duration, Number):
+        return float(duration)*86400
+    import isodate
+    delta = isodate.parse_duration(duration)
+    if isinstance(delta, isodate.Duration):
+        delta = delta.totimedelta(start=epoch)
+    return delta.total_seconds()
+
+def get_gmst(epoch, times):
+    """Returns the Greenwich mean sidereal time (rad) at times (s) after an
+    epoch (naive UTC datetime)."""
+    days = (epoch - datetime.datetime(2000, 1, 1, 12)).total_seconds()/86400
+    gmst0 = math.radians((280.46061837 + 360.98564736629*days) % 360)
+    return np.mod(gmst0 + EARTH_ROTATION_RATE*np.asarray(times), 2*np.pi)
+
+def get_sun_vectors(epoch, times):
+    """Returns the inertial unit vectors (times x 3) from the Earth to the Sun
+    and the distance (AU) to the Sun at times (s) after an epoch (naive UTC
+    datetime) using a low-precision solar ephemeris (Vallado, 2013,
+    Algorithm 29)."""
+    days = (epoch - datetime.datetime(2000, 1, 1, 12)).total_seconds()/86400
+    T = (days + np.asarray(times, dtype=float)/86400)/36525
+    M = np.radians(357.5291092 + 35999.05034*T)
+    longitude = np.radians(280.460 + 36000.771*T) \
+        + np.radians(1.914666471)*np.sin(M) + np.radians(0.019994643)*np.sin(2*M)
+    obliquity = np.radians(23.439291 - 0.0130042*T)
+    distance = 1.000140612 - 0.016708617*np.cos(M) - 0.000139589*np.cos(2*M)
+    return np.column_stack((np.cos(longitude), np.cos(obliquity)*np.sin(longitude),
+                            np.sin(obliquity)*np.sin(longitude))), distance
+
+class TimeBase(object):
+    """A mission time base: the simulation time grid and time-dependent
+    quantities shared (read-only) by the analysis of all architectures with
+    the same mission and time step.
+
+    Attributes:
+        epoch           Mission start (naive UTC datetime).
+        duration        Mission duration (s).
+        timeStep        Simulation time step (s).
+        times           Simulation times (s) after the epoch.
+        gmst            Greenwich mean sidereal time (rad) at each time.
+        cosGmst         Cosine of GMST (inertial to Earth-fixed rotation).
+        sinGmst         Sine of GMST (inertial to Earth-fixed rotation).
+        sun             Inertial unit vectors (times x 3) to the Sun
+                        (computed when first read).
+        sunFixed        Earth-fixed unit vectors (times x 3) to the Sun
+                        (computed when first read).
+        sunDistance     Distance (AU) to the Sun at each time (computed when
+                        first read).
+    """
+    def __init__(self, epoch, duration, timeStep):
+        self.epoch = epoch
+        self.duration = duration
+        self.timeStep = timeStep
+        self.times = np.arange(int(math.floor(duration/timeStep)) + 1)*timeStep
+        self.gmst = get_gmst(epoch, self.times)
+        self.cosGmst = np.cos(self.gmst)
+        self.sinGmst = np.sin(self.gmst)
+        self._sun = None
+        # arrays are shared so they are made read-only
+        for array in (self.times, self.gmst, self.cosGmst, self.sinGmst):
+            array.setflags(write=False)
+
+    def get_sun(self):
+        """Returns the (memoized) inertial and Earth-fixed unit vectors to the
+        Sun and the distance to the Sun at all times."""
+        if self._sun is None:
+            sun, distance = get_sun_vectors(self.epoch, self.times)
+            sunFixed = np.column_stack((
+                self.cosGmst*sun[:, 0] + self.sinGmst*sun[:, 1],
+                -self.sinGmst*sun[:, 0] + self.cosGmst*sun[:, 1],
+                sun[:, 2]
+            ))
+            for array in (sun, sunFixed, distance):
+                array.setflags(write=False)
+            self._sun = sun, sunFixed, distance
+        return self._sun
+
+    @property
+    def sun(self):
+        """Inertial unit vectors to the Sun."""
+        return self.get_sun()[0]
+
+    @property
+    def sunFixed(self):
+        """Earth-fixed unit vectors to the Sun."""
+        return self.get_sun()[1]
+
+    @property
+    def sunDistance(self):
+        """Distance (AU) to the Sun."""
+        return self.get_sun()[2]
+
+    def get_rotation(self, indices=None):
+        """Returns the cosine and sine of GMST (the inertial to Earth-fixed
+        rotation) at all times or at time indices."""
+        if indices is None:
+            return self.cosGmst, self.sinGmst
+        return self.cosGmst[indices], self.sinGmst[indices]
+
+    def get_eclipses(self, positions):
+        """Returns a boolean (satellites x times) array which is True where
+        Earth-fixed positions (satellites x times x 3) in km are in the
+        (cylindrical) shadow of the Earth. It is only evaluated on request
+        (not as part of constellation analysis)."""
+        projection = np.sum(positions*self.sunFixed, axis=-1)
+        distance = np.sum(positions**2, axis=-1) - projection**2
+        return (projection < 0) & (distance < EARTH_RADIUS**2)
+
+def generate_points(region, spacing=DEFAULT_GRID_SPACING):
+    """Generates a grid of points of interest (latitude, longitude arrays in
+    decimal degrees) spanning a region."""
+    def get_bounds(value):
+        if isinstance(value, Number): return value, value
+        return value.minValue, value.maxValue
+    minLat, maxLat = get_bounds(region.latitude)
+    minLon, maxLon = get_bounds(region.longitude)
+    latitudes = np.arange(minLat, maxLat + spacing/2, spacing)
+    # avoid duplicate points at the anti-meridian for global regions
+    if maxLon - minLon >= 360:
+        longitudes = np.arange(minLon, maxLon - spacing/2, spacing)
+    else:
+        longitudes = np.arange(minLon, maxLon + spacing/2, spacing)
+    lat, lon = np.meshgrid(latitudes, longitudes, indexing='ij')
+    return lat.ravel(), lon.ravel()
+
+def get_unit_vectors(latitudes, longitudes):
+    """Returns Earth-fixed unit vectors (N x 3) for spherical coordinates."""
+    lat = np.radians(latitudes)
+    lon = np.radians(longitudes)
+    return np.column_stack((np.cos(lat)*np.cos(lon), np.cos(lat)*np.sin(lon), np.sin(lat)))
+
+def get_payload_half_angle(satellite):
+    """Returns the largest field of view half angle (deg) of a satellite's
+    payload or None if the payload does not constrain access."""
+    payload = satellite.payload
+    if payload is None: return None
+    if not isinstance(payload, list): payload = [payload]
+    halfAngles = []
+    for instrument in payload:
+        fov = instrument.fieldOfView
+        if fov is None: return None
+        if isinstance(fov, Number): fov = FieldOfView.from_dict(fov)
+        if fov.fullConeAngle is not None and fov.alongTrackFieldOfView is None:
+            halfAngles.append(fov.fullConeAngle/2.)
+        else:
+            halfAngles.append(max(fov.alongTrackFieldOfView or 0,
+                                  fov.crossTrackFieldOfView or 0)/2.)
+    return max(halfAngles) if halfAngles else None
+
+def get_access_angle(radius, halfAngle=None, minElevation=0.):
+    """Returns the Earth central angle (rad) visible from a satellite at a
+    radius (km) given an off-nadir half angle (deg) and minimum elevation
+    angle (deg)."""
+    rho = np.arcsin(np.minimum(EARTH_RADIUS/np.asarray(radius), 1.))
+    eps = math.radians(minElevation)
+    # off-nadir angle to the minimum elevation circle
+    eta = np.arcsin(np.sin(rho)*math.cos(eps))
+    if halfAngle is not None:
+        eta = np.minimum(eta, math.radians(halfAngle))
+    return np.pi/2 - eta - np.arccos(np.minimum(np.sin(eta)/np.sin(rho), 1.))
+
+def get_payload_half_angles(satellites):
+    """Returns the payload half angle (deg) of each of a list of satellites
+    (or a ConstellationState, evaluated once per template)."""
+    if isinstance(satellites, ConstellationState):
+        halfAngles = [get_payload_half_angle(satellite) for satellite in satellites.templates]
+        return [halfAngles[t] for t in satellites.template]
+    return [get_payload_half_angle(satellite) for satellite in satellites]
+
+def get_state_elements(state):
+    """Returns mean Keplerian elements (semimajor axis in km, angles in rad)
+    as arrays of (a, e, i, argp, raan, M) for a ConstellationState."""
+    def column(name):
+        # numeric values of columns or (otherwise) orbit templates
+        values = state.columns[name].copy()
+        missing = np.isnan(values)
+        values[missing] = [value if isinstance(value, Number) else np.nan
+            for value in state.get_template_attribute(name)[missing]]
+        return values
+    a = column("semimajorAxis")
+    missing = np.isnan(a)
+    a[missing] = Orbit.get_semimajor_axis(np.array([value if isinstance(value, Number) else np.nan
+        for value in state.get_template_attribute("altitude")[missing]], dtype=float))
+    inclination = column("inclination")
+    special = np.array([isinstance(value, str) for value in state.get_template_attribute("inclination")],
+                       dtype=bool)
+    inclination[special] = Orbit.get_sso_inclination(a[special] - EARTH_RADIUS)
+    e = np.nan_to_num(column("eccentricity"))
+    nu = np.radians(np.nan_to_num(column("trueAnomaly")))
+    # convert true anomaly to mean anomaly
+    E = 2*np.arctan2(np.sqrt(1 - e)*np.sin(nu/2), np.sqrt(1 + e)*np.cos(nu/2))
+    return np.column_stack((
+        a, e, np.radians(np.nan_to_num(inclination)),
+        np.radians(np.nan_to_num(column("periapsisArgument"))),
+        np.radians(np.nan_to_num(column("rightAscensionAscendingNode"))),
+        E - e*np.sin(E)
+    )).reshape(-1, 6)
+
+def get_orbital_elements(satellites):
+    """Returns mean Keplerian elements (semimajor axis in km, angles in rad)
+    as arrays of (a, e, i, argp, raan, M) for a list of satellites (or a
+    ConstellationState)."""
+    if isinstance(satellites, ConstellationState):
+        return get_state_elements(satellites)
+    elements = np.zeros((len(satellites), 6))
+    for s, satellite in enumerate(satellites):
+        orbit = satellite.orbit
+        if orbit.semimajorAxis is not None: a = orbit.semimajorAxis
+        else: a = Orbit.get_semimajor_axis(orbit.altitude)
+        inclination = orbit.inclination
+        if isinstance(inclination, str):
+            inclination = Orbit.get_sso_inclination(a - EARTH_RADIUS)
+        e = orbit.eccentricity or 0.
+        nu = math.radians(orbit.trueAnomaly or 0.)
+        # convert true anomaly to mean anomaly
+        E = 2*math.atan2(math.sqrt(1 - e)*math.sin(nu/2), math.sqrt(1 + e)*math.cos(nu/2))
+        elements[s] = (
+            a, e, math.radians(inclination or 0.),
+            math.radians(orbit.periapsisArgument or 0.),
+            math.radians(orbit.rightAscensionAscendingNode or 0.),
+            E - e*math.sin(E)
+        )
+    return elements
+
+def get_planes(elements):
+    """Returns the orbital plane index of each satellite for an array of mean
+    Keplerian elements. Satellites sharing a semimajor axis, inclination, and
+    right ascension of ascending node share a plane (numbered by first
+    appearance)."""
+    if len(elements) == 0:
+        return np.zeros(0, dtype=int)
+    keys = np.round(elements[:, [0, 2, 4]], 6)
+    unique, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    # renumber planes in order of first appearance
+    rank = np.empty(len(first), dtype=int)
+    rank[np.argsort(first)] = np.arange(len(first))
+    return rank[inverse.ravel()]
+
+def integrate_rates(rates, times):
+    """Returns the cumulative (trapezoidal) integral of (satellites x times)
+    rates over simulation times (s), starting from zero."""
+    integral = np.zeros(rates.shape)
+    if rates.shape[1] > 1:
+        integral[:, 1:] = np.cumsum(0.5*(rates[:, 1:] + rates[:, :-1])*np.diff(times), axis=1)
+    return integral
+
+def get_mean_elements(elements, times, semimajorAxes=None):
+    """Propagates mean Keplerian elements with secular J2 perturbations.
+
+    Returns a tuple of (a, e, i, argp, raan, M) arrays broadcastable to
+    (satellites x times). If (satellites x times) semimajor axes are given
+    (e.g. decayed by drag), angle rates are integrated over time.
+    """
+    a, e, i, argp0, raan0, M0 = [elements[:, j, np.newaxis] for j in range(6)]
+    t = np.asarray(times)[np.newaxis, :]
+    if semimajorAxes is not None:
+        a = semimajorAxes
+    n = np.sqrt(EARTH_MU/a**3)
+    p = a*(1 - e**2)
+    k = 1.5*EARTH_J2*(EARTH_RADIUS/p)**2*n
+    raanRate = -k*np.cos(i)
+    argpRate = 0.5*k*(5*np.cos(i)**2 - 1)
+    MRate = n + 0.5*k*np.sqrt(1 - e**2)*(3*np.cos(i)**2 - 1)
+    if semimajorAxes is None:
+        return a, e, i, argp0 + argpRate*t, raan0 + raanRate*t, M0 + MRate*t
+    return (a, e, i, argp0 + integrate_rates(argpRate, times),
+            raan0 + integrate_rates(raanRate, times), M0 + integrate_rates(MRate, times))
+
+def propagate(elements, times, epoch, semimajorAxes=None, rotation=None):
+    """Propagates mean Keplerian elements with secular J2 perturbations and
+    optionally (satellites x times) semimajor axes decayed by drag. Rotation
+    optionally gives the precomputed cosine and sine of GMST at times (e.g.
+    of a TimeBase).
+
+    Returns a tuple of Earth-fixed positions (km) and inertial velocities
+    (km/s) as (satellites x times x 3) arrays.
+    """
+    a, e, i, argp, raan, M = get_mean_elements(elements, times, semimajorAxes)
+    # solve Kepler's equation by Newton iteration
+    E = np.array(M)
+    for _ in range(8):
+        E = E - (E - e*np.sin(E) - M)/(1 - e*np.cos(E))
+    r = a*(1 - e*np.cos(E))
+    xp, yp = a*(np.cos(E) - e), a*np.sqrt(1 - e**2)*np.sin(E)
+    vxp = -np.sqrt(EARTH_MU*a)/r*np.sin(E)
+    vyp = np.sqrt(EARTH_MU*a)/r*np.sqrt(1 - e**2)*np.cos(E)
+    cO, sO, cw, sw, ci, si = np.cos(raan), np.sin(raan), np.cos(argp), np.sin(argp), np.cos(i), np.sin(i)
+    P = np.stack((cO*cw - sO*sw*ci, sO*cw + cO*sw*ci, sw*si), axis=-1)
+    Q = np.stack((-cO*sw - sO*cw*ci, -sO*sw + cO*cw*ci, cw*si), axis=-1)
+    position = xp[..., np.newaxis]*P + yp[..., np.newaxis]*Q
+    velocity = vxp[..., np.newaxis]*P + vyp[..., np.newaxis]*Q
+    # rotate positions from inertial to Earth-fixed frame
+    if rotation is None:
+        theta = get_gmst(epoch, times)
+        rotation = np.cos(theta), np.sin(theta)
+    cT, sT = rotation
+    x, y = position[..., 0], position[..., 1]
+    position = np.stack((cT*x + sT*y, -sT*x + cT*y, position[..., 2]), axis=-1)
+    return position, velocity
+
+def find_intervals(visible, times):
+    """Finds contiguous intervals of visibility in a (times x columns) boolean
+    array. Returns (column, start, end) arrays sorted by column then start
+    where each interval ends at the first non-visible (or last) sample."""
+    padded = np.zeros((visible.shape[0] + 2, visible.shape[1]), dtype=np.int8)
+    padded[1:-1] = visible
+    edges = np.diff(padded, axis=0)
+    riseTime, riseColumn = np.nonzero(edges == 1)
+    fallTime, fallColumn = np.nonzero(edges == -1)
+    rise = np.lexsort((riseTime, riseColumn))
+    fall = np.lexsort((fallTime, fallColumn))
+    end = np.minimum(fallTime[fall], len(times) - 1)
+    return riseColumn[rise], times[riseTime[rise]], times[end]
+
+def compute_access(positions, times, points, halfAngles):
+    """Computes access intervals between satellites and points of interest.
+
+    Returns a tuple of per-satellite access and constellation (union) access
+    as structured arrays of ACCESS_DTYPE sorted by point then start time
+    (satellite index -1 denotes constellation access).
+    """
+    units = get_unit_vectors(*points)
+    radius = np.linalg.norm(positions, axis=-1)
+    nadir = positions/radius[..., np.newaxis]
+    cosAngle = np.cos(np.array([
+        get_access_angle(radius[s], halfAngles[s]) for s in range(len(positions))
+    ]).reshape(radius.shape))
+    blockSize = max(1, BLOCK_SIZE//max(1, len(times)))
+    satelliteAccess, unionAccess = [], []
+    for block in range(0, len(units), blockSize):
+        blockUnits = units[block:block+blockSize]
+        anyVisible = np.zeros((len(times), len(blockUnits)), dtype=bool)
+        for s in range(len(positions)):
+            visible = np.dot(nadir[s], blockUnits.T) >= cosAngle[s][:, np.newaxis]
+            anyVisible |= visible
+            column, start, end = find_intervals(visible, times)
+            satelliteAccess.append(_to_records(ACCESS_DTYPE, s, column + block, start, end))
+        column, start, end = find_intervals(anyVisible, times)
+        unionAccess.append(_to_records(ACCESS_DTYPE, -1, column + block, start, end))
+    return (_sort_records(ACCESS_DTYPE, satelliteAccess, 'point'),
+            _sort_records(ACCESS_DTYPE, unionAccess, 'point'))
+
+def compute_contacts(positions, times, stations, minElevation=DEFAULT_MIN_ELEVATION):
+    """Computes contact intervals between satellites and each of a list of
+    ground stations. Returns a list (one per station) of structured arrays of
+    CONTACT_DTYPE sorted by satellite then start time."""
+    contacts = [[] for station in stations]
+    if not stations:
+        return contacts
+    units = get_unit_vectors(
+        [station.latitude for station in stations],
+        [station.longitude for station in stations]
+    )
+    for s in range(len(positions)):
+        radius = np.linalg.norm(positions[s], axis=-1)
+        cosAngle = np.cos(get_access_angle(radius, minElevation=minElevation))
+        visible = np.dot(positions[s]/radius[:, np.newaxis], units.T) >= cosAngle[:, np.newaxis]
+        column, start, end = find_intervals(visible, times)
+        for j in range(len(stations)):
+            selected = column == j
+            contacts[j].append(_to_records(CONTACT_DTYPE, s, j, start[selected], end[selected]))
+    return [_sort_records(CONTACT_DTYPE, records, 'satellite') for records in contacts]
+
+def merge_intervals(records, key):
+    """Merges overlapping or adjacent intervals sharing the same key field
+    into their union. Returns a structured array of the same dtype sorted by
+    key then start time with the other index field set to -1."""
+    if len(records) == 0:
+        return np.zeros(0, dtype=records.dtype)
+    records = records[np.lexsort((records['start'], records[key]))]
+    group = records[key].astype(float)
+    # offset each group so a single running maximum never crosses groups
+    offset = (group - group.min())*(np.max(records['end']) - np.min(records['start']) + 1)
+    start = records['start'] + offset
+    end = np.maximum.accumulate(records['end'] + offset)
+    new = np.r_[True, start[1:] > end[:-1]]
+    index = np.flatnonzero(new)
+    merged = np.zeros(len(index), dtype=records.dtype)
+    merged[key] = records[key][index]
+    other = [name for name in records.dtype.names if name not in (key, 'start', 'end')]
+    for name in other: merged[name] = -1
+    merged['start'] = records['start'][index]
+    merged['end'] = np.maximum.reduceat(records['end'], index)
+    return merged
+
+def _to_records(dtype, first, second, start, end):
+    """Packs interval arrays into a structured array."""
+    records = np.zeros(len(start), dtype=dtype)
+    records[dtype.names[0]] = first
+    records[dtype.names[1]] = second
+    records['start'] = start
+    records['end'] = end
+    return records
+
+def _sort_records(dtype, records, key):
+    """Concatenates and sorts structured interval arrays by key then start."""
+    if not records: return np.zeros(0, dtype=dtype)
+    records = np.concatenate(records)
+    return records[np.lexsort((records['start'], records[key]))]
+
+def get_time_step(elements, halfAngles):
+    """Returns a simulation time step (s) short enough to sample each
+    satellite's access footprint at least twice per pass."""
+    timeStep = MAX_TIME_STEP
+    for (a, e, i, argp, raan, M), halfAngle in zip(elements, halfAngles):
+        period = 2*math.pi*math.sqrt(a**3/EARTH_MU)
+        angle = float(get_access_angle(a*(1 - e), halfAngle))
+        timeStep = min(timeStep, angle*period/(2*math.pi))
+    return max(MIN_TIME_STEP, timeStep)
+
+class ConstellationAnalysis(object):
+    """Results of the constellation-keyed stage of orbital analysis.
+
+    Attributes:
+        epoch           Mission start (naive UTC datetime).
+        times           Simulation times (s) after the epoch.
+        points          Points of interest as (latitude, longitude) arrays
+                        in decimal degrees.
+        elements        Mean Keplerian elements (satellites x 6) as
+                        (a, e, i, argp, raan, M) in km and radians.
+        positions       Earth-fixed satellite positions (satellites x times x 3)
+                        in km.
+        velocities      Inertial satellite velocities (satellites x times x 3)
+                        in km/s.
+        satelliteAccess Per-satellite access intervals (ACCESS_DTYPE).
+        access          Constellation access intervals (ACCESS_DTYPE).
+        semimajorAxes   Semimajor axes (satellites x times) in km decayed by
+                        drag (None if drag is not modeled).
+        timeBase        Shared mission time base of the times (None if not
+                        available).
+        stationContacts Cache of per-station contact intervals keyed by
+                        (station fingerprint, minimum elevation) which are
+                        reused across ground networks.
+    """
+    def __init__(self, epoch, times, points, elements, positions, velocities,
+                 satelliteAccess, access, semimajorAxes=None, timeBase=None):
+        self.epoch = epoch
+        self.times = times
+        self.points = points
+        self.elements = elements
+        self.positions = positions
+        self.velocities = velocities
+        self.satelliteAccess = satelliteAccess
+        self.access = access
+        self.semimajorAxes = semimajorAxes
+        self.timeBase = timeBase
+        self.stationContacts = {}
+
+    def get_rotation(self, indices=None):
+        """Returns the cosine and sine of GMST (the inertial to Earth-fixed
+        rotation) at all times or at time indices, recalled from the time
+        base if available."""
+        if self.timeBase is not None:
+            return self.timeBase.get_rotation(indices)
+        theta = get_gmst(self.epoch, self.times if indices is None else self.times[indices])
+        return np.cos(theta), np.sin(theta)
+
+    def get_station_contacts(self, stations, minElevation=DEFAULT_MIN_ELEVATION):
+        """Returns a list of per-station contact intervals (CONTACT_DTYPE),
+        computing visibility only for stations not previously cached."""
+        keys = [(station.fingerprint(), minElevation) for station in stations]
+        missing = collections.OrderedDict(
+            (key, station) for key, station in zip(keys, stations)
+            if key not in self.stationContacts)
+        if missing:
+            contacts = compute_contacts(self.positions, self.times,
+                                        list(missing.values()), minElevation)
+            for key, records in zip(missing.keys(), contacts):
+                self.stationContacts[key] = records
+        return [self.stationContacts[key] for key in keys]
+
+class NetworkAnalysis(object):
+    """Results of the network-keyed stage of orbital analysis.
+
+    Attributes:
+        constellation   Constellation analysis results.
+        stationContacts Per-station contact intervals (CONTACT_DTYPE) with
+                        station indices relative to the network.
+        contacts        Per-satellite contact intervals with any network
+                        station (CONTACT_DTYPE, station index -1).
+    """
+    def __init__(self, constellation, stationContacts):
+        self.constellation = constellation
+        self.stationContacts = stationContacts
+        self.contacts = merge_intervals(stationContacts, 'satellite')
+
+class AnalysisCache(object):
+    """A bounded least-recently-used cache of analysis results.
+
+    Attributes:
+        maxSize         Maximum number of cached results.
+        hits            Number of cache hits.
+        misses          Number of cache misses.
+    """
+    def __init__(self, maxSize=4):
+        self.maxSize = maxSize
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+
+    def get(self, key, factory):
+        """Returns the cached value for a key or computes it using factory."""
+        if key in self._entries:
+            self.hits += 1
+            value = self._entries.pop(key)
+        else:
+            self.misses += 1
+            value = factory()
+            while len(self._entries) >= max(1, self.maxSize):
+                self._entries.popitem(last=False)
+        self._entries[key] = value
+        return value
+
+    def clear(self):
+        """Removes all cached values."""
+        self._entries.clear()
+
+CONSTELLATION_CACHE = AnalysisCache()
+PERIOD_CACHE = AnalysisCache(maxSize=16)
+TIME_BASE_CACHE = AnalysisCache(maxSize=8)
+
+def get_mission_period(mission, cache=PERIOD_CACHE):
+    """Returns the (memoized) mission start (naive UTC datetime) and duration
+    (s) so ISO-8601 values are parsed once per run."""
+    def factory():
+        epoch = parse_epoch(mission.start)
+        return epoch, parse_duration(mission.duration, epoch)
+    if cache is None:
+        return factory()
+    return cache.get((mission.start, mission.duration), factory)
+
+def get_time_base(mission, timeStep, cache=TIME_BASE_CACHE):
+    """Returns the (memoized) time base of a mission with a simulation time
+    step (s), shared by all architectures analyzed in a process. The cache
+    is held in memory and not persisted, so each worker process builds its
+    own time base."""
+    def factory():
+        epoch, duration = get_mission_period(mission)
+        return TimeBase(epoch, duration, timeStep)
+    if cache is None:
+        return factory()
+    return cache.get((mission.start, mission.duration, timeStep), factory)
+
+def get_constellation_key(mission, constellation, timeStep=None,
+                          gridSpacing=DEFAULT_GRID_SPACING, drag=False):
+    """Returns the memoization key for the constellation analysis stage. Only
+    mission fields which affect propagation and access are included."""
+    target = mission.target
+    key = (
+        mission.start, mission.duration,
+        target.fingerprint() if isinstance(target, Entity) else target,
+        constellation.fingerprint(), timeStep, gridSpacing
+    )
+    # keys without drag are unchanged so existing sidecar files stay valid
+    return key + (True,) if drag else key
+
+def save_constellation_analysis(analysis, path, key=None):
+    """Writes a constellation analysis to a memory-mappable binary sidecar
+    file so it can be shared with analysis stages in other processes."""
+    arrays = collections.OrderedDict([
+        ("times", analysis.times),
+        ("latitudes", analysis.points[0]),
+        ("longitudes", analysis.points[1]),
+        ("elements", analysis.elements),
+        ("positions", analysis.positions),
+        ("velocities", analysis.velocities),
+        ("satelliteAccess", analysis.satelliteAccess),
+        ("access", analysis.access)
+    ])
+    if analysis.semimajorAxes is not None:
+        arrays["semimajorAxes"] = analysis.semimajorAxes
+    write_arrays(path, arrays, {
+        "epoch": analysis.epoch.isoformat(),
+        "timeStep": analysis.timeBase.timeStep if analysis.timeBase is not None else None,
+        "key": list(key) if key is not None else None
+    })
+
+def has_constellation_analysis(path, key):
+    """Returns True if a binary sidecar file holds a constellation analysis
+    written for a key (reading only its header)."""
+    try:
+        header, start = read_header(path)
+    except (IOError, OSError, ValueError):
+        return False
+    return header["attributes"].get("key") == json.loads(json.dumps(list(key)))
+
+def load_constellation_analysis(path, key=None, mmap=True, mission=None):
+    """Reads a constellation analysis from a binary sidecar file. Returns None
+    if the file does not exist or was written for a different key. The time
+    base of a mission (if provided) is shared with the analysis."""
+    try:
+        arrays, attributes = read_arrays(path, mmap)
+    except (IOError, OSError, ValueError):
+        return None
+    if key is not None and attributes.get("key") != json.loads(json.dumps(list(key))):
+        return None
+    timeBase = None
+    if mission is not None and attributes.get("timeStep") is not None:
+        timeBase = get_time_base(mission, attributes["timeStep"])
+    return ConstellationAnalysis(
+        parse_epoch(attributes["epoch"]),
+        arrays["times"], (arrays["latitudes"], arrays["longitudes"]),
+        arrays["elements"], arrays["positions"], arrays["velocities"],
+        arrays["satelliteAccess"], arrays["access"], arrays.get("semimajorAxes", None),
+        timeBase)
+
+def analyze_constellation(mission, constellation, timeStep=None,
+                          gridSpacing=DEFAULT_GRID_SPACING, cache=CONSTELLATION_CACHE,
+                          sidecar=None, drag=False):
+    """Performs (or recalls) the constellation-keyed stage of orbital analysis:
+    propagation and point of interest access. Results are recalled from the
+    in-memory cache if available, otherwise from the binary sidecar file (if
+    provided and written for the same inputs) before being computed. Drag
+    toggles decay of semimajor axes (for satellites without propulsion)."""
+    key = get_constellation_key(mission, constellation, timeStep, gridSpacing, drag)
+    def factory():
+        if sidecar is not None:
+            analysis = load_constellation_analysis(sidecar, key, mission=mission)
+            if analysis is not None:
+                return analysis
+        satellites = constellation.satellites or []
+        elements = get_orbital_elements(satellites)
+        halfAngles = get_payload_half_angles(satellites)
+        step = timeStep if timeStep else get_time_step(elements, halfAngles)
+        # time grid, Earth rotation, and Sun ephemeris are shared with other
+        # architectures of the mission with the same time step
+        timeBase = get_time_base(mission, step)
+        epoch, times = timeBase.epoch, timeBase.times
+        points = generate_points(mission.target, gridSpacing)
+        semimajorAxes = None
+        if drag:
+            semimajorAxes = decay_semimajor_axes(elements[:, 0],
+                get_ballistic_coefficients(satellites), times)
+        positions, velocities = propagate(elements, times, epoch, semimajorAxes,
+                                          timeBase.get_rotation())
+        satelliteAccess, access = compute_access(positions, times, points, halfAngles)
+        return ConstellationAnalysis(epoch, times, points, elements, positions, velocities,
+                                     satelliteAccess, access, semimajorAxes, timeBase)
+    if cache is None:
+        return factory()
+    return cache.get(key, factory)
+
+def analyze_network(constellationAnalysis, network, minElevation=DEFAULT_MIN_ELEVATION):
+    """Performs the network-keyed stage of orbital analysis: ground station
+    contacts for a previously-analyzed constellation. Contacts are computed
+    once per station and merged for each network containing the station."""
+    stations = (network.groundStations if network is not None else None) or []
+    contacts = []
+    for j, records in enumerate(
+            constellationAnalysis.get_station_contacts(stations, minElevation)):
+        records = np.array(records)
+        records['station'] = j
+        contacts.append(records)
+    stationContacts = np.concatenate(contacts) if contacts else np.zeros(0, dtype=CONTACT_DTYPE)
+    return NetworkAnalysis(constellationAnalysis, stationContacts)
+
+def get_summary(values):
+    """Returns a min/max/avg summary dictionary of an array of values."""
+    values = np.asarray(values, dtype=float)
+    values = values[~np.isnan(values)]
+    if len(values) == 0:
+        return {"min": 0, "max": 0, "avg": 0}
+    return {"min": float(np.min(values)), "max": float(np.max(values)),
+            "avg": float(np.mean(values))}
+
+def _reduce_groups(values, groups, ufunc, size):
+    """Reduces values sorted by group index using a ufunc. Returns an array of
+    the given size with NaN values for empty groups."""
+    result = np.full(size, np.nan)
+    if len(values) == 0: return result
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    result[groups[starts]] = ufunc.reduceat(values, starts)
+    return result
+
+def _mean_groups(values, groups, size):
+    """Averages values by group index with NaN values for empty groups."""
+    counts = np.bincount(groups, minlength=size)
+    sums = np.bincount(groups, weights=values, minlength=size)
+    return np.where(counts > 0, sums/np.maximum(counts, 1), np.nan)
+
+def get_local_metrics(analysis, points=None):
+    """Returns per-point metrics as a dictionary of arrays (one element per
+    point of interest) with NaN values for points without access. If points
+    (a boolean mask of points of interest) is given, metrics are only
+    computed for the selected points (one element per selected point)."""
+    access = analysis.access
+    size = len(analysis.points[0])
+    t0, t1 = analysis.times[0], analysis.times[-1]
+    point = access['point']
+    if points is not None:
+        # access of selected points is renumbered in (sorted) point order
+        index = np.full(size, -1)
+        size = int(np.count_nonzero(points))
+        index[points] = np.arange(size)
+        access = access[points[point]]
+        point = index[access['point']]
+    duration = access['end'] - access['start']
+    numberPasses = np.bincount(point, minlength=size)
+    covered = numberPasses > 0
+    # revisit times are gaps between successive accesses of the same point
+    same = point[1:] == point[:-1]
+    gaps = (access['start'][1:] - access['end'][:-1])[same]
+    gapPoint = point[1:][same]
+    # response times also include leading and trailing gaps for each point
+    first = np.minimum(np.searchsorted(point, np.arange(size)), max(len(access) - 1, 0))
+    last = np.maximum(np.searchsorted(point, np.arange(size), side='right') - 1, 0)
+    lead = np.where(covered, access['start'][first] - t0, np.nan) if len(access) else np.full(size, np.nan)
+    trail = np.where(covered, t1 - access['end'][last], np.nan) if len(access) else np.full(size, np.nan)
+    allGaps = np.concatenate((gaps, np.nan_to_num(lead), np.nan_to_num(trail)))
+    allGapPoint = np.concatenate((gapPoint, np.arange(size), np.arange(size)))
+    order = np.argsort(allGapPoint, kind='stable')
+    allGaps, allGapPoint = allGaps[order], allGapPoint[order]
+    return {
+        "ATavg": _mean_groups(duration, point, size),
+        "ATmin": _reduce_groups(duration, point, np.minimum, size),
+        "ATmax": _reduce_groups(duration, point, np.maximum, size),
+        "RvTavg": _mean_groups(gaps, gapPoint, size),
+        "RvTmin": _reduce_groups(gaps, gapPoint, np.minimum, size),
+        "RvTmax": _reduce_groups(gaps, gapPoint, np.maximum, size),
+        "RpTavg": np.where(covered, np.bincount(allGapPoint, weights=allGaps**2,
+                           minlength=size)/(2*max(t1 - t0, 1e-9)), np.nan),
+        "RpTmin": np.where(covered, _reduce_groups(allGaps, allGapPoint, np.minimum, size), np.nan),
+        "RpTmax": np.where(covered, _reduce_groups(allGaps, allGapPoint, np.maximum, size), np.nan),
+        "TCcov": lead,
+        "numPass": numberPasses
+    }
+
+def get_latency(analysis, contacts):
+    """Returns the data latency (s) from the end of each per-satellite access
+    to the start (or ongoing) contact of the same satellite with a ground
+    station. Accesses without a subsequent contact have NaN latency."""
+    access = analysis.satelliteAccess
+    latency = np.full(len(access), np.nan)
+    for s in np.unique(access['satellite']):
+        selected = access['satellite'] == s
+        satelliteContacts = contacts[contacts['satellite'] == s]
+        if len(satelliteContacts) == 0: continue
+        ends = access['end'][selected]
+        index = np.searchsorted(satelliteContacts['end'], ends, side='left')
+        valid = index < len(satelliteContacts)
+        result = np.full(len(ends), np.nan)
+        result[valid] = np.maximum(
+            satelliteContacts['start'][index[valid]] - ends[valid], 0)
+        latency[selected] = result
+    return latency
+
+def get_global_metrics(networkAnalysis):
+    """Returns global performance measures (as written to gbl.json) for a
+    constellation paired with a ground network."""
+    analysis = networkAnalysis.constellation
+    contacts = networkAnalysis.contacts
+    local = get_local_metrics(analysis)
+    access = analysis.access
+    t0, t1 = analysis.times[0], analysis.times[-1]
+    days = max(t1 - t0, 1e-9)/86400
+    same = access['point'][1:] == access['point'][:-1]
+    contactDuration = contacts['end'] - contacts['start']
+    return {
+        "Time" : {"min" : float(t0), "max" : float(t1)},
+        "TimeToCoverage" : get_summary(local["TCcov"]),
+        "AccessTime" : get_summary(access['end'] - access['start']),
+        "RevisitTime" : get_summary((access['start'][1:] - access['end'][:-1])[same]),
+        "ResponseTime" : get_summary(local["RpTavg"]),
+        "Coverage" : float(np.mean(local["numPass"] > 0)) if len(local["numPass"]) else 0,
+        "NumOfPOIpasses" : get_summary(local["numPass"]),
+        "DataLatency" : get_summary(get_latency(analysis, contacts)),
+        "NumGSpassesPD" : len(contacts)/days,
+        "TotalDownlinkTimePD" : float(np.sum(contactDuration))/days,
+        "DownlinkTimePerPass" : get_summary(contactDuration)
+    }
+
+def clip_access(records, deployTimes):
+    """Clips per-satellite access intervals to begin no earlier than the
+    deployment time (s) of each satellite, removing intervals which end
+    before deployment."""
+    deployTimes = np.asarray(deployTimes, dtype=float)
+    start = np.maximum(records['start'], deployTimes[records['satellite']])
+    keep = records['end'] > start
+    clipped = records[keep]
+    clipped['start'] = start[keep]
+    return clipped
+
+class DeploymentPhase(object):
+    """A phase of constellation deployment beginning when one or more
+    satellites become operational.
+
+    Attributes:
+        time            Phase start time (s) after the epoch.
+        satellites      Indices of operational satellites.
+        access          Constellation access intervals (ACCESS_DTYPE) of
+                        operational satellites following deployment.
+    """
+    def __init__(self, time, satellites, access):
+        self.time = time
+        self.satellites = satellites
+        self.access = access
+
+def analyze_deployment(analysis, deployTimes):
+    """Returns the deployment phases of a constellation given the deployment
+    time (s) of each satellite (infinite if never deployed). Constellation
+    access is updated incrementally: each phase merges only the access of
+    newly-arriving satellites into the access of the previous phase."""
+    deployTimes = np.asarray(deployTimes, dtype=float)
+    access = clip_access(analysis.satelliteAccess, deployTimes)
+    # order access by deployment time so each phase reads a contiguous block
+    arrival = deployTimes[access['satellite']]
+    order = np.argsort(arrival, kind='stable')
+    access, arrival = access[order], arrival[order]
+    phases = []
+    union = np.zeros(0, dtype=ACCESS_DTYPE)
+    for time in np.unique(deployTimes[np.isfinite(deployTimes)]):
+        block = access[np.searchsorted(arrival, time, side='left'):
+                       np.searchsorted(arrival, time, side='right')]
+        if len(block):
+            union = merge_intervals(np.concatenate((union, block)), 'point')
+        phases.append(DeploymentPhase(float(time), np.flatnonzero(deployTimes <= time), union))
+    return phases
+
+def get_deployment_metrics(analysis, phases):
+    """Returns global coverage measures of a partially-deployed constellation
+    for each deployment phase."""
+    metrics = []
+    for phase in phases:
+        view = ConstellationAnalysis(analysis.epoch, analysis.times, analysis.points,
+            analysis.elements, analysis.positions, analysis.velocities,
+            analysis.satelliteAccess, phase.access, analysis.semimajorAxes, analysis.timeBase)
+        local = get_local_metrics(view)
+        access = phase.access
+        same = access['point'][1:] == access['point'][:-1]
+        metrics.append({
+            "time" : phase.time,
+            "numberSatellites" : len(phase.satellites),
+            "TimeToCoverage" : get_summary(local["TCcov"]),
+            "AccessTime" : get_summary(access['end'] - access['start']),
+            "RevisitTime" : get_summary((access['start'][1:] - access['end'][:-1])[same]),
+            "Coverage" : float(np.mean(local["numPass"] > 0)) if len(local["numPass"]) else 0
+        })
+    return metrics
+
+def get_keplerian_states(analysis, satellite, indices=None):
+    """Returns time-stamped osculating Keplerian states of a satellite as a
+    (times x 10) array: time, ecc, inc, sma, aop, raan, ma (deg), lat, lon (deg),
+    alt (km). Indices optionally selects time steps (default: all)."""
+    elements = analysis.elements[satellite:satellite + 1]
+    t = analysis.times if indices is None else analysis.times[indices]
+    if analysis.semimajorAxes is None:
+        a, e, i, argp, raan, M = get_mean_elements(elements, t)
+    else:
+        # decayed elements are integrated over all times before selection
+        a, e, i, argp, raan, M = get_mean_elements(elements, analysis.times,
+            analysis.semimajorAxes[satellite:satellite + 1])
+        a, argp, raan, M = [x[:, indices] if indices is not None else x for x in (a, argp, raan, M)]
+    e, i = float(e[0, 0]), float(i[0, 0])
+    position = analysis.positions[satellite]
+    if indices is not None:
+        position = position[indices]
+    radius = np.linalg.norm(position, axis=-1)
+    return np.column_stack((
+        t, np.full(len(t), e), np.full(len(t), math.degrees(i)),
+        np.broadcast_to(a[0], t.shape),
+        np.degrees(np.mod(argp[0], 2*np.pi)),
+        np.degrees(np.mod(raan[0], 2*np.pi)),
+        np.degrees(np.mod(M[0], 2*np.pi)),
+        np.degrees(np.arcsin(position[:, 2]/radius)),
+        np.degrees(np.arctan2(position[:, 1], position[:, 0])),
+        radius - EARTH_RADIUS
+    ))
+
+def get_cartesian_states(analysis, satellite, indices=None):
+    """Returns time-stamped inertial Cartesian states of a satellite as a
+    (times x 7) array: time, x, y, z (km), vx, vy, vz (km/s). Indices
+    optionally selects time steps (default: all)."""
+    times = analysis.times
+    position = analysis.positions[satellite]
+    velocity = analysis.velocities[satellite]
+    if indices is not None:
+        times, position, velocity = times[indices], position[indices], velocity[indices]
+    cT, sT = analysis.get_rotation(indices)
+    return np.column_stack((
+        times,
+        cT*position[:, 0] - sT*position[:, 1],
+        sT*position[:, 0] + cT*position[:, 1],
+        position[:, 2],
+        velocity
+    ))
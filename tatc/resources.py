@@ -2,6 +2,10 @@
 # -*- coding: utf-8 -*-
 
 """TAT-C resources loaded from file.
+
+Resources are loaded lazily (PEP 562) on first access, e.g. `tatc.DSN` or
+`from tatc.resources import DSN`, and cached so importing the package does
+not parse resource files.
 """
 
 import json
@@ -15,12 +19,27 @@ def load_from_json(entity, resource_file):
     with open(file_path) as infile:
         return entity.from_json(infile)
 
-DSN = load_from_json(GroundNetwork, "DSN.json")
-NENcom = load_from_json(GroundNetwork, "NENcom.json")
-NENgov = load_from_json(GroundNetwork, "NENgov.json")
+def load_nen_all():
+    """Loads the combined commercial and government Near Earth Network."""
+    return GroundNetwork(
+        name="Near Earth Network (All)",
+        acronym="NENall",
+        groundStations=__getattr__("NENcom").groundStations + __getattr__("NENgov").groundStations
+    )
+
+RESOURCES = {
+    "DSN": lambda: load_from_json(GroundNetwork, "DSN.json"),
+    "NENcom": lambda: load_from_json(GroundNetwork, "NENcom.json"),
+    "NENgov": lambda: load_from_json(GroundNetwork, "NENgov.json"),
+    "NENall": load_nen_all
+}
+
+def __getattr__(name):
+    """Loads and caches a resource on first access."""
+    if name in RESOURCES:
+        globals()[name] = RESOURCES[name]()
+        return globals()[name]
+    raise AttributeError("module {0!r} has no attribute {1!r}".format(__name__, name))
 
-NENall = GroundNetwork(
-    name="Near Earth Network (All)",
-    acronym="NENall",
-    groundStations=NENcom.groundStations + NENgov.groundStations
-)
+def __dir__():
+    return sorted(set(globals()) | set(RESOURCES))
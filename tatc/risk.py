@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Object models and methods for Monte Carlo system risk analysis.
+
+Each system risk is modeled by a sampler which draws, for a batch of trials,
+the (trials x satellites) events in which the risk is realized for a
+satellite. Likelihood is estimated as the fraction of trials in which the
+risk is realized for any satellite and consequence from the fraction of
+satellites affected given the risk is realized. Trials are drawn in batches
+from a random stream seeded by the mission and constellation fingerprints
+(so results are reproducible) until the standard error of every likelihood
+falls below a tolerance.
+
+Model parameters are nominal values; spacecraft and instrument lifetimes
+follow Weibull reliability models with infant mortality (shape < 1).
+"""
+
+import math
+import collections
+import numpy as np
+
+from .constants import EARTH_RADIUS, EARTH_MU
+from .orbits import get_mission_period, get_orbital_elements, get_planes
+from .coverage import get_payload
+from .cost import get_satellite_drivers, SECONDS_PER_YEAR
+from .instrument import MountType
+from .util import get_fingerprint
+
+DEFAULT_TOLERANCE = 0.005 # maximum standard error of likelihood estimates
+DEFAULT_BATCH_SIZE = 1000 # number of trials per batch
+DEFAULT_MAX_TRIALS = 100000 # maximum number of trials
+CONSEQUENCE_THRESHOLDS = [0.1, 0.25, 0.5, 0.75] # fraction of satellites affected
+
+SPACECRAFT_WEIBULL = (0.4521, 2607.) # spacecraft failure (shape, scale in years)
+INSTRUMENT_WEIBULL = (0.5, 1000.) # instrument failure (shape, scale in years)
+CHECKOUT_DURATION = 0.25 # on-orbit checkout duration (years)
+HERITAGE_PROBABILITY = 0.02 # probability of unforseen risk per TRL below 9
+DESIGN_FLAW_PROBABILITY = 0.01 # probability of design flaw per TRL below 10
+DEPLOYMENT_PROBABILITY = {MountType.BODY: 0.002, MountType.MAST: 0.02, MountType.PROBE: 0.03}
+LAUNCH_FAILURE_PROBABILITY = 0.05 # probability of launch failure (one per plane)
+DEBRIS_FLUX = 1e-5 # debris flux (impacts per m2-year) at peak altitude
+DEBRIS_PEAK_ALTITUDE = 800. # altitude of peak debris flux (km)
+DEBRIS_WIDTH = 250. # width of debris flux distribution (km)
+REFERENCE_DENSITY = 3e-12 # atmospheric density (kg/m3) at reference altitude
+REFERENCE_ALTITUDE = 400. # reference altitude (km)
+SCALE_HEIGHT = 58.5 # atmospheric density scale height (km)
+DENSITY_DISPERSION = 0.5 # log-normal dispersion of atmospheric density
+DRAG_COEFFICIENT = 2.2
+FORMATION_TOLERANCE = 5. # tolerable altitude decay (km)
+SPACING_TOLERANCE = 1. # tolerable differential altitude decay (km)
+PROPULSION_FAILURE_PROBABILITY = 0.05 # probability of propulsion failure
+RADIATION_RATE = 0.002 # annual probability of radiation damage at low altitude
+RADIATION_ALTITUDE = 1000. # altitude (km) at which radiation rate is increased ten-fold
+POWER_DEGRADATION = (0.0275, 0.01) # annual solar array degradation (mean, std)
+POWER_MARGIN = 0.2 # tolerable power degradation
+ATTITUDE_PROBABILITY = {"AXIS_3": 0.005, "SPINNING": 0.01, "GRAVITY_GRADIENT": 0.03}
+PROPELLANT_PROBABILITY = 0.002 # probability of propellant-related accident
+THERMAL_RATE = 0.002 # annual probability of thermal subsystem failure
+
+class RiskContext(object):
+    """Per-satellite risk drivers of an architecture.
+
+    Attributes:
+        years           Mission duration (years).
+        includePropulsion   True if satellites mitigate effects of drag.
+        drivers         Dictionary of cost driver arrays (see tatc.cost).
+        altitude        Mean altitude (km) of each satellite.
+        semimajorAxis   Semimajor axis (km) of each satellite.
+        area            Cross-sectional area (m2) of each satellite.
+        planes          Launch group (orbital plane) index of each satellite.
+        designs         Design index of each satellite.
+        deployment      Instrument deployment failure probability.
+        attitude        Attitude alignment failure probability.
+        propellant      True if the satellite carries propellant.
+    """
+    def __init__(self, mission, architecture, includePropulsion=True):
+        satellites = (architecture.constellation.satellites
+                      if architecture.constellation is not None else None) or []
+        self.years = get_mission_period(mission)[1]/SECONDS_PER_YEAR
+        self.includePropulsion = includePropulsion
+        self.drivers = get_satellite_drivers(satellites) if satellites \
+            else collections.defaultdict(lambda: np.zeros(0))
+        elements = get_orbital_elements(satellites)
+        self.semimajorAxis = elements[:, 0]
+        self.altitude = elements[:, 0] - EARTH_RADIUS
+        self.area = np.array([max(satellite.volume or 0, 1.)**(2./3) for satellite in satellites])
+        # satellites sharing an orbital plane share a launch
+        self.planes = get_planes(elements)
+        self.designs = self.drivers["design"].astype(int)
+        self.deployment = np.array([1 - np.prod([1 - DEPLOYMENT_PROBABILITY.get(
+            instrument.mountType, 0) for instrument in get_payload(satellite)])
+            for satellite in satellites])
+        self.attitude = np.array([ATTITUDE_PROBABILITY.get(satellite.stabilizationType, 0)
+            for satellite in satellites])
+        self.propellant = np.array([satellite.propellantType is not None
+            for satellite in satellites], dtype=bool)
+
+    @property
+    def size(self):
+        """Number of satellites."""
+        return len(self.altitude)
+
+def get_weibull_probability(shape, scale, t0, t1):
+    """Returns the probability of failure between times t0 and t1 (years)
+    for a Weibull reliability model."""
+    return 1 - np.exp((t0/scale)**shape - (t1/scale)**shape)
+
+def sample_independent(rng, trials, probability):
+    """Samples independent events for each satellite."""
+    probability = np.asarray(probability, dtype=float)
+    return rng.random((trials, len(probability))) < probability
+
+def sample_common(rng, trials, probability, groups):
+    """Samples events common to satellites in the same group."""
+    groups = np.asarray(groups, dtype=int)
+    size = int(np.max(groups)) + 1 if len(groups) else 0
+    return rng.random((trials, size))[:, groups] < np.asarray(probability, dtype=float)
+
+def sample_decay(rng, trials, context):
+    """Samples altitude decay (km) over the mission for each satellite using
+    an exponential atmosphere with log-normal density dispersion common to
+    all satellites and per-satellite ballistic dispersion."""
+    density = REFERENCE_DENSITY*np.exp(-(context.altitude - REFERENCE_ALTITUDE)/SCALE_HEIGHT)
+    ballistic = DRAG_COEFFICIENT*context.area/np.maximum(context.drivers["mass"], 1.)
+    rate = np.sqrt(EARTH_MU*context.semimajorAxis)*density*ballistic*1000. # km/s
+    common = rng.lognormal(0, DENSITY_DISPERSION, (trials, 1))
+    individual = rng.lognormal(0, DENSITY_DISPERSION/5., (trials, context.size))
+    return rate*common*individual*context.years*SECONDS_PER_YEAR
+
+def sample_unmitigated(rng, trials, context):
+    """Samples satellites for which drag effects are not mitigated."""
+    if not context.includePropulsion:
+        return np.ones((trials, context.size), dtype=bool)
+    return sample_independent(rng, trials,
+        np.full(context.size, PROPULSION_FAILURE_PROBABILITY))
+
+def sample_spacing(rng, trials, context):
+    """Samples satellites whose altitude decay differs from the median decay
+    of their constellation by more than the spacing tolerance."""
+    decay = sample_decay(rng, trials, context)
+    if context.size == 0:
+        return decay > 0
+    differential = np.abs(decay - np.median(decay, axis=1, keepdims=True))
+    return (differential > SPACING_TOLERANCE) & sample_unmitigated(rng, trials, context)
+
+class RiskModel(object):
+    """A system risk estimated by sampling.
+
+    Attributes:
+        category        Risk category.
+        risk            Risk description.
+        sampler         Function of (rng, trials, context) returning a
+                        (trials x satellites) boolean array of events.
+    """
+    def __init__(self, category, risk, sampler):
+        self.category = category
+        self.risk = risk
+        self.sampler = sampler
+
+    def sample(self, rng, trials, context):
+        """Samples events for a batch of trials."""
+        return self.sampler(rng, trials, context)
+
+RISK_MODELS = [
+    RiskModel("Configuration Risks",
+        "Risk of unforseen risk arising due to lack of flight heritage",
+        lambda rng, n, c: sample_common(rng, n, HERITAGE_PROBABILITY*np.clip(9 - np.minimum(
+            c.drivers["techReadinessLevel"], c.drivers["payloadTechReadinessLevel"]), 0, 9),
+            c.designs)),
+    RiskModel("Configuration Risks",
+        "Risk of 'infant mortality' significantly reducing science return (due to extended on orbit checkouts, assuming a catastrophic failure does not occur)",
+        lambda rng, n, c: sample_independent(rng, n, np.full(c.size, get_weibull_probability(
+            SPACECRAFT_WEIBULL[0], SPACECRAFT_WEIBULL[1], 0, min(CHECKOUT_DURATION, c.years))))),
+    RiskModel("Configuration Risks",
+        "Risk that constellation does not observe intended coverage area following loss of one or more spacecraft",
+        lambda rng, n, c: sample_independent(rng, n, np.full(c.size, get_weibull_probability(
+            SPACECRAFT_WEIBULL[0], SPACECRAFT_WEIBULL[1], 0, c.years)))),
+    RiskModel("Configuration Risks",
+        "Risk of collision with orbital debris",
+        lambda rng, n, c: sample_independent(rng, n, 1 - np.exp(-DEBRIS_FLUX*np.exp(
+            -0.5*((c.altitude - DEBRIS_PEAK_ALTITUDE)/DEBRIS_WIDTH)**2)*c.area*c.years))),
+    RiskModel("Configuration Risks",
+        "Risk of interrupted installation",
+        lambda rng, n, c: sample_common(rng, n, np.full(c.size, LAUNCH_FAILURE_PROBABILITY), c.planes)),
+    RiskModel("Configuration Risks",
+        "Risk of constellation formation change due to atmospheric drag",
+        lambda rng, n, c: (sample_decay(rng, n, c) > FORMATION_TOLERANCE)
+            & sample_unmitigated(rng, n, c)),
+    RiskModel("Configuration Risks",
+        "Risk of improper spacing between adjacent spacecraft due to atmospheric drag",
+        lambda rng, n, c: sample_spacing(rng, n, c)),
+    RiskModel("Satellite Performance Risks",
+        "Risk of instrument design flaw",
+        lambda rng, n, c: sample_common(rng, n, np.where(c.drivers["payloadCount"] > 0,
+            DESIGN_FLAW_PROBABILITY*np.clip(10 - c.drivers["payloadTechReadinessLevel"], 0, 10), 0),
+            c.designs)),
+    RiskModel("Satellite Performance Risks",
+        "Risk of instrument deployment failure",
+        lambda rng, n, c: sample_independent(rng, n, c.deployment)),
+    RiskModel("Satellite Performance Risks",
+        "Risk of premature instrument failure",
+        lambda rng, n, c: sample_independent(rng, n, np.where(c.drivers["payloadCount"] > 0,
+            1 - (1 - get_weibull_probability(INSTRUMENT_WEIBULL[0], INSTRUMENT_WEIBULL[1],
+            0, c.years))**c.drivers["payloadCount"], 0))),
+    RiskModel("Spacecraft Risks",
+        "Risk of radiation damage to spacecraft instrumentation",
+        lambda rng, n, c: sample_independent(rng, n, 1 - np.exp(-RADIATION_RATE*np.power(
+            10., np.clip(c.altitude, 0, None)/RADIATION_ALTITUDE)*c.years))),
+    RiskModel("Power Subsystem Risks",
+        "Risk of excessive power subsystem degradation over lifetime",
+        lambda rng, n, c: 1 - np.power(1 - np.clip(rng.normal(POWER_DEGRADATION[0],
+            POWER_DEGRADATION[1], (n, c.size)), 0, 1), c.years) > POWER_MARGIN),
+    RiskModel("Attitude Determination and Control Subsystem Risks",
+        "Risk of improper attitude alignment",
+        lambda rng, n, c: sample_independent(rng, n, c.attitude)),
+    RiskModel("Propulsion Subsystem Risks",
+        "Risk of fuel related accident (e.g. propellant tank rupture, propulsion subsystem failure)",
+        lambda rng, n, c: sample_independent(rng, n, np.where(c.propellant, PROPELLANT_PROBABILITY, 0))),
+    RiskModel("Thermal Subsystem Risks",
+        "Risk of thermal subsystem failure",
+        lambda rng, n, c: sample_independent(rng, n, np.full(c.size, 1 - math.exp(-THERMAL_RATE*c.years))))
+]
+
+class RiskAnalysis(object):
+    """Results of Monte Carlo system risk analysis.
+
+    Attributes:
+        models          List of risk models.
+        numberTrials    Number of trials sampled.
+        likelihood      Probability each risk is realized for any satellite.
+        standardError   Standard error of each likelihood estimate.
+        affected        Mean fraction of satellites affected given each risk
+                        is realized (0 if never realized).
+    """
+    def __init__(self, models, numberTrials, likelihood, standardError, affected):
+        self.models = models
+        self.numberTrials = numberTrials
+        self.likelihood = likelihood
+        self.standardError = standardError
+        self.affected = affected
+
+    def get_consequence(self):
+        """Returns consequence scores (1-5, or 0 if never realized) based on
+        the fraction of satellites affected."""
+        return np.where(self.likelihood > 0,
+            np.digitize(self.affected, CONSEQUENCE_THRESHOLDS) + 1, 0)
+
+    def to_list(self):
+        """Returns the system risk entries formatted for the cost and risk
+        analysis outputs."""
+        consequence = self.get_consequence()
+        return [{
+            "category": model.category,
+            "consequence": int(consequence[j]),
+            "likelihood": float(self.likelihood[j]),
+            "risk": model.risk
+        } for j, model in enumerate(self.models)]
+
+def get_seed(mission, architecture):
+    """Returns the random seed for the constellation of an architecture in a
+    mission. The ground network does not affect system risks so it is
+    excluded from the seed."""
+    constellation = architecture.constellation
+    return int(get_fingerprint([mission.fingerprint(),
+        None if constellation is None else constellation.fingerprint()]), 16)
+
+def analyze_risk(mission, architecture, includePropulsion=True, models=None,
+                 tolerance=DEFAULT_TOLERANCE, batchSize=DEFAULT_BATCH_SIZE,
+                 maxTrials=DEFAULT_MAX_TRIALS, seed=None):
+    """Estimates system risks of an architecture by Monte Carlo sampling with
+    early stopping once the standard error of every likelihood estimate is
+    below the tolerance (or the maximum number of trials is reached)."""
+    models = RISK_MODELS if models is None else models
+    context = RiskContext(mission, architecture, includePropulsion)
+    rng = np.random.default_rng(get_seed(mission, architecture) if seed is None else seed)
+    realized = np.zeros(len(models))
+    affected = np.zeros(len(models))
+    trials = 0
+    while trials < maxTrials:
+        size = min(batchSize, maxTrials - trials)
+        for j, model in enumerate(models):
+            events = model.sample(rng, size, context)
+            count = np.sum(events, axis=1)
+            realized[j] += np.count_nonzero(count)
+            affected[j] += np.sum(count)/max(context.size, 1)
+        trials += size
+        likelihood = realized/trials
+        # conservative (add-one) estimate so rare risks are not assigned a
+        # zero standard error before being observed
+        adjusted = (realized + 1)/(trials + 2)
+        standardError = np.sqrt(adjusted*(1 - adjusted)/trials)
+        if np.all(standardError < tolerance):
+            break
+    return RiskAnalysis(models, trials, likelihood, standardError,
+                        np.divide(affected, realized, out=np.zeros(len(models)), where=realized > 0))
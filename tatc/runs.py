@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Methods for recording tradespace search runs to support incremental
+re-runs.
+
+A run record (run.json in the output directory) holds the tradespace search
+of the last run and, for each architecture directory, the structural
+fingerprint of its architecture and a key of the inputs of each analysis
+module which completed for it. When a modified tradespace search is run
+again, architectures are matched to directories by fingerprint (not by
+index) and analysis modules are re-run only if their inputs changed, e.g. a
+new mission duration invalidates orbital, instrument, cost and risk, and
+launch analysis while a new launch vehicle invalidates cost and risk, and
+launch analysis only.
+"""
+
+import os
+import json
+import hashlib
+import collections
+
+from .util import Entity
+
+RUN_FILE = "run.json" # run record file name
+
+# inputs of each analysis module (besides the architecture) as attribute
+# paths of the tradespace search
+MODULE_INPUTS = collections.OrderedDict([
+    ("orbits", ("mission.start", "mission.duration", "mission.target",
+                "settings.includePropulsion", "settings.outputs")),
+    ("instrument", ("mission.start", "mission.duration", "mission.target",
+                    "settings.includePropulsion", "settings.outputs")),
+    ("cost_risk", ("mission.start", "mission.duration", "settings.includePropulsion",
+                   "designSpace.launchers")),
+    ("launch", ("mission.start", "mission.duration", "mission.target",
+                "settings.includePropulsion", "designSpace.launchers"))
+])
+
+def get_input(search, path):
+    """Returns the value of an attribute path (e.g. mission.start) of a
+    tradespace search formatted as JSON-serializable data."""
+    value = search
+    for name in path.split("."):
+        value = getattr(value, name, None) if value is not None else None
+    if isinstance(value, Entity):
+        return value.to_dict()
+    if isinstance(value, (list, tuple)):
+        return [item.to_dict() if isinstance(item, Entity) else item for item in value]
+    return value
+
+def get_module_keys(search, inputs=MODULE_INPUTS):
+    """Returns an ordered dictionary of the key (a hash of its inputs) of each
+    analysis module for a tradespace search."""
+    keys = collections.OrderedDict()
+    for name, paths in inputs.items():
+        canonical = json.dumps([get_input(search, path) for path in paths],
+                               sort_keys=True, separators=(',', ':'))
+        keys[name] = hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+    return keys
+
+class RunRecord(object):
+    """A record of the architectures evaluated by a tradespace search run.
+
+    Attributes:
+        search          Tradespace search of the run (JSON dictionary).
+        architectures   Ordered dictionary of records of each architecture
+                        directory name: the fingerprint of its architecture
+                        and the keys of its completed analysis modules.
+    """
+    def __init__(self, search=None, architectures=None):
+        self.search = search
+        self.architectures = architectures if architectures is not None else collections.OrderedDict()
+
+    def get_changes(self, search):
+        """Returns the sorted list of attribute paths (to a depth of two,
+        e.g. mission.duration) which differ from a tradespace search."""
+        previous = self.search or {}
+        current = json.loads(search.to_json())
+        changes = []
+        for section in set(previous) | set(current):
+            a, b = previous.get(section), current.get(section)
+            if isinstance(a, dict) and isinstance(b, dict):
+                changes.extend("{0}.{1}".format(section, name) for name in set(a) | set(b)
+                               if a.get(name) != b.get(name))
+            elif a != b:
+                changes.append(section)
+        return sorted(changes)
+
+    def get_directories(self):
+        """Returns a dictionary of the list of architecture directory names
+        by architecture fingerprint."""
+        directories = collections.defaultdict(list)
+        for name, record in self.architectures.items():
+            directories[record["fingerprint"]].append(name)
+        return directories
+
+    def get_stale_modules(self, name, keys):
+        """Returns the list of names of analysis modules which must be run
+        for an architecture directory given the current module keys."""
+        modules = self.architectures.get(name, {}).get("modules", {})
+        return [module for module, key in keys.items() if modules.get(module) != key]
+
+    def set_architecture(self, name, fingerprint, modules=None):
+        """Records an architecture directory with its completed modules."""
+        self.architectures[name] = collections.OrderedDict([
+            ("fingerprint", fingerprint),
+            ("modules", collections.OrderedDict(modules or {}))
+        ])
+
+    def to_dict(self):
+        """Returns this record as a JSON dictionary."""
+        return collections.OrderedDict([
+            ("search", self.search),
+            ("architectures", self.architectures)
+        ])
+
+    def save(self, directory):
+        """Writes this record to a directory (replacing any previous record
+        atomically)."""
+        path = os.path.join(directory, RUN_FILE)
+        with open(path + ".tmp", 'w') as outfile:
+            json.dump(self.to_dict(), outfile, indent=2)
+        os.replace(path + ".tmp", path)
+
+    @staticmethod
+    def load(directory):
+        """Reads the record of a directory (an empty record if none)."""
+        path = os.path.join(directory, RUN_FILE)
+        if not os.path.isfile(path):
+            return RunRecord()
+        with open(path, 'r') as infile:
+            d = json.load(infile, object_pairs_hook=collections.OrderedDict)
+        return RunRecord(d.get("search", None), d.get("architectures", None))
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Methods for low-discrepancy sampling of design spaces.
+
+Sobol sequences are generated in base 2 using the direction numbers of Joe
+and Kuo (2008) and randomized by linear matrix scrambling and a digital
+shift (Matousek, 1998), which preserve the net properties of the sequence:
+every prefix of 2^m points places exactly one point in each of the 2^m
+elementary intervals of each axis, so a sample stopped early still spreads
+evenly across the design space.
+"""
+
+import numpy as np
+
+from .util import QuantitativeRange
+
+SOBOL_BITS = 32 # number of bits of precision of generated points
+
+# primitive polynomial degree (s), coefficients (a), and initial direction
+# numbers (m) of dimensions 2 and greater (Joe and Kuo, new-joe-kuo-6.21201)
+SOBOL_PARAMETERS = (
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+    (5, 11, (1, 1, 5, 1, 1)),
+    (5, 13, (1, 1, 1, 3, 11)),
+    (5, 14, (1, 3, 5, 5, 31)),
+    (6, 1, (1, 3, 3, 9, 7, 49)),
+    (6, 13, (1, 1, 1, 15, 21, 21)),
+    (6, 16, (1, 3, 1, 13, 27, 49))
+)
+
+MAX_DIMENSIONS = len(SOBOL_PARAMETERS) + 1
+
+def get_direction_numbers(dimension):
+    """Returns the list of direction numbers (integers with SOBOL_BITS bits)
+    of a (zero-based) dimension of the Sobol sequence."""
+    if dimension == 0:
+        # the first dimension is the van der Corput sequence
+        return [1 << (SOBOL_BITS - 1 - j) for j in range(SOBOL_BITS)]
+    s, a, m = SOBOL_PARAMETERS[dimension - 1]
+    m = list(m)
+    for j in range(s, SOBOL_BITS):
+        value = m[j - s] ^ (m[j - s] << s)
+        for k in range(1, s):
+            value ^= ((a >> (s - 1 - k)) & 1)*(m[j - k] << k)
+        m.append(value)
+    return [m[j] << (SOBOL_BITS - 1 - j) for j in range(SOBOL_BITS)]
+
+def scramble_direction_numbers(directions, random):
+    """Returns direction numbers of a linear matrix scrambling: the generator
+    matrix is pre-multiplied by a random lower-triangular binary matrix with
+    unit diagonal."""
+    rows = []
+    for r in range(SOBOL_BITS):
+        # row r applies to bit r (counted from the most significant bit)
+        # and mixes it with the more significant bits
+        mask = 1 << (SOBOL_BITS - 1 - r)
+        for k in range(r):
+            if random.randint(2):
+                mask |= 1 << (SOBOL_BITS - 1 - k)
+        rows.append(mask)
+    return [
+        sum((bin(v & mask).count("1") & 1) << (SOBOL_BITS - 1 - r) for r, mask in enumerate(rows))
+        for v in directions
+    ]
+
+class SobolSequence(object):
+    """A (scrambled) Sobol low-discrepancy sequence of points in the unit
+    hypercube.
+
+    Attributes:
+        dimensions  Number of dimensions of each point.
+        seed        Seed of the random scrambling (None for a random seed or
+                    False for the unscrambled sequence).
+        directions  Array of direction numbers (one row per bit).
+        state       Array of the integer coordinates of the next point.
+        index       Index of the next point.
+    """
+    def __init__(self, dimensions, seed=None):
+        if not 0 < dimensions <= MAX_DIMENSIONS:
+            raise ValueError("Sobol sequences support 1 to {0} dimensions".format(MAX_DIMENSIONS))
+        self.dimensions = dimensions
+        self.seed = seed
+        directions = [get_direction_numbers(d) for d in range(dimensions)]
+        if seed is False:
+            shift = [0]*dimensions
+        else:
+            random = np.random.RandomState(seed)
+            directions = [scramble_direction_numbers(v, random) for v in directions]
+            shift = [int(random.randint(1 << 16)) << 16 | int(random.randint(1 << 16))
+                     for d in range(dimensions)]
+        self.directions = np.array(directions, dtype=np.uint64).T
+        self.state = np.array(shift, dtype=np.uint64)
+        self.index = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        """Returns the next point of the sequence."""
+        point = self.state*(0.5**SOBOL_BITS)
+        # Gray code order: flip the direction of the lowest zero bit of index
+        index = self.index
+        bit = 0
+        while index & 1:
+            index >>= 1
+            bit += 1
+        if bit >= SOBOL_BITS:
+            raise StopIteration
+        self.state = self.state ^ self.directions[bit]
+        self.index += 1
+        return point
+
+    def draw(self, numberPoints):
+        """Returns an array of the next number of points (one per row)."""
+        return np.array([next(self) for i in range(numberPoints)]).reshape(numberPoints, self.dimensions)
+
+def get_index(fraction, numberValues):
+    """Returns the index of the value at a fraction (0 to 1) of a sequence of
+    a number of values (each value spanning an equal interval)."""
+    return min(int(fraction*numberValues), numberValues - 1)
+
+def sample_value(axis, values, fraction):
+    """Returns the value at a fraction (0 to 1) of a design space axis:
+    continuous between the minimum and maximum values of a quantitative range
+    and otherwise one of its (enumerated) values."""
+    if isinstance(axis, QuantitativeRange):
+        return float(axis.minValue + fraction*(axis.maxValue - axis.minValue))
+    return values[get_index(fraction, len(values))]
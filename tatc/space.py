@@ -7,16 +7,40 @@
 
 import json
 import math
+import hashlib
 from numbers import Number
-import isodate
 import datetime
 import itertools
 import copy
+import functools
+import collections
+import numpy as np
 
-from .util import Entity, EnumEntity, CommunicationBand, QuantitativeRange
+from .util import Entity, EnumEntity, CommunicationBand, QuantitativeRange, get_values, \
+    get_binomial, get_multiset, get_fingerprint
+from .constants import EARTH_RADIUS, EARTH_MU, SSO_COEFFICIENT
+from .sampling import get_index, sample_value
 from .instrument import Instrument
 from .launch import LaunchVehicle
 
+MEMO_SIZE = 1024 # maximum number of memoized scalar results per function
+
+def memoize_scalar(function):
+    """Decorates a vectorized function of an array argument so that results
+    of scalar arguments are memoized. Scalars are evaluated as one-element
+    arrays so results are identical to array evaluation."""
+    @functools.lru_cache(maxsize=MEMO_SIZE)
+    def evaluate(value):
+        return float(function(np.array([value], dtype=float))[0])
+    @functools.wraps(function)
+    def wrapper(value):
+        if isinstance(value, Number):
+            return evaluate(float(value))
+        return function(np.asarray(value, dtype=float))
+    wrapper.cache_info = evaluate.cache_info
+    wrapper.cache_clear = evaluate.cache_clear
+    return wrapper
+
 class PropellantType(EnumEntity):
     """Enumeration of recognized propellant types."""
     COLD_GAS = "COLD_GAS"
@@ -180,52 +204,34 @@ class Orbit(Entity):
 
     def __iter__(self):
         """Iterates valid orbits."""
-        # iterate altitudes
-        try: altitudeIter = iter(self.altitude)
-        except TypeError: altitudeIter = [self.altitude]
-        # iterate inclinations
-        try:
-            if isinstance(self.inclination, str): raise TypeError
-            inclinationIter = iter(self.inclination)
-        except TypeError: inclinationIter = [self.inclination]
+        return iter(self.compile().orbits)
 
-        # return the Cartesian product of iterated values
-        return iter([
-                Orbit(
-                    orbitType=self.orbitType,
-                    altitude=altitude,
-                    inclination=inclination,
-                    semimajorAxis=self.semimajorAxis,
-                    eccentricity=self.eccentricity,
-                    periapsisArgument=self.periapsisArgument,
-                    rightAscensionAscendingNode=self.rightAscensionAscendingNode,
-                    trueAnomaly=self.trueAnomaly,
-                    epoch=self.epoch,
-                    localSolarTimeAscendingNode=self.localSolarTimeAscendingNode
-                )
-                for altitude, inclination
-                in itertools.product(altitudeIter, inclinationIter)
-            ])
+    def compile(self):
+        """Compiles the enumeration of valid orbits."""
+        return OrbitPlan(self)
 
     @staticmethod
+    @memoize_scalar
     def get_orbital_period(altitude):
-        """Returns the orbital period (s) for a given altitude (km)."""
-        re = 6378.14 # radius of the earth (km)
-        sma = re + altitude # semimajor axis (km)
-        mu = 3.98600440*(10**5) # gravitational constant (km^3/s^2)
-        return 2*math.pi*math.sqrt((sma**3)/mu)
+        """Returns the orbital period (s) for a given altitude (km) or array
+        of altitudes."""
+        return 2*np.pi*np.sqrt(Orbit.get_semimajor_axis(altitude)**3/EARTH_MU)
 
     @staticmethod
     def get_semimajor_axis(altitude):
-        re = 6378.14 # radius of the earth (km)
-        return re + altitude
+        """Returns the semimajor axis (km) of a circular orbit for a given
+        altitude (km) or array of altitudes."""
+        if isinstance(altitude, Number):
+            return EARTH_RADIUS + altitude
+        return EARTH_RADIUS + np.asarray(altitude, dtype=float)
 
     @staticmethod
+    @memoize_scalar
     def get_sso_inclination(altitude):
-        """Returns the sun-synchronous inclination (deg) for a given altitude (km)."""
-        re = 6378.14 # radius of the earth (km)
-        coef = 10.10949 # calculation coefficient
-        return math.degrees(math.acos((((re+altitude)/re)**3.5)/(-coef)))
+        """Returns the sun-synchronous inclination (deg) for a given altitude
+        (km) or array of altitudes."""
+        return np.degrees(np.arccos(
+            ((Orbit.get_semimajor_axis(altitude)/EARTH_RADIUS)**3.5)/(-SSO_COEFFICIENT)))
 
     @staticmethod
     def from_dict(d):
@@ -244,6 +250,61 @@ class Orbit(Entity):
                 _id = d.get("@id", None)
             )
 
+class OrbitPlan(object):
+    """A compiled enumeration of the orbits of a design space orbit. Values
+    are materialized once and should be treated as immutable.
+
+    Attributes:
+        orbit           Design space orbit.
+        altitudes       Tuple of altitude values (km).
+        inclinations    Tuple of inclination values (deg or special values).
+        semimajorAxes   Array of semimajor axes (km) for each altitude.
+        periods         Array of orbital periods (s) for each altitude.
+        ssoInclinations Array of sun-synchronous inclinations (deg) for each
+                        altitude.
+        orbits          Tuple of orbits as the Cartesian product of altitudes
+                        and inclinations.
+    """
+    def __init__(self, orbit):
+        self.orbit = orbit
+        self.altitudes = get_values(orbit.altitude)
+        self.inclinations = get_values(orbit.inclination)
+        altitudes = np.array([altitude if isinstance(altitude, Number) else np.nan
+                              for altitude in self.altitudes], dtype=float)
+        self.semimajorAxes = Orbit.get_semimajor_axis(altitudes)
+        self.periods = Orbit.get_orbital_period(altitudes)
+        self.ssoInclinations = Orbit.get_sso_inclination(altitudes)
+        for array in (self.semimajorAxes, self.periods, self.ssoInclinations):
+            array.setflags(write=False)
+        self.orbits = tuple(self.get_orbit(a, i)
+            for a, i in itertools.product(range(len(self.altitudes)), range(len(self.inclinations))))
+
+    def get_orbit(self, altitudeIndex, inclinationIndex):
+        """Returns the orbit for an altitude and inclination index using
+        precomputed sun-synchronous inclinations."""
+        orbit = copy.copy(self.orbit)
+        orbit._id = None
+        orbit.altitude = self.altitudes[altitudeIndex]
+        inclination = self.inclinations[inclinationIndex]
+        if isinstance(orbit.altitude, Number) and (inclination == "SSO"
+                or orbit.orbitType == OrbitType.SUN_SYNCHRONOUS):
+            orbit.inclination = float(self.ssoInclinations[altitudeIndex])
+        else: orbit.inclination = inclination
+        return orbit
+
+    def sample_orbit(self, altitudeFraction, inclinationFraction):
+        """Returns the orbit at fractions (0 to 1) of the altitude and
+        inclination axes, continuous for quantitative ranges."""
+        orbit = copy.copy(self.orbit)
+        orbit._id = None
+        orbit.altitude = sample_value(self.orbit.altitude, self.altitudes, altitudeFraction)
+        inclination = sample_value(self.orbit.inclination, self.inclinations, inclinationFraction)
+        if isinstance(orbit.altitude, Number) and (inclination == "SSO"
+                or orbit.orbitType == OrbitType.SUN_SYNCHRONOUS):
+            orbit.inclination = Orbit.get_sso_inclination(orbit.altitude)
+        else: orbit.inclination = inclination
+        return orbit
+
 class ConstellationType(EnumEntity):
     """Enumeration of recognized constellation types."""
     DELTA_HOMOGENOUS = "DELTA_HOMOGENOUS"
@@ -307,6 +368,7 @@ class Constellation(Entity):
         else:
             self.relativeSpacing = relativeSpacing
         if isinstance(satelliteInterval, Number):
+            import isodate
             self.satelliteInterval = isodate.duration_isoformat(datetime.timedelta(minutes=satelliteInterval))
         else: self.satelliteInterval = satelliteInterval
         self.orbit = orbit
@@ -326,7 +388,7 @@ class Constellation(Entity):
                     semimajorAxis=Orbit.get_semimajor_axis(self.orbit.altitude),
                     eccentricity=self.orbit.eccentricity,
                     periapsisArgument=self.orbit.periapsisArgument,
-                    rightAscensionAscendingNode=(satellite / satellitesPerPlane)*360./self.numberPlanes,
+                    rightAscensionAscendingNode=plane*360./self.numberPlanes,
                     trueAnomaly=((satellite % satellitesPerPlane)*self.numberPlanes
                                  + self.relativeSpacing*plane)*360./(satellitesPerPlane*self.numberPlanes),
                     epoch=None
@@ -334,89 +396,143 @@ class Constellation(Entity):
             )
         return orbits
 
-    def generate_constellations(self, satellites):
-        """Generates constellations for a given set of satellites."""
+    def generate_delta_state(self, satellites):
+        """Generates Walker delta orbital elements for a selection of member
+        satellites (one per orbit) as a ConstellationState without creating
+        per-satellite objects."""
+        satellite = np.arange(self.numberSatellites)
+        satellitesPerPlane = math.ceil(self.numberSatellites/self.numberPlanes)
+        plane = satellite // satellitesPerPlane
+        # orbital elements shared by all member satellites
+        template, values, integral = ConstellationState.split_orbit(
+            Orbit(
+                orbitType="KEPLERIAN",
+                inclination=self.orbit.inclination,
+                semimajorAxis=Orbit.get_semimajor_axis(self.orbit.altitude),
+                eccentricity=self.orbit.eccentricity,
+                periapsisArgument=self.orbit.periapsisArgument,
+                rightAscensionAscendingNode=0.,
+                trueAnomaly=0.,
+                epoch=None
+            )
+        )
+        columns = collections.OrderedDict(
+            (name, np.full(len(satellite), values[name])) for name in ORBIT_COLUMNS)
+        columns["rightAscensionAscendingNode"] = plane*360./self.numberPlanes
+        columns["trueAnomaly"] = ((satellite % satellitesPerPlane)*self.numberPlanes
+            + self.relativeSpacing*plane)*360./(satellitesPerPlane*self.numberPlanes)
+        # unique member satellites are stored as templates
+        templates, index = [], {}
+        for member in satellites:
+            if id(member) not in index:
+                index[id(member)] = len(templates)
+                templates.append(member)
+        return ConstellationState(
+            [ConstellationState.strip_satellite(member) for member in templates], [template],
+            np.array([index[id(member)] for member in satellites], dtype=np.int32),
+            np.zeros(len(satellite), dtype=np.int32), columns,
+            np.full(len(satellite), integral, dtype=np.uint8))
+
+    def generate_constellations(self, satellites, state=False):
+        """Generates constellations for a given set of satellites. If state is
+        True, member satellites are generated as a ConstellationState."""
+        return self.compile().generate_constellations(satellites, state)
+
+    def select_satellites(self, satellites, state=False):
+        """Generates constellations assigning member satellites selected from
+        a given set to the orbits of this (enumerated) constellation. If state
+        is True, member satellites are generated as a ConstellationState."""
         if self.constellationType == ConstellationType.DELTA_HOMOGENOUS:
-            constellations = []
             # generate one constellation iteration per satellite
-            for constellation in self:
-                for satellite in satellites:
-                    selectedSatellites = [copy.deepcopy(satellite) for i in range(constellation.numberSatellites)]
-                    for i, orbit in enumerate(self.generate_delta_orbits()):
-                        selectedSatellites[i].orbit = orbit
-                    constellations.append(
-                        Constellation(
-                            constellationType=constellation.constellationType,
-                            numberSatellites=constellation.numberSatellites,
-                            numberPlanes=constellation.numberPlanes,
-                            relativeSpacing=constellation.relativeSpacing,
-                            orbit=constellation.orbit,
-                            satellites=selectedSatellites
-                        )
-                    )
-            return constellations
+            selections = [[satellite]*self.numberSatellites for satellite in satellites]
         elif self.constellationType == ConstellationType.DELTA_HETEROGENEOUS:
             # generate one constellation iteration per satellite combination
-            constellations = []
-            for constellation in self:
-                for combinations in itertools.combinations_with_replacement(
-                        satellites, constellation.numberSatellites):
-                    selectedSatellites = [copy.deepcopy(i) for i in combinations]
-                    for i, orbit in enumerate(self.generate_delta_orbits()):
-                        selectedSatellites[i].orbit = orbit
-                    constellations.append(
-                        constellationType=constellation.constellationType,
-                        numberSatellites=constellation.numberSatellites,
-                        numberPlanes=constellation.numberPlanes,
-                        relativeSpacing=constellation.relativeSpacing,
-                        orbit=constellation.orbit,
-                        satellites=list(selectedSatellites)
-                    )
-            return constellations
+            selections = itertools.combinations_with_replacement(satellites, self.numberSatellites)
+        else:
+            raise NotImplementedError
+        orbits = None if state else self.generate_delta_orbits()
+        return [self.assign_satellites(selection, orbits, state) for selection in selections]
+
+    def select_combination(self, satellites, index, state=False):
+        """Generates the constellation at an index of the constellations
+        generated by select_satellites without generating the others."""
+        if self.constellationType == ConstellationType.DELTA_HOMOGENOUS:
+            selection = [satellites[index]]*self.numberSatellites
+        elif self.constellationType == ConstellationType.DELTA_HETEROGENEOUS:
+            selection = [satellites[i] for i in get_multiset(
+                len(satellites), self.numberSatellites, index)]
         else:
             raise NotImplementedError
+        return self.assign_satellites(selection, None, state)
+
+    def assign_satellites(self, selection, orbits=None, state=False):
+        """Generates the constellation assigning a selection of member
+        satellites (one per orbit) to the orbits of this (enumerated)
+        constellation. Orbits are generated unless given."""
+        if state:
+            selectedSatellites = self.generate_delta_state(selection)
+        else:
+            if orbits is None:
+                orbits = self.generate_delta_orbits()
+            selectedSatellites = [copy.deepcopy(i) for i in selection]
+            for satellite, orbit in zip(selectedSatellites, orbits):
+                satellite.orbit = orbit
+        return Constellation(
+            constellationType=self.constellationType,
+            numberSatellites=self.numberSatellites,
+            numberPlanes=self.numberPlanes,
+            relativeSpacing=self.relativeSpacing,
+            orbit=self.orbit,
+            satellites=selectedSatellites
+        )
+
+    def get_state(self):
+        """Returns member satellites as a ConstellationState."""
+        if isinstance(self.satellites, ConstellationState) or self.satellites is None:
+            return self.satellites
+        return ConstellationState.from_satellites(self.satellites)
+
+    def to_dict(self):
+        """Convert this constellation to a JSON-formatted dictionary. Member
+        satellites stored as a ConstellationState are expanded to a list."""
+        if not isinstance(self.satellites, ConstellationState):
+            return super(Constellation,self).to_dict()
+        satellites = self.satellites
+        try:
+            self.satellites = None
+            d = super(Constellation,self).to_dict()
+        finally:
+            self.satellites = satellites
+        d["satellites"] = satellites.to_list()
+        # keep the key order of the list form
+        for key in ("@id", "@type"):
+            if key in d: d[key] = d.pop(key)
+        return d
+
+    def fingerprint(self):
+        """Returns a structural fingerprint of this constellation. Member
+        satellites are fingerprinted by columns (ConstellationState) rather
+        than by their expanded JSON serialization, so a constellation has the
+        same fingerprint whether its members are a list or a state."""
+        state = self.get_state()
+        if state is None:
+            return super(Constellation,self).fingerprint()
+        satellites = self.satellites
+        try:
+            self.satellites = None
+            d = self.to_dict()
+        finally:
+            self.satellites = satellites
+        d["satellites"] = state.fingerprint()
+        return get_fingerprint(d)
 
     def __iter__(self):
         """Iterates valid constellations."""
-        # if member satellites specified, return self
-        if self.satellites is not None:
-            return iter([self])
-        # iterate number satellites
-        try: numberSatellitesIter = iter(self.numberSatellites)
-        except TypeError: numberSatellitesIter = [self.numberSatellites]
-        # iterate number planes
-        try: numberPlanesIter = iter(self.numberPlanes)
-        except TypeError: numberPlanesIter = [self.numberPlanes]
-        # iterate relative phasing
-        try: relativeSpacingIter = iter(self.relativeSpacing)
-        except TypeError: relativeSpacingIter = [self.relativeSpacing]
-        # iterate satellite interval
-        try:
-            if isinstance(self.satelliteInterval, str): raise TypeError
-            satelliteIntervalIter = iter(self.satelliteInterval)
-        except TypeError: satelliteIntervalIter = [self.satelliteInterval]
-        # iterate orbit
-        try: orbitIter = iter(self.orbit)
-        except TypeError: orbitIter = [self.orbit]
-        # return the Cartesian product of iterated values
-        return iter([
-                Constellation(
-                    constellationType=self.constellationType,
-                    numberSatellites=numberSatellites,
-                    numberPlanes=numberPlanes,
-                    relativeSpacing=relativeSpacing,
-                    satelliteInterval=satelliteInterval,
-                    orbit=orbit
-                )
-                for numberSatellites, numberPlanes, relativeSpacing, satelliteInterval, orbit
-                in itertools.product(numberSatellitesIter, numberPlanesIter, relativeSpacingIter, satelliteIntervalIter, orbitIter)
-                if ((relativeSpacing is None or
-                        numberPlanes is None or
-                        relativeSpacing < numberPlanes) and
-                    (numberSatellites is None or
-                        numberPlanes is None or
-                        numberPlanes <= numberSatellites))
-            ])
+        return iter(self.compile().get_constellations())
+
+    def compile(self):
+        """Compiles the enumeration of valid constellations."""
+        return ConstellationPlan(self)
 
     @staticmethod
     def from_dict(d):
@@ -431,3 +547,263 @@ class Constellation(Entity):
                 satellites = Satellite.from_json(d.get("satellites", None)),
                 _id = d.get("@id", None)
             )
+
+class ConstellationPlan(object):
+    """A compiled enumeration of the constellations of a design space
+    constellation. Values are materialized once and should be treated as
+    immutable.
+
+    Attributes:
+        constellation       Design space constellation.
+        numberSatellites    Tuple of numbers of satellites.
+        structures          Tuple of valid (numberPlanes, relativeSpacing)
+                            pairs.
+        satelliteIntervals  Tuple of satellite intervals.
+        orbitPlans          Tuple of orbit plans (None for orbits which are
+                            not enumerated).
+        orbits              Tuple of orbits.
+    """
+    def __init__(self, constellation):
+        self.constellation = constellation
+        self.numberSatellites = get_values(constellation.numberSatellites)
+        self.structures = tuple(
+            (numberPlanes, relativeSpacing)
+            for numberPlanes, relativeSpacing in itertools.product(
+                get_values(constellation.numberPlanes), get_values(constellation.relativeSpacing))
+            if relativeSpacing is None or numberPlanes is None or relativeSpacing < numberPlanes)
+        self.satelliteIntervals = get_values(constellation.satelliteInterval)
+        if isinstance(constellation.orbit, Orbit):
+            self.orbitPlans = (constellation.orbit.compile(),)
+            self.orbits = self.orbitPlans[0].orbits
+        else:
+            self.orbitPlans = (None,)
+            self.orbits = get_values(constellation.orbit)
+
+    def get_structures(self, numberSatellites):
+        """Returns the valid (numberPlanes, relativeSpacing) pairs for a
+        number of satellites."""
+        return tuple((numberPlanes, relativeSpacing) for numberPlanes, relativeSpacing in self.structures
+                     if numberSatellites is None or numberPlanes is None or numberPlanes <= numberSatellites)
+
+    def get_constellation(self, numberSatellites, structure, satelliteInterval, orbit):
+        """Returns the constellation for a combination of axis values."""
+        return Constellation(
+            constellationType=self.constellation.constellationType,
+            numberSatellites=numberSatellites,
+            numberPlanes=structure[0],
+            relativeSpacing=structure[1],
+            satelliteInterval=satelliteInterval,
+            orbit=orbit
+        )
+
+    def sample_constellation(self, fractions):
+        """Returns the constellation at fractions (0 to 1) of the number of
+        satellites, structure, satellite interval, altitude, and inclination
+        axes. Structures are sampled among those valid for the number of
+        satellites. Returns None if no structure is valid."""
+        # if member satellites specified, return the constellation directly
+        if self.constellation.satellites is not None:
+            return self.constellation
+        numberSatellites = self.numberSatellites[get_index(fractions[0], len(self.numberSatellites))]
+        structures = self.get_structures(numberSatellites)
+        if not structures:
+            return None
+        if self.orbitPlans[0] is not None:
+            orbit = self.orbitPlans[0].sample_orbit(fractions[3], fractions[4])
+        else:
+            orbit = self.orbits[get_index(fractions[3], len(self.orbits))]
+        return self.get_constellation(numberSatellites,
+            structures[get_index(fractions[1], len(structures))],
+            self.satelliteIntervals[get_index(fractions[2], len(self.satelliteIntervals))],
+            orbit)
+
+    def get_constellations(self):
+        """Returns the list of valid constellations."""
+        # if member satellites specified, return the constellation directly
+        if self.constellation.satellites is not None:
+            return [self.constellation]
+        return [
+            self.get_constellation(numberSatellites, structure, satelliteInterval, orbit)
+            for numberSatellites in self.numberSatellites
+            for structure, satelliteInterval, orbit in itertools.product(
+                self.get_structures(numberSatellites), self.satelliteIntervals, self.orbits)
+        ]
+
+    def generate_constellations(self, satellites, state=False):
+        """Generates constellations for a given set of satellites (with
+        member satellites as a ConstellationState if state is True)."""
+        return list(itertools.chain.from_iterable(
+            constellation.select_satellites(satellites, state)
+            for constellation in self.get_constellations()))
+
+    def count_selections(self, numberSatellites, numberAvailable):
+        """Returns the number of ways to select member satellites from a
+        number of available satellites."""
+        if self.constellation.constellationType == ConstellationType.DELTA_HOMOGENOUS:
+            return numberAvailable
+        elif self.constellation.constellationType == ConstellationType.DELTA_HETEROGENEOUS:
+            return get_binomial(numberAvailable + int(numberSatellites) - 1, int(numberSatellites))
+        else:
+            raise NotImplementedError
+
+    def count(self, numberAvailable):
+        """Returns the number of constellations generated for a number of
+        available satellites without enumerating them."""
+        if self.constellation.satellites is not None:
+            return self.count_selections(self.constellation.numberSatellites, numberAvailable)
+        return sum(
+            len(self.get_structures(numberSatellites))*len(self.satelliteIntervals)*len(self.orbits)
+            *self.count_selections(numberSatellites, numberAvailable)
+            for numberSatellites in self.numberSatellites)
+
+ORBIT_COLUMNS = ("semimajorAxis", "eccentricity", "inclination", "periapsisArgument",
+                 "rightAscensionAscendingNode", "trueAnomaly")
+
+class ConstellationState(object):
+    """A struct-of-arrays representation of the member satellites of a
+    constellation. Numeric orbital elements are stored in columns (one
+    element per satellite) and all other satellite and orbit attributes are
+    stored in shared templates so large constellations do not require
+    per-satellite objects. Conversion to and from lists of satellites is
+    lossless.
+
+    Attributes:
+        templates       List of distinct member satellites (without orbits).
+        orbitTemplates  List of distinct orbits with column attributes
+                        removed.
+        template        Template index (int32) of each satellite.
+        orbitTemplate   Orbit template index (int32) of each satellite (-1
+                        for satellites without orbits).
+        columns         Dictionary of orbital element name (ORBIT_COLUMNS) to
+                        a float64 array (NaN if not numeric).
+        integral        Bit mask (uint8) of columns holding integer values.
+    """
+    def __init__(self, templates, orbitTemplates, template, orbitTemplate,
+                 columns, integral=None, fingerprint=None):
+        self.templates = templates
+        self.orbitTemplates = orbitTemplates
+        self.template = template
+        self.orbitTemplate = orbitTemplate
+        self.columns = columns
+        self.integral = integral if integral is not None \
+            else np.zeros(len(template), dtype=np.uint8)
+        # fingerprint (if known) of the arrays, which are not modified
+        self._fingerprint = fingerprint
+
+    def __len__(self):
+        """Number of member satellites."""
+        return len(self.template)
+
+    def __iter__(self):
+        """Iterates the (shared) template of each member satellite."""
+        return (self.templates[t] for t in self.template)
+
+    @property
+    def nbytes(self):
+        """Number of bytes used by per-satellite arrays."""
+        return (self.template.nbytes + self.orbitTemplate.nbytes + self.integral.nbytes
+                + sum(column.nbytes for column in self.columns.values()))
+
+    def fingerprint(self):
+        """Returns a structural fingerprint of member satellites computed
+        (once) from the column and index arrays and the fingerprints of the
+        templates in use, without creating per-satellite objects. States of
+        the same member satellites share a fingerprint regardless of the
+        order of templates."""
+        if self._fingerprint is None:
+            digest = hashlib.sha1()
+            for templates, index in ((self.templates, self.template),
+                                     (self.orbitTemplates, self.orbitTemplate)):
+                index = np.asarray(index, dtype=np.int64)
+                used = np.unique(index[index >= 0])
+                keys = [templates[t].fingerprint() for t in used]
+                # index templates in the (sorted) order of their fingerprints
+                rank = np.full(len(templates) + 1, -1, dtype=np.int64)
+                rank[used] = np.argsort(np.argsort(keys, kind='stable'), kind='stable')
+                digest.update(json.dumps(sorted(keys)).encode('utf-8'))
+                digest.update(rank[index].tobytes())
+            for name in ORBIT_COLUMNS:
+                digest.update(np.ascontiguousarray(self.columns[name], dtype=np.float64).tobytes())
+            digest.update(np.ascontiguousarray(self.integral, dtype=np.uint8).tobytes())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def get_template_attribute(self, name):
+        """Returns an object array of an orbit template attribute for each
+        satellite (None for satellites without orbits)."""
+        values = np.array([getattr(orbit, name) for orbit in self.orbitTemplates] + [None],
+                          dtype=object)
+        return values[self.orbitTemplate]
+
+    @staticmethod
+    def strip_satellite(satellite):
+        """Returns a shallow copy of a satellite without its orbit."""
+        template = copy.copy(satellite)
+        template.orbit = None
+        return template
+
+    @staticmethod
+    def split_orbit(orbit):
+        """Splits an orbit into a template (with numeric column attributes
+        removed), a dictionary of column values, and an integral bit mask."""
+        template = copy.copy(orbit)
+        values, integral = {}, 0
+        for k, name in enumerate(ORBIT_COLUMNS):
+            value = getattr(orbit, name)
+            if isinstance(value, Number) and not isinstance(value, bool):
+                values[name] = float(value)
+                if not isinstance(value, (float, np.floating)):
+                    integral |= 1 << k
+                setattr(template, name, None)
+            else:
+                values[name] = np.nan
+        return template, values, integral
+
+    @staticmethod
+    def from_satellites(satellites):
+        """Converts a list of satellites to a constellation state."""
+        templates, orbitTemplates, keys, orbitKeys = [], [], {}, {}
+        template = np.zeros(len(satellites), dtype=np.int32)
+        orbitTemplate = np.full(len(satellites), -1, dtype=np.int32)
+        columns = collections.OrderedDict(
+            (name, np.full(len(satellites), np.nan)) for name in ORBIT_COLUMNS)
+        integral = np.zeros(len(satellites), dtype=np.uint8)
+        for s, satellite in enumerate(satellites):
+            stripped = ConstellationState.strip_satellite(satellite)
+            key = json.dumps(stripped.to_dict(), sort_keys=True)
+            if key not in keys:
+                keys[key] = len(templates)
+                templates.append(stripped)
+            template[s] = keys[key]
+            if satellite.orbit is None: continue
+            orbit, values, integral[s] = ConstellationState.split_orbit(satellite.orbit)
+            key = json.dumps(orbit.to_dict(), sort_keys=True)
+            if key not in orbitKeys:
+                orbitKeys[key] = len(orbitTemplates)
+                orbitTemplates.append(orbit)
+            orbitTemplate[s] = orbitKeys[key]
+            for name in ORBIT_COLUMNS:
+                columns[name][s] = values[name]
+        return ConstellationState(templates, orbitTemplates, template,
+                                  orbitTemplate, columns, integral)
+
+    def get_satellite(self, index):
+        """Returns a new satellite object for one member satellite."""
+        satellite = copy.deepcopy(self.templates[self.template[index]])
+        if self.orbitTemplate[index] >= 0:
+            orbit = copy.copy(self.orbitTemplates[self.orbitTemplate[index]])
+            for k, name in enumerate(ORBIT_COLUMNS):
+                value = self.columns[name][index]
+                if not np.isnan(value):
+                    setattr(orbit, name, int(value) if self.integral[index] & (1 << k)
+                            else float(value))
+            satellite.orbit = orbit
+        return satellite
+
+    def to_satellites(self):
+        """Converts this state to a list of satellites."""
+        return [self.get_satellite(s) for s in range(len(self))]
+
+    def to_list(self):
+        """Returns member satellites as a list of JSON-formatted dictionaries."""
+        return [satellite.to_dict() for satellite in self.to_satellites()]
@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Methods for binary storage of intermediate analysis results.
+
+Arrays are stored in a single self-describing file: a fixed-length preamble
+(magic bytes and header length), a JSON header describing each array
+(dtype, shape, byte offset) and any attributes, followed by the raw array
+data aligned to ALIGNMENT bytes so arrays can be memory-mapped directly
+without parsing.
+
+Architectures may also be stored in this format (arch.bin) as an
+alternative to JSON (arch.json): the header holds the architecture without
+member satellites, a deduplicated table of satellite and orbit templates,
+and the fingerprint of the member satellites (so keys of analysis stages do
+not read the records), followed by one fixed-width record per member
+satellite (ORBIT_DTYPE) which is read as a memory-mapped ConstellationState.
+"""
+
+import os
+import json
+import struct
+import collections
+import numpy as np
+
+from .space import Satellite, Orbit, ConstellationState, ORBIT_COLUMNS
+from .mission import Architecture
+
+MAGIC = b'TATCBIN1' # file signature and format version
+ALIGNMENT = 64 # byte alignment of array data
+
+ARCHITECTURE_JSON = 'arch.json' # architecture file name (JSON format)
+ARCHITECTURE_BIN = 'arch.bin' # architecture file name (binary format)
+ORBIT_DTYPE = np.dtype([
+    ('template', '<i4'), ('orbitTemplate', '<i4'), ('integral', 'u1')
+] + [(name, '<f8') for name in ORBIT_COLUMNS])
+
+def _align(offset):
+    """Returns the next aligned byte offset."""
+    return -(-offset // ALIGNMENT)*ALIGNMENT
+
+def write_arrays(path, arrays, attributes=None):
+    """Writes a dictionary of named arrays (and JSON-serializable attributes)
+    to a binary file."""
+    arrays = collections.OrderedDict(
+        (name, np.ascontiguousarray(array)) for name, array in arrays.items())
+    header = {"attributes": attributes or {}, "arrays": collections.OrderedDict()}
+    offset = 0
+    for name, array in arrays.items():
+        header["arrays"][name] = {
+            "dtype": np.lib.format.dtype_to_descr(array.dtype),
+            "shape": list(array.shape),
+            "offset": offset
+        }
+        offset = _align(offset + array.nbytes)
+    encoded = json.dumps(header).encode('utf-8')
+    start = _align(len(MAGIC) + 8 + len(encoded))
+    with open(path, 'wb') as outfile:
+        outfile.write(MAGIC)
+        outfile.write(struct.pack('<Q', len(encoded)))
+        outfile.write(encoded)
+        for name, array in arrays.items():
+            outfile.seek(start + header["arrays"][name]["offset"])
+            outfile.write(array.tobytes())
+        outfile.truncate(start + offset)
+
+def read_header(path):
+    """Reads the JSON header and data offset of a binary file."""
+    with open(path, 'rb') as infile:
+        if infile.read(len(MAGIC)) != MAGIC:
+            raise ValueError('{0} is not a recognized binary file'.format(path))
+        length, = struct.unpack('<Q', infile.read(8))
+        header = json.loads(infile.read(length).decode('utf-8'),
+                            object_pairs_hook=collections.OrderedDict)
+    return header, _align(len(MAGIC) + 8 + length)
+
+def read_arrays(path, mmap=True):
+    """Reads named arrays and attributes from a binary file. If mmap is True,
+    arrays are read-only memory maps of the file; otherwise they are copied
+    into memory."""
+    header, start = read_header(path)
+    arrays = collections.OrderedDict()
+    for name, spec in header["arrays"].items():
+        dtype = np.lib.format.descr_to_dtype(spec["dtype"])
+        shape = tuple(spec["shape"])
+        if mmap and int(np.prod(shape)) > 0:
+            arrays[name] = np.memmap(path, dtype=dtype, mode='r',
+                                     offset=start + spec["offset"], shape=shape)
+        else:
+            count = int(np.prod(shape))
+            with open(path, 'rb') as infile:
+                infile.seek(start + spec["offset"])
+                arrays[name] = np.fromfile(infile, dtype=dtype, count=count).reshape(shape)
+    return arrays, header["attributes"]
+
+def write_architecture(path, architecture):
+    """Writes an architecture to a binary file."""
+    constellation = architecture.constellation
+    state = constellation.get_state() if constellation is not None else None
+    records = np.zeros(len(state) if state is not None else 0, dtype=ORBIT_DTYPE)
+    if state is not None:
+        records['template'] = state.template
+        records['orbitTemplate'] = state.orbitTemplate
+        records['integral'] = state.integral
+        for name in ORBIT_COLUMNS:
+            records[name] = state.columns[name]
+    # serialize the architecture without member satellites
+    satellites = constellation.satellites if constellation is not None else None
+    try:
+        if constellation is not None: constellation.satellites = None
+        d = architecture.to_dict()
+    finally:
+        if constellation is not None: constellation.satellites = satellites
+    write_arrays(path, collections.OrderedDict([("orbits", records)]), {
+        "architecture": d,
+        "satellites": state is not None,
+        "fingerprint": state.fingerprint() if state is not None else None,
+        "templates": [template.to_dict() for template in state.templates] if state is not None else [],
+        "orbitTemplates": [orbit.to_dict() for orbit in state.orbitTemplates] if state is not None else []
+    })
+
+def read_architecture(path, mmap=True):
+    """Reads an architecture from a binary file. Member satellites are read
+    as a ConstellationState with columns memory-mapped from the file (if
+    mmap is True)."""
+    arrays, attributes = read_arrays(path, mmap)
+    architecture = Architecture.from_dict(attributes["architecture"])
+    if attributes["satellites"] and architecture.constellation is not None:
+        records = arrays["orbits"]
+        architecture.constellation.satellites = ConstellationState(
+            [Satellite.from_dict(d) for d in attributes["templates"]],
+            # parsing fills defaults of column attributes, which are removed
+            [ConstellationState.split_orbit(Orbit.from_dict(d))[0]
+             for d in attributes["orbitTemplates"]],
+            records['template'], records['orbitTemplate'],
+            collections.OrderedDict((name, records[name]) for name in ORBIT_COLUMNS),
+            records['integral'], attributes.get("fingerprint"))
+    return architecture
+
+def load_architecture(arch_dir, mmap=True):
+    """Loads the architecture of an architecture directory from the binary
+    format (if available) or otherwise from JSON."""
+    if os.path.isfile(os.path.join(arch_dir, ARCHITECTURE_BIN)):
+        return read_architecture(os.path.join(arch_dir, ARCHITECTURE_BIN), mmap)
+    with open(os.path.join(arch_dir, ARCHITECTURE_JSON), 'r') as arch_file:
+        return Architecture.from_json(arch_file)
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Methods for tracing the duration of execution stages.
+
+Stages are timed with spans, e.g. `with span("orbits", arch="arch-1"):`,
+recorded by the active tracer (TRACER). Tracing is disabled by default in
+which case span() returns a shared no-op context so instrumented code pays
+only a function call and attribute check. Recorded spans can be exported as
+Chrome trace event JSON (readable by chrome://tracing and Perfetto) and
+summarized by stage (count, total, p50, p95, and maximum duration).
+"""
+
+import os
+import json
+import time
+import threading
+import collections
+import numpy as np
+
+class Span(object):
+    """A timed execution stage.
+
+    Attributes:
+        name        Name of the stage.
+        args        Dictionary of JSON-serializable arguments (e.g. the
+                    architecture).
+        start       Start time (ns) of the stage.
+        duration    Duration (ns) of the stage.
+        thread      Identifier of the executing thread.
+    """
+    __slots__ = ("tracer", "name", "args", "start", "duration", "thread")
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = None
+        self.duration = None
+        self.thread = None
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *args):
+        self.duration = time.perf_counter_ns() - self.start
+        self.thread = threading.get_ident()
+        self.tracer.spans.append(self)
+
+class NullSpan(object):
+    """A span which records nothing (used when tracing is disabled)."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+NULL_SPAN = NullSpan()
+
+class Tracer(object):
+    """A recorder of execution stage spans.
+
+    Attributes:
+        enabled     True, if spans are recorded.
+        spans       List of recorded spans (in order of completion).
+        origin      Reference time (ns) of trace timestamps.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.spans = []
+        self.origin = time.perf_counter_ns()
+
+    def span(self, name, **args):
+        """Returns a context which records the duration of a stage."""
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, args)
+
+    def clear(self):
+        """Removes all recorded spans."""
+        del self.spans[:]
+
+    def get_durations(self):
+        """Returns an ordered dictionary of span durations (s) by name."""
+        durations = collections.OrderedDict()
+        for span in self.spans:
+            durations.setdefault(span.name, []).append(span.duration*1e-9)
+        return durations
+
+    def get_summary(self):
+        """Returns an ordered dictionary of the count, total, median (p50),
+        95th percentile (p95), and maximum duration (s) of spans by name."""
+        summary = collections.OrderedDict()
+        for name, durations in self.get_durations().items():
+            durations = np.array(durations)
+            summary[name] = collections.OrderedDict([
+                ("count", len(durations)),
+                ("total", float(np.sum(durations))),
+                ("p50", float(np.percentile(durations, 50))),
+                ("p95", float(np.percentile(durations, 95))),
+                ("max", float(np.max(durations)))
+            ])
+        return summary
+
+    def format_summary(self):
+        """Returns the summary of spans formatted as a table (durations in
+        milliseconds)."""
+        lines = ["{0:<24}{1:>8}{2:>12}{3:>12}{4:>12}{5:>12}".format(
+            "stage", "count", "total [ms]", "p50 [ms]", "p95 [ms]", "max [ms]")]
+        for name, s in self.get_summary().items():
+            lines.append("{0:<24}{1:>8d}{2:>12.3f}{3:>12.3f}{4:>12.3f}{5:>12.3f}".format(
+                name, s["count"], s["total"]*1e3, s["p50"]*1e3, s["p95"]*1e3, s["max"]*1e3))
+        return "\n".join(lines)
+
+    def to_chrome_trace(self):
+        """Returns recorded spans formatted as Chrome trace events."""
+        pid = os.getpid()
+        return {
+            "traceEvents": [{
+                "name": span.name,
+                "cat": "tatc",
+                "ph": "X",
+                "ts": (span.start - self.origin)/1e3,
+                "dur": span.duration/1e3,
+                "pid": pid,
+                "tid": span.thread,
+                "args": span.args
+            } for span in sorted(self.spans, key=lambda span: span.start)],
+            "displayTimeUnit": "ms"
+        }
+
+    def write_chrome_trace(self, path):
+        """Writes recorded spans to a Chrome trace (JSON) file."""
+        with open(path, 'w') as outfile:
+            json.dump(self.to_chrome_trace(), outfile)
+
+TRACER = Tracer()
+
+def span(name, **args):
+    """Returns a context which records the duration of a stage with the
+    active tracer (or does nothing if tracing is disabled)."""
+    if not TRACER.enabled:
+        return NULL_SPAN
+    return Span(TRACER, name, args)
+
+def enable_tracing(enabled=True):
+    """Enables (or disables) recording of spans by the active tracer and
+    returns the tracer."""
+    TRACER.enabled = enabled
+    return TRACER
@@ -5,6 +5,7 @@
 """
 
 import json
+import hashlib
 import numpy as np
 import math
 from enum import Enum
@@ -69,6 +70,12 @@ class Entity(object):
             # write json file
             return json.dump(self.to_dict(), file, *args, **kwargs)
 
+    def fingerprint(self):
+        """Returns a structural fingerprint of this entity computed from its
+        canonical (sorted-key) JSON serialization. Entities with identical
+        contents share the same fingerprint regardless of object identity."""
+        return get_fingerprint(self.to_dict())
+
     @classmethod
     def from_json(cls, json_doc):
         """Parses an entity from a JSON-formatted string, dictionary, or file."""
@@ -190,18 +197,22 @@ class QuantitativeRange(Entity):
 
     def __iter__(self):
         """Iterates values in this range."""
+        return iter(self.get_values())
+
+    def get_values(self):
+        """Returns the sequence of values in this range."""
         # if numberSteps specified, return linear space directly
         if self.numberSteps:
             # stepSize = (self.maxValue - self.minValue) / (self.numberSteps - 1)
-            return iter(np.linspace(self.minValue, self.maxValue, self.numberSteps))
+            return np.linspace(self.minValue, self.maxValue, self.numberSteps)
         # else if stepSize specified, compute appropriate number steps
         elif self.stepSize:
             numberSteps = 1 + math.floor((self.maxValue - self.minValue) / self.stepSize)
             maxValue = self.minValue + (numberSteps - 1)*self.stepSize
-            return iter(np.linspace(self.minValue, maxValue, numberSteps))
+            return np.linspace(self.minValue, maxValue, numberSteps)
         # otherwise return the end points
         else:
-            return iter([self.minValue, self.maxValue])
+            return (self.minValue, self.maxValue)
 
     @staticmethod
     def from_dict(d):
@@ -215,3 +226,46 @@ class QuantitativeRange(Entity):
                 numberSteps = d.get("numberSteps", None),
                 _id = d.get("@id", None)
             )
+
+def get_fingerprint(d):
+    """Returns the fingerprint (SHA-1 hex digest) of the canonical
+    (sorted-key) JSON serialization of a JSON-formatted dictionary."""
+    canonical = json.dumps(d, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+
+def get_values(value):
+    """Returns a tuple of the values of a design space axis which may be a
+    single value (including strings) or an iterable of values."""
+    if isinstance(value, str):
+        return (value,)
+    try:
+        return tuple(value)
+    except TypeError:
+        return (value,)
+
+def get_binomial(n, k):
+    """Returns the binomial coefficient (number of ways to choose k of n
+    items) as an exact integer (math.comb requires Python 3.8)."""
+    if k < 0 or k > n:
+        return 0
+    k = min(k, n - k)
+    value = 1
+    for i in range(1, k + 1):
+        value = value*(n - k + i)//i
+    return value
+
+def get_multiset(n, k, index):
+    """Returns the multiset of k of n items (a non-decreasing tuple of item
+    indices) at an index in the lexicographic order of
+    itertools.combinations_with_replacement without enumerating the
+    preceding multisets."""
+    selection, item = [], 0
+    for remaining in range(k, 0, -1):
+        # skip items while the index exceeds the multisets starting with it
+        while True:
+            count = get_binomial(n - item + remaining - 2, remaining - 1)
+            if index < count: break
+            index -= count
+            item += 1
+        selection.append(item)
+    return tuple(selection)
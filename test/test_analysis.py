@@ -6,6 +6,7 @@
 
 import unittest
 import json
+import numpy as np
 
 from tatc import *
 
@@ -35,3 +36,45 @@ class TestAnalysisSettings(unittest.TestCase):
 
 class TestSearchParameters(unittest.TestCase):
     pass #TODO
+
+class TestAnalysisOutputs(unittest.TestCase):
+    def test_from_json_basic(self):
+        o = AnalysisOutputs.from_json('{"obsTimeStep": 60, "cartesianStates": false, "timeRange": {"minValue": 0, "maxValue": 3600}, "region": {"latitude": {"minValue": 30, "maxValue": 40}, "longitude": 10}, "satellites": [0, 2]}')
+        self.assertEqual(o.obsTimeStep, 60)
+        self.assertTrue(o.keplerianStates)
+        self.assertFalse(o.cartesianStates)
+        self.assertIsInstance(o.timeRange, QuantitativeValue)
+        self.assertIsInstance(o.region, Region)
+        self.assertTrue(o.is_satellite_selected(2))
+        self.assertFalse(o.is_satellite_selected(1))
+        self.assertTrue(AnalysisOutputs().is_satellite_selected(1))
+
+    def test_get_time_indices(self):
+        times = np.arange(0, 100, 10.)
+        np.testing.assert_array_equal(AnalysisOutputs().get_time_indices(times), np.arange(10))
+        self.assertEqual(len(AnalysisOutputs(obsTimeStep=False).get_time_indices(times)), 0)
+        np.testing.assert_array_equal(AnalysisOutputs(obsTimeStep=30).get_time_indices(times), [0, 3, 6, 9])
+        np.testing.assert_array_equal(AnalysisOutputs(obsTimeStep=25).get_time_indices(times), [0, 3, 5, 8])
+        np.testing.assert_array_equal(AnalysisOutputs(obsTimeStep=20,
+            timeRange=QuantitativeValue(15, 65)).get_time_indices(times), [2, 4, 6])
+        # unspecified bounds are open
+        o = AnalysisOutputs.from_json('{"obsTimeStep": 60, "timeRange": {"maxValue": 3600}}')
+        np.testing.assert_array_equal(o.get_time_indices(np.arange(0, 7200, 10.)), np.arange(0, 361, 6))
+        np.testing.assert_array_equal(AnalysisOutputs(obsTimeStep=20,
+            timeRange=QuantitativeValue(65, None)).get_time_indices(times), [8])
+
+    def test_get_point_mask(self):
+        o = AnalysisOutputs(region=Region(latitude=QuantitativeValue(0, 10), longitude=5))
+        np.testing.assert_array_equal(o.get_point_mask([0, 5, 20, 5], [5, 5, 5, 6]), [True, True, False, False])
+        self.assertTrue(np.all(AnalysisOutputs().get_point_mask([0, 5], [0, 5])))
+
+    def test_get_period_mask(self):
+        periods = {"point": np.array([0, 1, 0]), "start": np.array([0., 50., 100.]),
+                   "end": np.array([10., 60., 110.])}
+        o = AnalysisOutputs(timeRange=QuantitativeValue(5, 55))
+        np.testing.assert_array_equal(o.get_period_mask(periods), [True, True, False])
+        np.testing.assert_array_equal(o.get_period_mask(periods, np.array([False, True])), [False, True, False])
+        o = AnalysisOutputs(timeRange=QuantitativeValue(55, None))
+        np.testing.assert_array_equal(o.get_period_mask(periods), [False, True, True])
+        o = AnalysisOutputs(region=Region(latitude=QuantitativeValue(None, 10)))
+        np.testing.assert_array_equal(o.get_point_mask([-80, 5, 20], [0, 0, 0]), [True, True, False])
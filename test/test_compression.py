@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Unit tests for tatc.compression module.
+"""
+
+import unittest
+import tempfile
+import shutil
+import gzip
+import csv
+import os
+
+import tatc.compression
+from tatc import *
+
+ROWS = [[i, "point-{:d}".format(i), i*0.5] for i in range(2000)]
+
+class TestCompression(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "access.csv")
+        self.frameSize = tatc.compression.FRAME_SIZE
+        tatc.compression.FRAME_SIZE = 1024
+
+    def tearDown(self):
+        tatc.compression.FRAME_SIZE = self.frameSize
+        shutil.rmtree(self.directory)
+
+    def write(self, compression, rows=ROWS, mode='w'):
+        with open_output(self.path, compression, mode) as outfile:
+            csv.writer(outfile).writerows(rows)
+        return find_output(self.path)
+
+    def test_get_codec(self):
+        self.assertIsNone(get_codec(None))
+        self.assertEqual(get_codec("gzip"), "gzip")
+        self.assertEqual(get_codec("zstd"), "zstd" if is_zstd_available() else "gzip")
+        with self.assertRaises(ValueError):
+            get_codec("lzma")
+
+    def test_uncompressed(self):
+        path = self.write(None)
+        self.assertEqual(path, self.path)
+        self.assertEqual("".join(iter_chunks(path)), open(path, newline='').read())
+
+    def test_gzip(self):
+        plain = open(self.write(None), newline='').read()
+        path = self.write("gzip")
+        self.assertEqual(path, self.path + ".gz")
+        # uncompressed variant is replaced
+        self.assertFalse(os.path.isfile(self.path))
+        # frames are valid gzip members of whole rows
+        self.assertEqual(gzip.open(path, 'rt', newline='').read(), plain)
+        chunks = list(iter_chunks(path))
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(chunk.endswith("\r\n") for chunk in chunks))
+        self.assertEqual("".join(chunks), plain)
+        self.assertEqual([[int(r[0]), r[1], float(r[2])] for r in csv.reader(open_input(path))], ROWS)
+
+    def test_flush(self):
+        with open_output(self.path, "gzip") as outfile:
+            outfile.write("a,\u00e9\r\nb,")
+            outfile.flush()
+            # sizes count encoded bytes and partial rows stay buffered
+            self.assertEqual(outfile.size, 2)
+            outfile.write("c\r\nd")
+            outfile.flush()
+        self.assertEqual(list(iter_chunks(self.path + ".gz")), ["a,\u00e9\r\n", "b,c\r\n", "d"])
+
+    def test_append(self):
+        self.write("gzip", ROWS[:1000])
+        path = self.write("gzip", ROWS[1000:], mode='a')
+        self.assertEqual(len(list(csv.reader(open_input(path)))), len(ROWS))
+        self.assertEqual(sum(chunk.count("\n") for chunk in iter_chunks(path)), len(ROWS))
+
+    def test_truncated(self):
+        path = self.write("gzip")
+        with open(path, 'rb') as infile:
+            data = infile.read()
+        with open(path, 'wb') as outfile:
+            outfile.write(data[:-10])
+        with self.assertRaises(EOFError):
+            list(iter_frames(path))
+
+    def test_remove_output(self):
+        self.write("gzip")
+        remove_output(self.path)
+        self.assertIsNone(find_output(self.path))
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Unit tests for tatc.cost module.
+"""
+
+import unittest
+import numpy as np
+
+from tatc import *
+
+def build_mission():
+    return MissionConcept(start="2017-08-01T00:00:00Z", duration="P1Y")
+
+def build_architecture(numberSatellites=1, techReadinessLevel=9, numberStations=1):
+    satellite = Satellite(name="Test", mass=500, power=400,
+        techReadinessLevel=techReadinessLevel,
+        payload=Instrument(mass=100, power=80, dataRate=50))
+    constellation = Constellation(constellationType="DELTA_HOMOGENOUS",
+        numberSatellites=numberSatellites, numberPlanes=1,
+        orbit=Orbit(orbitType="SUN_SYNCHRONOUS", altitude=705))
+    stations = [GroundStation(latitude=40, longitude=-105)]*numberStations
+    return Architecture(
+        constellation=constellation.generate_constellations([satellite])[0],
+        groundNetwork=GroundNetwork(groundStations=stations))
+
+class TestCostEstimatingRelationship(unittest.TestCase):
+    def test_evaluate(self):
+        cer = CostEstimatingRelationship("Test", [("x", 2., 2.), ("y", 1., 1.)], 3., 1.)
+        self.assertEqual(cer.evaluate({"x": [4., np.nan], "y": [1., 2.]}).tolist(), [13., 7.])
+
+class TestLearning(unittest.TestCase):
+    def test_unit_numbers(self):
+        units, numberUnits = get_unit_numbers([0, 1, 0, 0, 1])
+        self.assertEqual(units.tolist(), [1, 1, 2, 3, 2])
+        self.assertEqual(numberUnits.tolist(), [3, 2, 3, 3, 2])
+    def test_learning_factors(self):
+        factors = get_learning_factors([1, 2, 4], [5, 5, 5])
+        self.assertTrue(np.allclose(factors, [1, 0.95, 0.95**2]))
+        self.assertAlmostEqual(get_learning_factors([2], [20])[0], 0.90)
+
+class TestEstimateCosts(unittest.TestCase):
+    def test_single(self):
+        costs = estimate_costs(build_mission(), [build_architecture()]).to_dict(0)
+        for name in COST_ELEMENTS:
+            self.assertEqual(costs[name]["fiscalYear"], FISCAL_YEAR)
+            self.assertGreater(costs[name]["estimate"], 0)
+        self.assertAlmostEqual(costs["lifecycleCost"]["estimate"],
+            costs["nonRecurringCost"]["estimate"] + costs["recurringCost"]["estimate"])
+        self.assertAlmostEqual(costs["lifecycleCost"]["estimate"], sum(
+            costs[name]["estimate"] for name in ["hardwareCost", "iatCost",
+            "programCost", "groundCost", "launchCost", "operationsCost"]))
+        self.assertEqual(costs["operationsCost"]["standardError"], 0)
+        self.assertGreater(costs["hardwareCost"]["standardError"], 0)
+    def test_batch(self):
+        architectures = [build_architecture(n) for n in [1, 2, 4]]
+        batch = estimate_costs(build_mission(), architectures)
+        for i, architecture in enumerate(architectures):
+            single = estimate_costs(build_mission(), [architecture])
+            for name in COST_ELEMENTS:
+                self.assertAlmostEqual(batch.estimates[name][i], single.estimates[name][0])
+                self.assertAlmostEqual(batch.get_standard_error(name)[i],
+                                       single.get_standard_error(name)[0])
+        # non-recurring costs are incurred once per design
+        self.assertAlmostEqual(batch.estimates["nonRecurringCost"][0],
+                               batch.estimates["nonRecurringCost"][2])
+        # learning reduces the average recurring cost per unit
+        recurring = batch.estimates["recurringCost"] - batch.estimates["launchCost"] \
+            - batch.estimates["operationsCost"]
+        self.assertLess(recurring[2], 4*recurring[0])
+    def test_tech_readiness(self):
+        costs = estimate_costs(build_mission(),
+            [build_architecture(), build_architecture(techReadinessLevel=6)])
+        self.assertGreater(costs.estimates["nonRecurringCost"][1], costs.estimates["nonRecurringCost"][0])
+        self.assertAlmostEqual(costs.estimates["operationsCost"][1], costs.estimates["operationsCost"][0])
+    def test_empty(self):
+        costs = estimate_costs(build_mission(), [Architecture(constellation=Constellation())])
+        self.assertEqual(costs.to_dict(0)["hardwareCost"]["estimate"], 0)
+    def test_launch_costs(self):
+        launchers = [LaunchVehicle(name="A", massToLEO=1200, cost=5e6),
+                     LaunchVehicle(name="B", massToLEO=300, cost=1e6)]
+        architectures = [build_architecture(2), Architecture(constellation=Constellation())]
+        self.assertIsNone(get_launch_costs(architectures, []))
+        self.assertEqual(get_launch_costs(architectures, launchers).tolist(), [5e6, 0])
+        # satellites too heavy for any launch vehicle are estimated by mass
+        costs = get_launch_costs(architectures[:1], launchers[1:])
+        self.assertEqual(costs.tolist(), [2*500*LAUNCH_COST_PER_KG*COST_UNITS])
+        cost = estimate_cost(build_mission(), architectures[0], AnalysisCache(), launchers)
+        self.assertAlmostEqual(cost["launchCost"]["estimate"] - 5e6,
+            LOOS_WRAP*cost["hardwareCost"]["estimate"], 3)
+        self.assertNotEqual(cost, estimate_cost(build_mission(), architectures[0], AnalysisCache()))
+    def test_prepare(self):
+        cache = AnalysisCache(maxSize=10)
+        architectures = [build_architecture(n) for n in [1, 2]]
+        prepare_costs(build_mission(), architectures, cache)
+        self.assertEqual(cache.misses, 2)
+        estimate_cost(build_mission(), architectures[1], cache)
+        self.assertEqual(cache.hits, 1)
+
+if __name__ == '__main__':
+    unittest.main()
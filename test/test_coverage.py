@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Unit tests for tatc.coverage module.
+"""
+
+import unittest
+import numpy as np
+
+from tatc import *
+
+def build_mission():
+    return MissionConcept(start="2017-08-01T00:00:00Z", duration="P1D",
+        target=Region(latitude=QuantitativeValue(35, 45),
+                      longitude=QuantitativeValue(-115, -100)))
+
+def build_payload():
+    return [
+        Instrument(name="Basic", fieldOfView=60),
+        OpticalScanner(name="Optical", fieldOfView=FieldOfView(
+                sensorGeometry="RECTANGULAR", alongTrackFieldOfView=1,
+                crossTrackFieldOfView=40),
+            scanTechnique="PUSHBROOM", numberDetectorsAlongTrack=1,
+            numberDetectorsCrossTrack=1000, fNumber=4, focalLength=0.5,
+            operatingWavelength=10e-6, bandwidth=1e-6, quantumEfficiency=0.5,
+            opticalTransmissionFactor=0.8, numberReadOutElectrons=50,
+            targetBlackBodyTemp=290, bitsPerPixel=12, detectorWidth=30e-6),
+        SyntheticApertureRadar(name="Radar",
+            orientation=Orientation(convention="SIDE_LOOK", sideLookAngle=25),
+            pulseWidth=30e-6, antennaDimensionAlongTrack=2,
+            antennaDimensionCrossTrack=0.5, antennaApertureEfficiency=0.6,
+            operatingFrequency=1.25e9, peakTransmitPower=1000,
+            chirpBandwidth=20e6, minPulseRepetitionFrequency=1000,
+            maxPulseRepetitionFrequency=2000, sceneNoiseTemp=290,
+            systemNoiseFigure=2, radarLosses=3, thresholdSigmaNEZ0=0)
+    ]
+
+def build_analysis():
+    constellation = Constellation(constellationType="DELTA_HOMOGENOUS",
+        numberSatellites=2, numberPlanes=2,
+        orbit=Orbit(orbitType="SUN_SYNCHRONOUS", altitude=705))
+    constellation = constellation.generate_constellations(
+        [Satellite(name="Test", payload=build_payload())])[0]
+    return constellation, analyze_constellation(build_mission(), constellation)
+
+class TestRotation(unittest.TestCase):
+    def test_default(self):
+        self.assertTrue(np.allclose(get_rotation(Orientation()), np.eye(3)))
+    def test_side_look(self):
+        rotation = get_rotation(Orientation(convention="SIDE_LOOK", sideLookAngle=30))
+        boresight = np.dot(rotation, [0, 0, 1])
+        self.assertAlmostEqual(np.degrees(np.arccos(boresight[2])), 30)
+        self.assertAlmostEqual(boresight[1], 0)
+
+class TestFieldOfView(unittest.TestCase):
+    def setUp(self):
+        angles = np.radians([0, 10, 20])
+        self.direction = np.stack([np.sin(angles), np.zeros(3), np.cos(angles)], axis=1)
+    def test_conical(self):
+        mask = get_fov_mask(FieldOfView(fullConeAngle=30), Orientation(), self.direction)
+        self.assertEqual(mask.tolist(), [True, True, False])
+    def test_rectangular(self):
+        fieldOfView = FieldOfView(sensorGeometry="RECTANGULAR",
+            alongTrackFieldOfView=1, crossTrackFieldOfView=50)
+        mask = get_fov_mask(fieldOfView, Orientation(), self.direction)
+        self.assertEqual(mask.tolist(), [True, True, True])
+    def test_along_track_crossing(self):
+        # samples on either side of a narrow along-track field of view
+        angles = np.radians([-5, 5])
+        direction = np.stack([np.zeros(2), np.sin(angles), np.cos(angles)], axis=1)
+        fieldOfView = FieldOfView(sensorGeometry="RECTANGULAR",
+            alongTrackFieldOfView=1, crossTrackFieldOfView=50)
+        self.assertFalse(np.any(get_fov_mask(fieldOfView, Orientation(), direction)))
+        mask = get_fov_mask(fieldOfView, Orientation(), direction, np.array([0, 0]))
+        self.assertEqual(np.sum(mask), 1)
+        mask = get_fov_mask(fieldOfView, Orientation(), direction, np.array([0, 1]))
+        self.assertEqual(np.sum(mask), 0)
+
+class TestAnalyzeCoverage(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.constellation, cls.analysis = build_analysis()
+        cls.coverage = analyze_coverage(cls.analysis, cls.constellation.satellites)
+    def test_geometry(self):
+        geometry = self.coverage.geometry
+        access = self.analysis.satelliteAccess
+        self.assertTrue(len(geometry.time) > 0)
+        self.assertTrue(np.all(geometry.lookAngle <= geometry.incidenceAngle + 1e-6))
+        self.assertTrue(np.all(geometry.access < len(access)))
+        self.assertTrue(np.all((geometry.time >= access['start'][geometry.access])
+                               & (geometry.time <= access['end'][geometry.access])))
+    def test_kernels(self):
+        # basic sensor applies to all instruments, others only to their type
+        self.assertEqual(len(self.coverage.results["basic_sensor"]), 2*3)
+        self.assertEqual(len(self.coverage.results["optical_scanner"]), 2)
+        self.assertEqual(len(self.coverage.results["synthetic_aperture_radar"]), 2)
+    def test_results(self):
+        for name in KERNELS:
+            results = self.coverage.get_results(name, 0)
+            covered = results["coverage"]
+            self.assertTrue(np.any(covered))
+            for metric in KERNELS[name].metrics:
+                self.assertFalse(np.any(np.isnan(results[metric][covered])))
+        # accesses of all instruments of a satellite are numbered sequentially
+        results = self.coverage.get_results("basic_sensor", 0)
+        numberAccesses = np.count_nonzero(self.analysis.satelliteAccess['satellite'] == 0)
+        self.assertEqual(results["access"].tolist(), list(range(3*numberAccesses)))
+    def test_optical_metrics(self):
+        summary = self.coverage.get_global_metrics("optical_scanner")
+        self.assertTrue(summary["SignalToNoiseRatio"]["min"] > 1)
+        self.assertTrue(summary["CrossTrackResolution"]["min"] > 0)
+    def test_local_metrics(self):
+        numberPoints = len(self.analysis.points[0])
+        local = self.coverage.get_local_metrics("basic_sensor", numberPoints)
+        minimum, maximum, average = local["LookAngle"]
+        self.assertEqual(len(average), numberPoints)
+        valid = ~np.isnan(average)
+        self.assertTrue(np.all(minimum[valid] <= maximum[valid]))
+    def test_deployment(self):
+        deployed = self.coverage.get_global_metrics("basic_sensor", deployTimes=[0, np.inf])
+        rows = self.coverage.get_covered("basic_sensor", [0, np.inf])
+        self.assertFalse(any(np.any(covered) for r, covered in rows if r["satellite"] == 1))
+        full = self.coverage.get_global_metrics("basic_sensor")
+        self.assertGreaterEqual(deployed["LookAngle"]["min"], full["LookAngle"]["min"])
+
+if __name__ == '__main__':
+    unittest.main()
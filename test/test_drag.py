@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Unit tests for tatc.drag module.
+"""
+
+import unittest
+import numpy as np
+
+from tatc import *
+
+class TestDensity(unittest.TestCase):
+    def test_table(self):
+        altitudes = np.array([0, 150.5, 400, 705.25, 1000])
+        np.testing.assert_allclose(get_density(altitudes), get_model_density(altitudes), rtol=1e-9)
+        self.assertAlmostEqual(get_density(400)/3.725e-12, 1)
+    def test_clamped(self):
+        self.assertEqual(get_density(-10), get_density(0))
+        self.assertEqual(get_density(5000), get_density(DENSITY_TABLE_MAX))
+    def test_decreasing(self):
+        self.assertTrue(np.all(np.diff(get_density(np.arange(0, 1000, 10.))) < 0))
+
+class TestBallisticCoefficients(unittest.TestCase):
+    def test_coefficients(self):
+        satellites = [Satellite(mass=1000, volume=8), Satellite(mass=0, volume=8), Satellite()]
+        np.testing.assert_allclose(get_ballistic_coefficients(satellites),
+                                   [DRAG_COEFFICIENT*4/1000., 0, 0])
+    def test_state(self):
+        constellation = Constellation(constellationType="DELTA_HOMOGENOUS",
+            numberSatellites=4, numberPlanes=2, orbit=Orbit(altitude=400, inclination=50))
+        satellites = constellation.generate_constellations([Satellite(mass=100, volume=1)])[0].satellites
+        state = ConstellationState.from_satellites(satellites)
+        np.testing.assert_array_equal(get_ballistic_coefficients(state),
+                                      get_ballistic_coefficients(satellites))
+
+class TestDecay(unittest.TestCase):
+    def test_decay(self):
+        a0 = np.array([EARTH_RADIUS + 300, EARTH_RADIUS + 300, EARTH_RADIUS + 700])
+        times = np.arange(0, 86400 + 1, 60.)
+        a = decay_semimajor_axes(a0, np.array([0.02, 0, 0.02]), times)
+        self.assertEqual(a.shape, (3, len(times)))
+        np.testing.assert_array_equal(a[:, 0], a0)
+        self.assertTrue(np.all(np.diff(a[0]) < 0))
+        np.testing.assert_array_equal(a[1], a0[1])
+        # decay is faster at lower altitude
+        self.assertGreater(a0[0] - a[0, -1], a0[2] - a[2, -1])
+        # compare to the (constant density) rate at the initial altitude
+        self.assertAlmostEqual((a[0, -1] - a0[0])/(86400*get_decay_rate(a0[:1], 0.02)[0]), 1, 1)
+    def test_grid(self):
+        # decay does not depend on the simulation time step
+        a0 = np.array([EARTH_RADIUS + 300])
+        fine = decay_semimajor_axes(a0, np.array([0.02]), np.arange(0, 10*86400 + 1, 60.))
+        coarse = decay_semimajor_axes(a0, np.array([0.02]), np.arange(0, 10*86400 + 1, 7200.))
+        np.testing.assert_allclose(fine[:, ::120], coarse, rtol=1e-6)
+        self.assertTrue(np.all(np.diff(fine[0]) < 0))
+    def test_reentry(self):
+        a = decay_semimajor_axes(np.array([EARTH_RADIUS + 120]), np.array([1.]), np.arange(0, 86400, 60.))
+        self.assertEqual(a[0, -1], EARTH_RADIUS)
+
+if __name__ == '__main__':
+    unittest.main()
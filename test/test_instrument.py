@@ -33,3 +33,12 @@ class TestInstrument(unittest.TestCase):
         self.assertEqual(d.get("fieldOfView")["fullConeAngle"], 7.5)
         self.assertEqual(d.get("@type"), "Instrument")
         self.assertIsNone(d.get("@id"))
+    def test_defaults(self):
+        a, b = Instrument(), Instrument()
+        self.assertIsInstance(a.fieldOfView, FieldOfView)
+        self.assertIsNot(a.fieldOfView, b.fieldOfView)
+        self.assertIsNot(a.orientation, b.orientation)
+        self.assertIsNone(SyntheticApertureRadar().fieldOfView)
+        # an explicit None is kept
+        self.assertIsNone(Instrument(fieldOfView=None, orientation=None).fieldOfView)
+        self.assertIsNone(OpticalScanner(orientation=None).orientation)
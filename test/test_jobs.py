@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Unit tests for tatc.jobs module.
+"""
+
+import unittest
+import multiprocessing
+import tempfile
+import shutil
+import time
+import numpy as np
+
+from tatc import *
+
+def claim_all(directory):
+    """Claims and completes jobs until the queue is finished."""
+    queue = JobQueue(directory)
+    claimed = []
+    while not queue.is_finished():
+        for job in queue.claim(batchSize=2):
+            claimed.append(job.payload)
+            queue.complete(job)
+    return claimed
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    def test_claim(self):
+        queue = JobQueue(self.directory)
+        queue.put([{"archdir": "arch-0"}, {"archdir": "arch-1"}, {"archdir": "arch-2"}])
+        jobs = queue.claim("a", batchSize=2)
+        self.assertEqual([job.payload["archdir"] for job in jobs], ["arch-0", "arch-1"])
+        self.assertEqual([job.payload["archdir"] for job in queue.claim("b", batchSize=2)], ["arch-2"])
+        self.assertEqual(queue.claim("b"), [])
+        counts = queue.get_counts()
+        self.assertEqual(counts[LEASED], 3)
+        queue.complete(jobs[0], 1.5, "a", {"orbits": 1.5})
+        self.assertEqual(queue.get_counts()[DONE], 1)
+        self.assertEqual(queue.get_completed(), [(jobs[0].id, {"archdir": "arch-0"}, 1.5, {"orbits": 1.5}, 1)])
+        self.assertEqual([id for id, worker in queue.get_active()], [jobs[1].id, jobs[0].id + 2])
+        self.assertFalse(queue.is_finished())
+    def test_priority(self):
+        queue = JobQueue(self.directory)
+        ids = queue.put([0, 1, 2, 3], priorities=[1, 3, 2, 0])
+        self.assertEqual([job.payload for job in queue.claim(batchSize=3)], [1, 2, 0])
+        queue.put([4, 5], priorities=[2, 1])
+        queue.set_priorities({ids[3]: 4})
+        self.assertEqual([job.payload for job in queue.claim(batchSize=3)], [3, 4, 5])
+    def test_lease_expiry(self):
+        queue = JobQueue(self.directory, leaseDuration=0.05, maxAttempts=2)
+        queue.put(["a"])
+        self.assertEqual(queue.claim("w1")[0].attempts, 1)
+        self.assertEqual(queue.claim("w2"), [])
+        time.sleep(0.1)
+        job = queue.claim("w2")[0]
+        self.assertEqual(job.attempts, 2)
+        # a second expired lease exceeds the maximum number of attempts
+        time.sleep(0.1)
+        self.assertEqual(queue.get_counts()[FAILED], 1)
+    def test_renew(self):
+        queue = JobQueue(self.directory, leaseDuration=0.2)
+        queue.put(["a"])
+        jobs = queue.claim("w1")
+        time.sleep(0.1)
+        self.assertEqual(queue.renew(jobs, "w1"), 1)
+        self.assertEqual(queue.renew(jobs, "w2"), 0)
+        time.sleep(0.15)
+        self.assertEqual(queue.claim("w2"), [])
+    def test_lease_keeper(self):
+        queue = JobQueue(self.directory, leaseDuration=0.2, maxAttempts=1)
+        queue.put(["a", "b"])
+        jobs = queue.claim("w1", batchSize=2)
+        # jobs run longer than a lease while another worker tries to claim
+        with LeaseKeeper(queue, jobs, "w1") as keeper:
+            self.assertAlmostEqual(keeper.interval, 0.2/3)
+            for job in jobs:
+                end = time.time() + 0.5
+                while time.time() < end:
+                    self.assertEqual(queue.claim("w2"), [])
+                    time.sleep(0.02)
+                keeper.release(job)
+                queue.complete(job, worker="w1")
+        self.assertEqual(queue.get_counts()[DONE], 2)
+        self.assertEqual(queue.get_counts()[FAILED], 0)
+        self.assertEqual([job.attempts for job in jobs], [1, 1])
+        # leases of released jobs are no longer renewed
+        queue.put(["c"])
+        job = queue.claim("w1")[0]
+        with LeaseKeeper(queue, [job], "w1", interval=0.05) as keeper:
+            keeper.release(job)
+            time.sleep(0.3)
+            self.assertEqual(queue.get_counts()[FAILED], 1)
+    def test_fail(self):
+        queue = JobQueue(self.directory, maxAttempts=2)
+        queue.put(["a"])
+        queue.fail(queue.claim("w")[0], "error", "w")
+        self.assertEqual(queue.get_counts()[PENDING], 1)
+        queue.fail(queue.claim("w")[0], "error", "w")
+        self.assertEqual(queue.get_failures(), [("a", "error")])
+        queue.close()
+        self.assertTrue(queue.is_finished())
+    def test_runs(self):
+        queue = JobQueue(self.directory, maxAttempts=1)
+        queue.put(["a", "b"])
+        queue.fail(queue.claim("w")[0], "error", "w")
+        queue.close()
+        self.assertTrue(queue.is_closed())
+        self.assertEqual(queue.start(), 1)
+        # jobs and failures of the earlier run are ignored by the new run
+        self.assertFalse(queue.is_closed())
+        self.assertEqual(list(queue.get_counts().values()), [0, 0, 0, 0])
+        self.assertEqual(queue.get_failures(), [])
+        queue.put(["c"])
+        self.assertEqual([job.payload for job in queue.claim("w", batchSize=2)], ["c"])
+        self.assertFalse(queue.is_finished())
+        queue.close()
+        self.assertEqual(JobQueue(self.directory).get_counts()[LEASED], 1)
+        self.assertEqual(queue.start(), 2)
+    def test_workers(self):
+        queue = JobQueue(self.directory)
+        queue.put(list(range(40)))
+        queue.close()
+        pool = multiprocessing.Pool(4)
+        try:
+            claimed = pool.map(claim_all, [self.directory]*4)
+        finally:
+            pool.close()
+            pool.join()
+        self.assertEqual(sorted(sum(claimed, [])), list(range(40)))
+        self.assertEqual(queue.get_counts()[DONE], 40)
+        self.assertEqual([c[4] for c in queue.get_completed(30)], list(range(31, 41)))
+
+class TestCostEstimator(unittest.TestCase):
+    def test_features(self):
+        constellation = Constellation(constellationType="DELTA_HOMOGENOUS",
+            numberSatellites=4, numberPlanes=2, orbit=Orbit(orbitType="SUN_SYNCHRONOUS", altitude=705))
+        constellation = constellation.generate_constellations([Satellite(name="Test")])[0]
+        network = GroundNetwork(groundStations=[GroundStation(latitude=0, longitude=0)]*3)
+        features = get_job_features(Architecture(constellation=constellation,
+            groundNetwork=network), 100, 2)
+        self.assertEqual(features.tolist(), [1, 4, 8, 800, 24])
+        numberPoints, days = get_mission_features(MissionConcept(start="2017-08-01T00:00:00Z", duration="P2D"))
+        self.assertEqual(days, 2)
+        self.assertGreater(numberPoints, 0)
+    def test_prior(self):
+        estimator = CostEstimator()
+        small, large = estimator.estimate([[1, 1, 1, 100, 1], [1, 10, 10, 1000, 10]])
+        self.assertLess(small, large)
+        # a few observations scale the prior model
+        estimator.observe([1, 1, 1, 100, 1], {"orbits": 2*small})
+        self.assertAlmostEqual(estimator.estimate([1, 10, 10, 1000, 10]), 2*large)
+    def test_learn(self):
+        coefficients = np.array([0.1, 0., 0.02, 1e-4, 0.])
+        features = np.array([[1, n, n*d, n*p*d, n*g*d] for n in [1, 2, 5, 10]
+                             for d in [1, 3] for p in [50, 200] for g in [1, 4]], dtype=float)
+        estimator = CostEstimator()
+        for f in features:
+            estimator.observe(f, {"orbits": np.dot(f, coefficients), "launch": 0.01})
+        self.assertTrue(np.allclose(estimator.coefficients["orbits"], coefficients, atol=1e-9))
+        self.assertTrue(np.allclose(estimator.estimate(features), np.dot(features, coefficients) + 0.01))
+    def test_makespan(self):
+        self.assertEqual(get_makespan([5, 1, 1, 1, 1, 1], 2), 5)
+        self.assertEqual(get_makespan([3, 3, 2, 2, 2], 2), 7)
+        self.assertEqual(get_makespan([1, 2], 0), 3)
+        self.assertEqual(CostEstimator().get_eta([], 4), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Unit tests for tatc.manifest module.
+"""
+
+import unittest
+import numpy as np
+
+from tatc import *
+
+def build_launchers():
+    return [
+        LaunchVehicle(name="Small", payloadMass=300, payloadVolume=4, cost=10, reliability=0.9),
+        LaunchVehicle(name="Large", massToLEO=1000, cost=25, reliability=0.95)
+    ]
+
+def build_satellites(numberSatellites=6, numberPlanes=2, mass=200, volume=1):
+    constellation = Constellation(constellationType="DELTA_HOMOGENOUS",
+        numberSatellites=numberSatellites, numberPlanes=numberPlanes,
+        orbit=Orbit(orbitType="SUN_SYNCHRONOUS", altitude=705))
+    return constellation.generate_constellations(
+        [Satellite(name="Test", mass=mass, volume=volume)])[0].satellites
+
+def get_cost(bins, capacities):
+    return sum(capacities[2][vehicle] for vehicle, indices in bins)
+
+class TestPlanes(unittest.TestCase):
+    def test_planes(self):
+        elements = get_orbital_elements(build_satellites(6, 3))
+        self.assertEqual(get_planes(elements).tolist(), [0, 0, 1, 1, 2, 2])
+
+class TestPacking(unittest.TestCase):
+    def setUp(self):
+        self.capacities = get_vehicle_capacities(build_launchers())
+    def test_capacities(self):
+        mass, volume, cost = self.capacities
+        self.assertEqual(mass.tolist(), [300, 1000])
+        self.assertEqual(volume.tolist(), [4, np.inf])
+        self.assertEqual(get_cheapest_vehicle(self.capacities, 250, 5), 1)
+        self.assertEqual(get_cheapest_vehicle(self.capacities, 2000, 1), -1)
+    def test_first_fit(self):
+        items = (np.full(5, 200.), np.ones(5))
+        bins = pack_first_fit(items, self.capacities)
+        self.assertEqual(sorted(i for vehicle, indices in bins for i in indices), list(range(5)))
+        for vehicle, indices in bins:
+            self.assertLessEqual(np.sum(items[0][indices]), self.capacities[0][vehicle])
+    def test_exact(self):
+        rng = np.random.default_rng(0)
+        for trial in range(50):
+            items = (rng.uniform(50, 400, 6), rng.uniform(0.5, 3, 6))
+            heuristic = pack_first_fit(items, self.capacities)
+            exact = pack_branch_and_bound(items, self.capacities)
+            self.assertLessEqual(get_cost(exact, self.capacities), get_cost(heuristic, self.capacities))
+            self.assertEqual(sorted(i for vehicle, indices in exact for i in indices), list(range(6)))
+            for vehicle, indices in exact:
+                self.assertLessEqual(np.sum(items[0][indices]), self.capacities[0][vehicle] + 1e-9)
+                self.assertLessEqual(np.sum(items[1][indices]), self.capacities[1][vehicle] + 1e-9)
+
+class TestPlanLaunches(unittest.TestCase):
+    def test_manifest(self):
+        manifest = plan_launches(build_satellites(6, 2), build_launchers(), cache=None)
+        # each plane of three 200 kg satellites fits one large launch
+        self.assertEqual(len(manifest.launches), 2)
+        self.assertEqual(manifest.get_cost(), 50)
+        self.assertAlmostEqual(manifest.get_reliability(), 0.95**2)
+        self.assertEqual(sorted(launch.plane for launch in manifest.launches), [0, 1])
+        for launch in manifest.launches:
+            self.assertEqual(len(launch.satellites), 3)
+        self.assertEqual(manifest.to_list()[0]["name"], "Large")
+    def test_state(self):
+        satellites = build_satellites(6, 2)
+        state = ConstellationState.from_satellites(satellites)
+        np.testing.assert_array_equal(get_satellite_values(state, "mass"), np.full(6, 200.))
+        manifest = plan_launches(state, build_launchers(), cache=None)
+        self.assertEqual(manifest.to_list(), plan_launches(satellites, build_launchers(),
+                                                           cache=None).to_list())
+    def test_unassigned(self):
+        manifest = plan_launches(build_satellites(2, 1, mass=5000), build_launchers(), cache=None)
+        self.assertEqual(manifest.launches, [])
+        self.assertEqual(manifest.unassigned, [0, 1])
+    def test_memoized(self):
+        cache = AnalysisCache()
+        first = plan_launches(build_satellites(6, 2), build_launchers(), cache=cache)
+        second = plan_launches(build_satellites(6, 2), build_launchers(), cache=cache)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual([l.satellites for l in first.launches],
+                         [l.satellites for l in second.launches])
+
+class TestScheduleLaunches(unittest.TestCase):
+    def setUp(self):
+        self.epoch = parse_epoch("2017-08-01T00:00:00Z")
+        self.launchers = build_launchers()
+        self.launchers[1].meanTimeBetweenLaunches = "P30D"
+    def test_schedule(self):
+        manifest = plan_launches(build_satellites(6, 2), self.launchers, cache=None)
+        schedule = schedule_launches(manifest, 6, self.epoch)
+        # both launches use the large vehicle so occur sequentially
+        self.assertEqual(sorted(schedule.launchTimes.tolist()), [0, 30*86400])
+        self.assertEqual(schedule.get_operational_time(), 30*86400)
+        self.assertEqual(schedule.get_phases(), [(0, 3), (30*86400, 6)])
+        for k, launch in enumerate(manifest.launches):
+            self.assertTrue(np.all(schedule.deployTimes[launch.satellites] == schedule.launchTimes[k]))
+    def test_unassigned(self):
+        manifest = plan_launches(build_satellites(2, 1, mass=5000), self.launchers, cache=None)
+        schedule = schedule_launches(manifest, 2, self.epoch)
+        self.assertEqual(schedule.get_operational_time(), np.inf)
+        self.assertIsNone(schedule.to_dict()["operationalTime"])
+        self.assertEqual(schedule.get_phases(), [])
+
+if __name__ == '__main__':
+    unittest.main()
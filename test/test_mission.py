@@ -151,6 +151,97 @@ class TestDesignSpace(unittest.TestCase):
         self.assertEqual(d.get("groundStations")[0].get("@type"), "GroundStation")
         self.assertEqual(d.get("groundStations")[1].get("@type"), "GroundStation")
 
+    def test_generate_architectures(self):
+        o = DesignSpace(
+            constellations=Constellation(constellationType="DELTA_HOMOGENOUS",
+                numberSatellites=[1,2], orbit=Orbit(altitude=500, inclination=50)),
+            satellites=Satellite(),
+            groundNetworks=GroundNetwork(numberStations=1),
+            groundStations=[GroundStation(latitude=0, longitude=0),
+                            GroundStation(latitude=10, longitude=10),
+                            GroundStation(latitude=20, longitude=20)])
+        architectures = list(o.generate_architectures())
+        self.assertEqual(len(architectures), 2*3)
+        for architecture in architectures:
+            self.assertIsInstance(architecture.constellation, Constellation)
+            self.assertIsInstance(architecture.groundNetwork, GroundNetwork)
+            self.assertEqual(len(architecture.groundNetwork.groundStations), 1)
+        # network variants of one constellation are enumerated consecutively
+        keys = [architecture.constellation.fingerprint() for architecture in architectures]
+        self.assertEqual(len(set(keys[0:3])), 1)
+        self.assertEqual(len(set(keys[3:6])), 1)
+
+    def test_compile(self):
+        o = DesignSpace(
+            constellations=Constellation(constellationType="DELTA_HOMOGENOUS",
+                numberSatellites=[1,2], numberPlanes=[1,2],
+                orbit=Orbit(orbitType="SUN_SYNCHRONOUS", altitude=[500, 600])),
+            satellites=[Satellite(name="A"), Satellite(name="B")],
+            groundNetworks=GroundNetwork(numberStations=1),
+            groundStations=[GroundStation(latitude=0, longitude=0),
+                            GroundStation(latitude=10, longitude=10)])
+        plan = o.compile()
+        architectures = plan.generate_architectures()
+        self.assertEqual(plan.count(), len(architectures))
+        self.assertEqual(plan.count(), (1 + 2)*2*2*2)
+        self.assertEqual(plan.get_bounds(), (1, 2, 2, 1, 2, 2, 2))
+        # genomes decode to the enumerated architectures
+        keys = set(architecture.fingerprint() for architecture in architectures)
+        architecture = plan.decode((0, 1, 1, 0, 1, 1, 1))
+        self.assertIn(architecture.fingerprint(), keys)
+        self.assertEqual(architecture.constellation.numberPlanes, 2)
+        self.assertEqual(architecture.constellation.satellites[0].name, "B")
+        # two planes are not valid for one satellite
+        self.assertIsNone(plan.decode((0, 0, 1, 0, 0, 0, 0)))
+        self.assertIsNone(plan.decode((0, 0, 0, 0, 0, 0, 2)))
+        # heterogeneous selections decode in enumeration order
+        o.constellations[0].constellationType = ConstellationType.DELTA_HETEROGENEOUS
+        plan = o.compile()
+        keys = [architecture.fingerprint() for architecture in plan.generate_architectures()]
+        self.assertEqual(plan.decode((0, 1, 1, 0, 1, 2, 1)).fingerprint(), keys[-1])
+        self.assertIsNone(plan.decode((0, 1, 1, 0, 1, 3, 1)))
+
+    def test_sample_architectures(self):
+        o = DesignSpace(
+            constellations=Constellation(constellationType="DELTA_HOMOGENOUS",
+                numberSatellites=[1,2], numberPlanes=[1,2],
+                orbit=Orbit(orbitType="SUN_SYNCHRONOUS", altitude=[500, 600])),
+            satellites=[Satellite(name="A"), Satellite(name="B")],
+            groundNetworks=GroundNetwork(numberStations=1),
+            groundStations=[GroundStation(latitude=0, longitude=0),
+                            GroundStation(latitude=10, longitude=10)])
+        plan = o.compile()
+        keys = set(architecture.fingerprint() for architecture in plan.generate_architectures())
+        samples = [architecture.fingerprint() for architecture in plan.sample_architectures(8, seed=0)]
+        self.assertEqual(len(samples), 8)
+        self.assertEqual(len(set(samples)), 8)
+        self.assertTrue(set(samples) <= keys)
+        # samples are reproducible and limited to the size of the design space
+        self.assertEqual(samples, [architecture.fingerprint()
+                                   for architecture in o.sample_architectures(8, seed=0)])
+        self.assertEqual(len(list(plan.sample_architectures(100, seed=0))), len(keys))
+
+    def test_sample_architectures_continuous(self):
+        o = DesignSpace(
+            constellations=Constellation(constellationType="DELTA_HOMOGENOUS",
+                numberSatellites=[1,2,3,4], orbit=Orbit(orbitType="SUN_SYNCHRONOUS",
+                altitude=QuantitativeRange(500, 800, stepSize=100))),
+            satellites=Satellite(),
+            groundNetworks=GroundNetwork(numberStations=1),
+            groundStations=GroundStation(latitude=0, longitude=0))
+        plan = o.compile()
+        self.assertTrue(plan.is_continuous())
+        architectures = list(plan.sample_architectures(32, seed=1))
+        self.assertEqual(len(architectures), 32)
+        altitudes = [architecture.constellation.orbit.altitude for architecture in architectures]
+        self.assertTrue(all(500 <= altitude <= 800 for altitude in altitudes))
+        # any power-of-two prefix places one altitude in each interval
+        for n in (4, 8, 16):
+            self.assertEqual(len(set(int((altitude - 500)/300.*n) for altitude in altitudes[:n])), n)
+        for architecture in architectures:
+            self.assertEqual(architecture.constellation.orbit.inclination,
+                             Orbit.get_sso_inclination(architecture.constellation.orbit.altitude))
+
     class TestArchitecture(unittest.TestCase):
         def test_from_json_basic(self):
             o = Architecture.from_json('{"constellation": {"@type": "Constellation"}, "groundNetwork": {"@type": "GroundNetwork"}}')
@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Unit tests for tatc.orbits module.
+"""
+
+import unittest
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+
+from tatc import *
+
+def build_mission():
+    return MissionConcept(start="2017-08-01T00:00:00Z", duration="P1D",
+        target=Region(latitude=QuantitativeValue(35, 45),
+                      longitude=QuantitativeValue(-115, -100)))
+
+def build_constellation(numberSatellites=2, numberPlanes=2):
+    constellation = Constellation(constellationType="DELTA_HOMOGENOUS",
+        numberSatellites=numberSatellites, numberPlanes=numberPlanes,
+        orbit=Orbit(orbitType="SUN_SYNCHRONOUS", altitude=705))
+    return constellation.generate_constellations(
+        [Satellite(name="Test", payload=Instrument(fieldOfView=60))])[0]
+
+class TestFindIntervals(unittest.TestCase):
+    def test_intervals(self):
+        times = np.arange(6)*10.
+        visible = np.array([[0, 1], [1, 1], [1, 0], [0, 0], [1, 0], [1, 1]], dtype=bool)
+        column, start, end = find_intervals(visible, times)
+        self.assertEqual(column.tolist(), [0, 0, 1, 1])
+        self.assertEqual(start.tolist(), [10., 40., 0., 50.])
+        self.assertEqual(end.tolist(), [30., 50., 20., 50.])
+    def test_empty(self):
+        column, start, end = find_intervals(np.zeros((5, 3), dtype=bool), np.arange(5.))
+        self.assertEqual(len(column), 0)
+
+class TestGeneratePoints(unittest.TestCase):
+    def test_region(self):
+        lat, lon = generate_points(Region(QuantitativeValue(35, 45), QuantitativeValue(-115, -100)), 5)
+        self.assertEqual(len(lat), 3*4)
+        self.assertEqual(lat.min(), 35)
+        self.assertEqual(lon.max(), -100)
+    def test_global(self):
+        lat, lon = generate_points(GLOBAL_REGION, 10)
+        self.assertEqual(len(lat), 19*36)
+
+class TestPropagate(unittest.TestCase):
+    def test_circular_radius(self):
+        elements = get_orbital_elements(build_constellation().satellites)
+        times = np.arange(0, 6000, 60.)
+        position, velocity = propagate(elements, times, parse_epoch("2017-08-01T00:00:00Z"))
+        self.assertEqual(position.shape, (2, len(times), 3))
+        self.assertTrue(np.allclose(np.linalg.norm(position, axis=-1), Orbit.get_semimajor_axis(705)))
+        self.assertTrue(np.allclose(np.linalg.norm(velocity, axis=-1),
+            np.sqrt(EARTH_MU/Orbit.get_semimajor_axis(705))))
+
+class TestTimeBase(unittest.TestCase):
+    def test_time_base(self):
+        epoch = parse_epoch("2017-08-01T00:00:00Z")
+        timeBase = TimeBase(epoch, 86400., 60.)
+        self.assertEqual(len(timeBase.times), 1441)
+        np.testing.assert_array_equal(timeBase.gmst, get_gmst(epoch, timeBase.times))
+        self.assertFalse(timeBase.times.flags.writeable)
+        # the Sun ephemeris is only computed when read
+        self.assertIsNone(timeBase._sun)
+        self.assertTrue(timeBase.sunFixed.flags.c_contiguous)
+        np.testing.assert_allclose(np.linalg.norm(timeBase.sun, axis=1), 1)
+        np.testing.assert_allclose(np.linalg.norm(timeBase.sunFixed, axis=1), 1)
+        # near the northern summer solstice: declination about 18 deg on August 1
+        self.assertAlmostEqual(np.degrees(np.arcsin(timeBase.sun[0, 2])), 18, delta=0.5)
+        self.assertAlmostEqual(timeBase.sunDistance[0], 1.015, delta=0.001)
+        self.assertIs(timeBase.sun, timeBase.get_sun()[0])
+        self.assertFalse(timeBase.sunFixed.flags.writeable)
+        cos, sin = timeBase.get_rotation([0, 10])
+        self.assertEqual(cos[1], timeBase.cosGmst[10])
+    def test_eclipses(self):
+        timeBase = TimeBase(parse_epoch("2017-08-01T00:00:00Z"), 60., 60.)
+        radius = EARTH_RADIUS + 700
+        positions = np.array([radius*timeBase.sunFixed, -radius*timeBase.sunFixed])
+        eclipses = timeBase.get_eclipses(positions)
+        self.assertEqual(eclipses.shape, (2, 2))
+        self.assertFalse(np.any(eclipses[0]))
+        self.assertTrue(np.all(eclipses[1]))
+    def test_shared(self):
+        mission = build_mission()
+        cache = AnalysisCache()
+        first = get_time_base(mission, 60., cache=cache)
+        self.assertIs(get_time_base(build_mission(), 60., cache=cache), first)
+        self.assertIsNot(get_time_base(mission, 30., cache=cache), first)
+        self.assertEqual(get_mission_period(mission), (parse_epoch(mission.start), 86400.))
+        analysis = analyze_constellation(mission, build_constellation(), cache=None)
+        other = analyze_constellation(mission, build_constellation(4, 2), cache=None)
+        self.assertIs(analysis.timeBase, other.timeBase)
+        self.assertIs(analysis.times, analysis.timeBase.times)
+        self.assertIsNone(analysis.timeBase._sun)
+
+class TestAnalyzeConstellation(unittest.TestCase):
+    def test_access(self):
+        analysis = analyze_constellation(build_mission(), build_constellation(), cache=None)
+        self.assertEqual(analysis.positions.shape[0], 2)
+        self.assertGreater(len(analysis.satelliteAccess), 0)
+        self.assertGreater(len(analysis.access), 0)
+        self.assertTrue(np.all(analysis.access['end'] >= analysis.access['start']))
+        self.assertTrue(np.all(analysis.access['satellite'] == -1))
+    def test_states(self):
+        analysis = analyze_constellation(build_mission(), build_constellation(), cache=None)
+        indices = np.arange(0, len(analysis.times), 7)
+        np.testing.assert_array_equal(get_keplerian_states(analysis, 1, indices),
+                                      get_keplerian_states(analysis, 1)[indices])
+        np.testing.assert_allclose(get_cartesian_states(analysis, 1, indices),
+                                   get_cartesian_states(analysis, 1)[indices])
+    def test_local_points(self):
+        analysis = analyze_constellation(build_mission(), build_constellation(), cache=None)
+        points = analysis.points[0] >= 40
+        local = get_local_metrics(analysis)
+        selected = get_local_metrics(analysis, points)
+        for key in local:
+            np.testing.assert_array_equal(selected[key], local[key][points])
+    def test_drag(self):
+        mission = build_mission()
+        constellation = build_constellation()
+        for satellite in constellation.satellites:
+            satellite.mass, satellite.volume = 100., 1.
+        analysis = analyze_constellation(mission, constellation, cache=None)
+        self.assertIsNone(analysis.semimajorAxes)
+        decayed = analyze_constellation(mission, constellation, cache=None, drag=True)
+        self.assertEqual(decayed.semimajorAxes.shape, decayed.positions.shape[:2])
+        self.assertTrue(np.all(decayed.semimajorAxes[:, -1] < decayed.elements[:, 0]))
+        np.testing.assert_allclose(np.linalg.norm(decayed.positions, axis=-1),
+                                   decayed.semimajorAxes)
+        states = get_keplerian_states(decayed, 0)
+        np.testing.assert_array_equal(states[:, 3], decayed.semimajorAxes[0])
+        indices = np.arange(0, len(decayed.times), 7)
+        np.testing.assert_array_equal(get_keplerian_states(decayed, 0, indices), states[indices])
+        self.assertNotEqual(get_constellation_key(mission, constellation),
+                            get_constellation_key(mission, constellation, drag=True))
+    def test_memoized(self):
+        cache = AnalysisCache()
+        mission = build_mission()
+        first = analyze_constellation(mission, build_constellation(), cache=cache)
+        second = analyze_constellation(mission, build_constellation(), cache=cache)
+        self.assertIs(first, second)
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.hits, 1)
+    def test_sidecar(self):
+        mission = build_mission()
+        analysis = analyze_constellation(mission, build_constellation(), cache=None)
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'orbits.bin')
+            key = get_constellation_key(mission, build_constellation())
+            self.assertFalse(has_constellation_analysis(path, key))
+            save_constellation_analysis(analysis, path, key)
+            self.assertTrue(has_constellation_analysis(path, key))
+            self.assertFalse(has_constellation_analysis(path, key + (True,)))
+            loaded = analyze_constellation(mission, build_constellation(),
+                cache=AnalysisCache(), sidecar=path)
+            self.assertIsInstance(loaded.positions, np.memmap)
+            self.assertEqual(loaded.epoch, analysis.epoch)
+            self.assertEqual(loaded.access.tolist(), analysis.access.tolist())
+            self.assertTrue(np.array_equal(loaded.positions, analysis.positions))
+            self.assertIs(loaded.timeBase, analysis.timeBase)
+            # sidecar written for other inputs is not reused
+            other = analyze_constellation(mission, build_constellation(numberSatellites=1,
+                numberPlanes=1), cache=None, sidecar=path)
+            self.assertNotIsInstance(other.positions, np.memmap)
+        finally:
+            shutil.rmtree(directory)
+    def test_cache_bounded(self):
+        cache = AnalysisCache(maxSize=1)
+        cache.get("a", lambda: 1)
+        cache.get("b", lambda: 2)
+        self.assertEqual(cache.get("a", lambda: 3), 3)
+        self.assertEqual(cache.misses, 3)
+
+class TestAnalyzeNetwork(unittest.TestCase):
+    def test_network_variants(self):
+        cache = AnalysisCache()
+        mission = build_mission()
+        stations = [GroundStation(latitude=40.6, longitude=-104.8),
+                    GroundStation(latitude=64.8, longitude=-147.7)]
+        results = []
+        for network in GroundNetwork(numberStations=1).generate_networks(stations):
+            analysis = analyze_constellation(mission, build_constellation(), cache=cache)
+            results.append(get_global_metrics(analyze_network(analysis, network)))
+        self.assertEqual(cache.misses, 1)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(results[0]["AccessTime"], results[1]["AccessTime"])
+        json.dumps(results)
+    def test_no_stations(self):
+        analysis = analyze_constellation(build_mission(), build_constellation(), cache=None)
+        metrics = get_global_metrics(analyze_network(analysis, None))
+        self.assertEqual(metrics["NumGSpassesPD"], 0)
+
+class TestMergeIntervals(unittest.TestCase):
+    def test_merge(self):
+        records = np.array([(0, 0, 0., 10.), (0, 1, 5., 20.), (0, 1, 30., 40.),
+                            (1, 0, 0., 10.), (0, 2, 20., 25.)], dtype=CONTACT_DTYPE)
+        merged = merge_intervals(records, 'satellite')
+        self.assertEqual(merged['satellite'].tolist(), [0, 0, 1])
+        self.assertEqual(merged['start'].tolist(), [0., 30., 0.])
+        self.assertEqual(merged['end'].tolist(), [25., 40., 10.])
+        self.assertTrue(np.all(merged['station'] == -1))
+    def test_empty(self):
+        self.assertEqual(len(merge_intervals(np.zeros(0, dtype=CONTACT_DTYPE), 'satellite')), 0)
+
+class TestConstellationState(unittest.TestCase):
+    def test_elements(self):
+        constellation = build_constellation(6, 3)
+        state = ConstellationState.from_satellites(constellation.satellites)
+        self.assertTrue(np.allclose(get_orbital_elements(state),
+                                    get_orbital_elements(constellation.satellites), rtol=1e-12))
+        self.assertEqual(get_payload_half_angles(state), [30.]*6)
+    def test_analysis(self):
+        constellation = build_constellation(4, 2)
+        state = Constellation(constellationType="DELTA_HOMOGENOUS", numberSatellites=4,
+            numberPlanes=2, orbit=constellation.orbit, satellites=constellation.get_state())
+        expected = analyze_constellation(build_mission(), constellation, cache=None)
+        analysis = analyze_constellation(build_mission(), state, cache=None)
+        self.assertEqual(analysis.access.tolist(), expected.access.tolist())
+
+class TestAnalyzeDeployment(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.analysis = analyze_constellation(build_mission(), build_constellation(4, 2), cache=None)
+    def test_full_deployment(self):
+        phases = analyze_deployment(self.analysis, np.zeros(4))
+        self.assertEqual(len(phases), 1)
+        self.assertEqual(phases[0].access.tolist(), self.analysis.access.tolist())
+    def test_incremental(self):
+        deployTimes = np.array([0., 0., 21600., np.inf])
+        phases = analyze_deployment(self.analysis, deployTimes)
+        self.assertEqual([phase.time for phase in phases], [0., 21600.])
+        self.assertEqual([len(phase.satellites) for phase in phases], [2, 3])
+        # incremental updates match merging all deployed access at once
+        expected = merge_intervals(clip_access(self.analysis.satelliteAccess, deployTimes), 'point')
+        self.assertEqual(phases[-1].access.tolist(), expected.tolist())
+        self.assertTrue(np.all(clip_access(self.analysis.satelliteAccess, deployTimes)['satellite'] != 3))
+        metrics = get_deployment_metrics(self.analysis, phases)
+        self.assertLessEqual(metrics[0]["Coverage"], metrics[1]["Coverage"])
+        self.assertEqual(metrics[1]["numberSatellites"], 3)
+
+class TestStationContacts(unittest.TestCase):
+    def test_reused_across_networks(self):
+        analysis = analyze_constellation(build_mission(), build_constellation(), cache=None)
+        stations = [GroundStation(latitude=40.6, longitude=-104.8),
+                    GroundStation(latitude=64.8, longitude=-147.7),
+                    GroundStation(latitude=-35.4, longitude=149.0),
+                    GroundStation(latitude=78.2, longitude=15.4)]
+        networks = GroundNetwork(numberStations=2).generate_networks(stations)
+        self.assertEqual(len(networks), 6)
+        for network in networks:
+            result = analyze_network(analysis, network)
+            # merged contacts match direct visibility of any member station
+            positions = analysis.positions
+            units = get_unit_vectors([i.latitude for i in network.groundStations],
+                                     [i.longitude for i in network.groundStations])
+            for s in range(len(positions)):
+                radius = np.linalg.norm(positions[s], axis=-1)
+                visible = np.any(np.dot(positions[s]/radius[:, np.newaxis], units.T)
+                    >= np.cos(get_access_angle(radius, minElevation=DEFAULT_MIN_ELEVATION))[:, np.newaxis], axis=1)
+                column, start, end = find_intervals(visible[:, np.newaxis], analysis.times)
+                contacts = result.contacts[result.contacts['satellite'] == s]
+                self.assertEqual(contacts['start'].tolist(), start.tolist())
+                self.assertEqual(contacts['end'].tolist(), end.tolist())
+        self.assertEqual(len(analysis.stationContacts), len(stations))
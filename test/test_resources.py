@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Unit tests for tatc.resources module.
+"""
+
+import sys
+import subprocess
+import unittest
+
+from tatc import *
+import tatc
+
+# maximum time (s) to import tatc in a new process after its dependencies
+# (numpy), about twice the measured time
+IMPORT_BUDGET = 0.2
+
+class TestResources(unittest.TestCase):
+    def test_networks(self):
+        self.assertEqual(tatc.DSN.acronym, "DSN")
+        self.assertIsInstance(tatc.NENcom, GroundNetwork)
+        self.assertEqual(len(tatc.NENall.groundStations),
+                         len(tatc.NENcom.groundStations) + len(tatc.NENgov.groundStations))
+    def test_cached(self):
+        from tatc.resources import NENall
+        self.assertIs(NENall, tatc.NENall)
+        self.assertIs(tatc.resources.DSN, tatc.DSN)
+    def test_missing(self):
+        with self.assertRaises(AttributeError):
+            tatc.resources.NEN
+        with self.assertRaises(AttributeError):
+            tatc.NEN
+
+class TestImport(unittest.TestCase):
+    def test_import_time(self):
+        # best of several runs in new processes to limit timing noise
+        script = ("import sys, time, numpy; t = time.perf_counter(); import tatc; "
+                  "print(time.perf_counter() - t); "
+                  "print('isodate' in sys.modules or 'DSN' in vars(tatc.resources))")
+        times = []
+        for i in range(3):
+            output = subprocess.check_output([sys.executable, "-c", script],
+                                             universal_newlines=True).split()
+            self.assertEqual(output[1], "False")
+            times.append(float(output[0]))
+        self.assertLess(min(times), IMPORT_BUDGET)
+    def test_star_import(self):
+        # star imports neither load resources and lazy modules nor bind
+        # modules imported by tatc
+        script = ("import sys; from tatc import *; import tatc; "
+                  "print('isodate' in sys.modules or 'DSN' in vars(tatc.resources)); "
+                  "print(sorted(set(['os', 'json', 'np', 'time', 'DSN', 'LAZY_MODULES']) & set(dir()))); "
+                  "print(tatc.DSN.acronym, tatc.isodate.__name__, TradespaceSearch.__name__)")
+        output = subprocess.check_output([sys.executable, "-c", script],
+                                         universal_newlines=True).splitlines()
+        self.assertEqual(output, ["False", "[]", "DSN isodate TradespaceSearch"])
+
+if __name__ == '__main__':
+    unittest.main()
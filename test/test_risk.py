@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Unit tests for tatc.risk module.
+"""
+
+import unittest
+import numpy as np
+
+from tatc import *
+
+def build_mission(duration="P1Y"):
+    return MissionConcept(start="2017-08-01T00:00:00Z", duration=duration)
+
+def build_architecture(numberSatellites=2, numberPlanes=1, altitude=705):
+    satellite = Satellite(name="Test", mass=500, volume=2, power=400,
+        payload=Instrument(mass=100, power=80, mountType="MAST"))
+    constellation = Constellation(constellationType="DELTA_HOMOGENOUS",
+        numberSatellites=numberSatellites, numberPlanes=numberPlanes,
+        orbit=Orbit(orbitType="SUN_SYNCHRONOUS", altitude=altitude))
+    return Architecture(constellation=constellation.generate_constellations([satellite])[0])
+
+class TestRiskContext(unittest.TestCase):
+    def test_planes(self):
+        context = RiskContext(build_mission(), build_architecture(4, 2))
+        self.assertEqual(context.planes.tolist(), [0, 0, 1, 1])
+        self.assertEqual(context.designs.tolist(), [0, 0, 0, 0])
+        self.assertAlmostEqual(context.years, 365/365.25)
+
+class TestSampling(unittest.TestCase):
+    def test_common(self):
+        rng = np.random.default_rng(0)
+        events = sample_common(rng, 1000, [0.5, 0.5, 0.5], [0, 0, 1])
+        self.assertTrue(np.array_equal(events[:, 0], events[:, 1]))
+        self.assertFalse(np.array_equal(events[:, 0], events[:, 2]))
+    def test_weibull(self):
+        self.assertEqual(get_weibull_probability(0.5, 10., 0, 0), 0)
+        self.assertAlmostEqual(get_weibull_probability(1., 10., 0, 10.), 1 - np.exp(-1))
+
+class TestAnalyzeRisk(unittest.TestCase):
+    def test_entries(self):
+        risks = analyze_risk(build_mission(), build_architecture()).to_list()
+        self.assertEqual(len(risks), len(RISK_MODELS))
+        for risk in risks:
+            self.assertTrue(0 <= risk["likelihood"] <= 1)
+            self.assertIn(risk["consequence"], range(6))
+            self.assertEqual(risk["consequence"] > 0, risk["likelihood"] > 0)
+    def test_reproducible(self):
+        first = analyze_risk(build_mission(), build_architecture())
+        second = analyze_risk(build_mission(), build_architecture())
+        self.assertEqual(first.likelihood.tolist(), second.likelihood.tolist())
+        other = analyze_risk(build_mission(), build_architecture(), seed=1)
+        self.assertNotEqual(first.likelihood.tolist(), other.likelihood.tolist())
+    def test_ground_network(self):
+        architecture = build_architecture()
+        first = analyze_risk(build_mission(), architecture)
+        architecture.groundNetwork = GroundNetwork(numberStations=1)
+        second = analyze_risk(build_mission(), architecture)
+        self.assertEqual(first.likelihood.tolist(), second.likelihood.tolist())
+        self.assertEqual(get_seed(build_mission(), architecture),
+                         get_seed(build_mission(), build_architecture()))
+    def test_early_stopping(self):
+        analysis = analyze_risk(build_mission(), build_architecture(),
+                                tolerance=0.01, batchSize=500)
+        self.assertTrue(np.all(analysis.standardError < 0.01))
+        self.assertLess(analysis.numberTrials, DEFAULT_MAX_TRIALS)
+        self.assertEqual(analysis.numberTrials % 500, 0)
+        capped = analyze_risk(build_mission(), build_architecture(),
+                              tolerance=0, batchSize=500, maxTrials=1200)
+        self.assertEqual(capped.numberTrials, 1200)
+    def test_launch(self):
+        # satellites in one plane share a launch
+        analysis = analyze_risk(build_mission(), build_architecture(2, 1), tolerance=0.002)
+        j = [model.risk for model in RISK_MODELS].index("Risk of interrupted installation")
+        self.assertAlmostEqual(analysis.likelihood[j], LAUNCH_FAILURE_PROBABILITY, delta=0.01)
+        self.assertAlmostEqual(analysis.affected[j], 1.)
+    def test_drag(self):
+        j = [model.risk for model in RISK_MODELS].index(
+            "Risk of constellation formation change due to atmospheric drag")
+        low = build_architecture(altitude=300)
+        mitigated = analyze_risk(build_mission(), low, includePropulsion=True)
+        unmitigated = analyze_risk(build_mission(), low, includePropulsion=False)
+        self.assertGreater(unmitigated.likelihood[j], mitigated.likelihood[j])
+        self.assertEqual(analyze_risk(build_mission(), build_architecture(altitude=1200),
+            includePropulsion=False).likelihood[j], 0)
+    def test_empty(self):
+        analysis = analyze_risk(build_mission(), Architecture(constellation=Constellation()))
+        self.assertTrue(np.all(analysis.likelihood == 0))
+
+if __name__ == '__main__':
+    unittest.main()
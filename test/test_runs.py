@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Unit tests for tatc.runs module.
+"""
+
+import unittest
+import tempfile
+import shutil
+import os
+
+from tatc import *
+
+def build_search(duration="P1D"):
+    return TradespaceSearch(
+        mission=MissionConcept(start="2017-08-01T00:00:00Z", duration=duration),
+        designSpace=DesignSpace(launchers=[LaunchVehicle(name="A", cost=10)]),
+        settings=AnalysisSettings(includePropulsion=True))
+
+class TestModuleKeys(unittest.TestCase):
+    def test_get_input(self):
+        search = build_search()
+        self.assertEqual(get_input(search, "mission.duration"), "P1D")
+        self.assertEqual(get_input(search, "designSpace.launchers")[0].get("name"), "A")
+        self.assertEqual(get_input(search, "mission.target.latitude").get("maxValue"), 90)
+        self.assertIsNone(get_input(search, "mission.agency.agencyType"))
+
+    def test_get_module_keys(self):
+        keys = get_module_keys(build_search())
+        self.assertEqual(list(keys.keys()), list(MODULE_INPUTS.keys()))
+        self.assertEqual(keys, get_module_keys(build_search()))
+        # mission duration invalidates all modules
+        changed = get_module_keys(build_search(duration="P2D"))
+        self.assertTrue(all(keys[name] != changed[name] for name in keys))
+        # propulsion (drag) invalidates all modules
+        search = build_search()
+        search.settings.includePropulsion = False
+        changed = get_module_keys(search)
+        self.assertTrue(all(keys[name] != changed[name] for name in keys))
+        # output settings invalidate orbital and instrument analysis only
+        search = build_search()
+        search.settings.outputs = AnalysisOutputs(keplerianStates=False)
+        changed = get_module_keys(search)
+        self.assertEqual([name for name in keys if keys[name] != changed[name]],
+                         ["orbits", "instrument"])
+        # launch vehicles invalidate cost and launch only
+        search = build_search()
+        search.designSpace.launchers[0].cost = 20
+        changed = get_module_keys(search)
+        self.assertEqual([name for name in keys if keys[name] != changed[name]],
+                         ["cost_risk", "launch"])
+
+class TestRunRecord(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_save_load(self):
+        self.assertEqual(RunRecord.load(self.directory).architectures, {})
+        search = build_search()
+        keys = get_module_keys(search)
+        record = RunRecord(search.to_dict())
+        record.set_architecture("arch-0", "abc", keys)
+        record.set_architecture("arch-1", "def", [("orbits", keys["orbits"])])
+        record.set_architecture("arch-2", "abc")
+        record.save(self.directory)
+        self.assertEqual(os.listdir(self.directory), [RUN_FILE])
+        record = RunRecord.load(self.directory)
+        self.assertEqual(list(record.architectures.keys()), ["arch-0", "arch-1", "arch-2"])
+        self.assertEqual(record.get_directories()["abc"], ["arch-0", "arch-2"])
+        self.assertEqual(record.get_stale_modules("arch-0", keys), [])
+        self.assertEqual(record.get_stale_modules("arch-1", keys), ["instrument", "cost_risk", "launch"])
+        self.assertEqual(record.get_stale_modules("arch-3", keys), list(keys.keys()))
+        self.assertEqual(record.get_changes(search), [])
+        self.assertEqual(record.get_changes(build_search(duration="P2D")), ["mission.duration"])
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Unit tests for tatc.sampling module.
+"""
+
+import unittest
+import numpy as np
+
+from tatc import *
+
+class TestSobolSequence(unittest.TestCase):
+    def test_unscrambled(self):
+        points = SobolSequence(2, seed=False).draw(4)
+        np.testing.assert_array_equal(points, [[0, 0], [0.5, 0.5], [0.75, 0.25], [0.25, 0.75]])
+
+    def test_stratification(self):
+        points = SobolSequence(MAX_DIMENSIONS, seed=0).draw(256)
+        self.assertTrue(np.all((points >= 0) & (points < 1)))
+        # each prefix of 2^m points has one point in each interval of 1/2^m
+        for m in range(9):
+            for d in range(MAX_DIMENSIONS):
+                self.assertEqual(len(set((points[:2**m, d]*2**m).astype(int))), 2**m)
+        # the first two dimensions are a (0,m,2)-net
+        for a in range(9):
+            cells = (points[:, 0]*2**a).astype(int)*2**(8 - a) + (points[:, 1]*2**(8 - a)).astype(int)
+            self.assertEqual(len(set(cells)), 256)
+
+    def test_seed(self):
+        np.testing.assert_array_equal(SobolSequence(3, seed=1).draw(8), SobolSequence(3, seed=1).draw(8))
+        self.assertFalse(np.array_equal(SobolSequence(3, seed=1).draw(8), SobolSequence(3, seed=2).draw(8)))
+
+    def test_dimensions(self):
+        with self.assertRaises(ValueError):
+            SobolSequence(MAX_DIMENSIONS + 1)
+
+class TestSampleValue(unittest.TestCase):
+    def test_sample_value(self):
+        self.assertEqual(sample_value(QuantitativeRange(500, 700), (500, 700), 0.25), 550)
+        self.assertEqual(sample_value([1, 2, 3], (1, 2, 3), 0.5), 2)
+        self.assertEqual(sample_value([1, 2, 3], (1, 2, 3), 1.0), 3)
+        self.assertEqual(get_index(0.99, 4), 3)
@@ -6,6 +6,11 @@
 
 import unittest
 import json
+import math
+import time
+import isodate
+import datetime
+import numpy as np
 
 from tatc import *
 
@@ -201,6 +206,147 @@ class TestOrbitCircular(unittest.TestCase):
         for i in range(3*2):
             self.assertIsInstance(list(o)[i], Orbit)
 
+class TestOrbitHelpers(unittest.TestCase):
+    def setUp(self):
+        self.altitudes = np.linspace(200, 2000, 1001)
+    def test_vectorized(self):
+        for function in (Orbit.get_orbital_period, Orbit.get_sso_inclination):
+            values = function(self.altitudes)
+            self.assertEqual(values.shape, self.altitudes.shape)
+            # scalar and array evaluations are identical
+            self.assertEqual([function(altitude) for altitude in self.altitudes], values.tolist())
+    def test_reference(self):
+        # agrees with closed-form scalar expressions to machine precision
+        re, mu = 6378.14, 3.98600440*(10**5)
+        period = [2*math.pi*math.sqrt(((re + h)**3)/mu) for h in self.altitudes]
+        inclination = [math.degrees(math.acos((((re + h)/re)**3.5)/(-10.10949))) for h in self.altitudes]
+        np.testing.assert_array_max_ulp(Orbit.get_orbital_period(self.altitudes), period, maxulp=2)
+        np.testing.assert_array_max_ulp(Orbit.get_sso_inclination(self.altitudes), inclination, maxulp=2)
+        self.assertEqual(Orbit.get_semimajor_axis(500), re + 500)
+    def test_memoized(self):
+        Orbit.get_sso_inclination.cache_clear()
+        Orbit.get_sso_inclination(705)
+        Orbit.get_sso_inclination(705.0)
+        self.assertEqual(Orbit.get_sso_inclination.cache_info().hits, 1)
+        self.assertLessEqual(Orbit.get_sso_inclination.cache_info().maxsize, MEMO_SIZE)
+
+class TestOrbitPlan(unittest.TestCase):
+    def test_compile(self):
+        p = Orbit(orbitType="SUN_SYNCHRONOUS", altitude=QuantitativeRange(500, 700, numberSteps=3)).compile()
+        self.assertEqual(len(p.orbits), 3)
+        for altitude, period, inclination, orbit in zip(p.altitudes, p.periods, p.ssoInclinations, p.orbits):
+            self.assertEqual(orbit.altitude, altitude)
+            self.assertEqual(orbit.inclination, Orbit.get_sso_inclination(altitude))
+            self.assertEqual(period, Orbit.get_orbital_period(altitude))
+        self.assertFalse(p.periods.flags.writeable)
+
+    def test_sample_orbit(self):
+        p = Orbit(orbitType="CIRCULAR", altitude=QuantitativeRange(500, 700, numberSteps=3),
+                  inclination=[30, 60]).compile()
+        orbit = p.sample_orbit(0.25, 0.75)
+        self.assertEqual(orbit.altitude, 550)
+        self.assertEqual(orbit.inclination, 60)
+        self.assertIsNone(orbit._id)
+        orbit = Orbit(altitude=[500, 600], inclination="SSO").compile().sample_orbit(0.99, 0)
+        self.assertEqual(orbit.altitude, 600)
+        self.assertEqual(orbit.inclination, Orbit.get_sso_inclination(600))
+
+class TestConstellationPlan(unittest.TestCase):
+    def test_structures(self):
+        p = Constellation(constellationType="DELTA_HOMOGENOUS", numberSatellites=[1, 2],
+            numberPlanes=[1, 2], relativeSpacing=[0, 1], orbit=Orbit(altitude=500, inclination=50)).compile()
+        self.assertEqual(p.structures, ((1, 0), (2, 0), (2, 1)))
+        self.assertEqual(p.get_structures(1), ((1, 0),))
+        self.assertEqual(len(p.get_constellations()), 1 + 3)
+        self.assertEqual(p.count(2), 2*(1 + 3))
+        self.assertEqual(len(p.generate_constellations([Satellite(), Satellite()])), 2*(1 + 3))
+
+    def test_sample_constellation(self):
+        p = Constellation(constellationType="DELTA_HOMOGENOUS", numberSatellites=[1, 2],
+            numberPlanes=[1, 2], relativeSpacing=[0, 1], orbit=Orbit(altitude=500, inclination=50)).compile()
+        constellation = p.sample_constellation((0, 0.9, 0, 0, 0))
+        self.assertEqual((constellation.numberSatellites, constellation.numberPlanes), (1, 1))
+        constellation = p.sample_constellation((0.9, 0.9, 0, 0, 0))
+        self.assertEqual((constellation.numberSatellites, constellation.numberPlanes,
+                          constellation.relativeSpacing), (2, 2, 1))
+        p = Constellation(constellationType="DELTA_HOMOGENOUS", numberSatellites=1,
+            numberPlanes=2, orbit=Orbit(altitude=500, inclination=50)).compile()
+        self.assertIsNone(p.sample_constellation((0, 0, 0, 0, 0)))
+
+    def test_select_combination(self):
+        satellites = [Satellite(name="A"), Satellite(name="B"), Satellite(name="C")]
+        for constellationType in ["DELTA_HOMOGENOUS", "DELTA_HETEROGENEOUS"]:
+            constellation = Constellation(constellationType=constellationType, numberSatellites=4,
+                numberPlanes=2, orbit=Orbit(altitude=500, inclination=50))
+            expected = constellation.select_satellites(satellites)
+            for index, members in enumerate(expected):
+                self.assertEqual(constellation.select_combination(satellites, index).to_dict(),
+                                 members.to_dict())
+
+class TestConstellationState(unittest.TestCase):
+    def build_constellation(self, orbit, constellationType="DELTA_HOMOGENOUS"):
+        return Constellation(constellationType=constellationType,
+            numberSatellites=6, numberPlanes=3, relativeSpacing=1, orbit=orbit)
+    def test_generate(self):
+        satellites = [Satellite(name="A", mass=100, payload=Instrument(name="I", fieldOfView=60)),
+                      Satellite(name="B", mass=200)]
+        for orbit in [Orbit(orbitType="SUN_SYNCHRONOUS", altitude=705),
+                      Orbit(orbitType="CIRCULAR", altitude=500, inclination=50),
+                      Orbit(altitude=500, inclination="SSO")]:
+            for constellationType in ["DELTA_HOMOGENOUS", "DELTA_HETEROGENEOUS"]:
+                constellation = self.build_constellation(orbit, constellationType)
+                expected = constellation.generate_constellations(satellites)
+                states = constellation.generate_constellations(satellites, state=True)
+                self.assertEqual(len(states), len(expected))
+                for state, members in zip(states, expected):
+                    self.assertIsInstance(state.satellites, ConstellationState)
+                    self.assertEqual(state.to_dict(), members.to_dict())
+                    self.assertEqual(state.fingerprint(), members.fingerprint())
+    def test_round_trip(self):
+        satellites = self.build_constellation(Orbit(orbitType="CIRCULAR", altitude=500,
+            inclination=50)).generate_constellations([Satellite(name="A")])[0].satellites
+        satellites.append(Satellite(name="B"))
+        satellites[0].orbit.localSolarTimeAscendingNode = "10:30"
+        state = ConstellationState.from_satellites(satellites)
+        self.assertEqual(len(state), 7)
+        self.assertEqual(len(state.templates), 2)
+        self.assertEqual(len(state.orbitTemplates), 2)
+        self.assertEqual(state.orbitTemplate[-1], -1)
+        self.assertEqual(state.to_list(), [satellite.to_dict() for satellite in satellites])
+        # integer elements are restored as integers
+        self.assertIsInstance(state.get_satellite(0).orbit.inclination, int)
+    def test_fingerprint(self):
+        satellites = [Satellite(name="A"), Satellite(name="B")]
+        constellation = self.build_constellation(Orbit(orbitType="CIRCULAR", altitude=500,
+            inclination=50), "DELTA_HETEROGENEOUS").select_combination(satellites, 3, state=True)
+        state = constellation.satellites
+        # templates in another order describe the same member satellites
+        reordered = ConstellationState(state.templates[::-1], state.orbitTemplates,
+            len(state.templates) - 1 - state.template, state.orbitTemplate, state.columns,
+            state.integral)
+        self.assertEqual(reordered.fingerprint(), state.fingerprint())
+        self.assertEqual(reordered.to_list(), state.to_list())
+        self.assertEqual(constellation.fingerprint(), Constellation.from_json(
+            constellation.to_json()).fingerprint())
+        changed = ConstellationState(state.templates, state.orbitTemplates, state.template,
+            state.orbitTemplate, dict(state.columns, trueAnomaly=state.columns["trueAnomaly"] + 1),
+            state.integral)
+        self.assertNotEqual(changed.fingerprint(), state.fingerprint())
+    def test_large(self):
+        constellation = Constellation(constellationType="DELTA_HOMOGENOUS",
+            numberSatellites=100000, numberPlanes=100, relativeSpacing=1,
+            orbit=Orbit(orbitType="SUN_SYNCHRONOUS", altitude=550))
+        state = constellation.generate_delta_state([Satellite(name="A")]*100000)
+        self.assertEqual(len(state), 100000)
+        self.assertEqual(len(state.templates), 1)
+        self.assertLess(state.nbytes, 100*100000)
+        self.assertEqual(state.columns["rightAscensionAscendingNode"][-1], 99*360./100)
+        # fingerprints do not expand member satellites
+        constellation.satellites = state
+        start = time.time()
+        self.assertEqual(constellation.fingerprint(), constellation.fingerprint())
+        self.assertLess(time.time() - start, 1.0)
+
 class TestConstellationDeltaHomogeneous(unittest.TestCase):
     def test_from_json_basic(self):
         o = Constellation.from_json('{"constellationType": "DELTA_HOMOGENOUS", "numberSatellites": 2, "numberPlanes": 2, "orbit": {"orbitType": "circular", "altitude": 405, "inclination": 51.64}}')
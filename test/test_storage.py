@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Unit tests for tatc.storage module.
+"""
+
+import unittest
+import os
+import shutil
+import tempfile
+import collections
+import numpy as np
+
+from tatc import *
+
+class TestArrays(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'test.bin')
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    def test_round_trip(self):
+        records = np.zeros(3, dtype=ACCESS_DTYPE)
+        records['point'] = [4, 5, 6]
+        records['end'] = [1.5, 2.5, 3.5]
+        write_arrays(self.path, collections.OrderedDict([
+            ("values", np.arange(12.).reshape(3, 4)),
+            ("records", records),
+            ("empty", np.zeros((0, 3)))
+        ]), {"name": "test"})
+        for mmap in [True, False]:
+            arrays, attributes = read_arrays(self.path, mmap)
+            self.assertEqual(list(arrays.keys()), ["values", "records", "empty"])
+            self.assertEqual(attributes, {"name": "test"})
+            self.assertEqual(arrays["values"].tolist(), np.arange(12.).reshape(3, 4).tolist())
+            self.assertEqual(arrays["records"].dtype, ACCESS_DTYPE)
+            self.assertEqual(arrays["records"]['point'].tolist(), [4, 5, 6])
+            self.assertEqual(arrays["records"]['end'].tolist(), [1.5, 2.5, 3.5])
+            self.assertEqual(arrays["empty"].shape, (0, 3))
+    def test_memory_map(self):
+        write_arrays(self.path, {"values": np.arange(100)})
+        arrays, attributes = read_arrays(self.path)
+        self.assertIsInstance(arrays["values"], np.memmap)
+        self.assertEqual(arrays["values"].offset % ALIGNMENT, 0)
+    def test_invalid(self):
+        with open(self.path, 'w') as outfile:
+            outfile.write('access,point\n')
+        with self.assertRaises(ValueError):
+            read_arrays(self.path)
+
+class TestArchitecture(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        constellation = Constellation(constellationType="DELTA_HOMOGENOUS",
+            numberSatellites=6, numberPlanes=3, relativeSpacing=1,
+            orbit=Orbit(orbitType="SUN_SYNCHRONOUS", altitude=705))
+        constellation = constellation.generate_constellations(
+            [Satellite(name="Test", mass=100, payload=Instrument(name="I", fieldOfView=60))])[0]
+        architecture = Architecture(constellation=constellation,
+            groundNetwork=GroundNetwork(numberStations=1,
+                groundStations=[GroundStation(latitude=40, longitude=-75)]))
+        # compare with an architecture parsed from JSON
+        self.architecture = Architecture.from_json(architecture.to_json())
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    def test_round_trip(self):
+        path = os.path.join(self.directory, ARCHITECTURE_BIN)
+        write_architecture(path, self.architecture)
+        architecture = read_architecture(path)
+        state = architecture.constellation.satellites
+        self.assertIsInstance(state, ConstellationState)
+        self.assertEqual(len(state.templates), 1)
+        self.assertIsInstance(state.columns["trueAnomaly"], np.memmap)
+        self.assertEqual(architecture.to_dict(), self.architecture.to_dict())
+        self.assertEqual(architecture.fingerprint(), self.architecture.fingerprint())
+        # the fingerprint of member satellites is read from the header
+        arrays, attributes = read_arrays(path)
+        self.assertEqual(attributes["fingerprint"], state.fingerprint())
+    def test_load(self):
+        with open(os.path.join(self.directory, ARCHITECTURE_JSON), 'w') as outfile:
+            self.architecture.to_json(outfile)
+        self.assertIsInstance(load_architecture(self.directory).constellation.satellites, list)
+        write_architecture(os.path.join(self.directory, ARCHITECTURE_BIN), self.architecture)
+        architecture = load_architecture(self.directory)
+        self.assertIsInstance(architecture.constellation.satellites, ConstellationState)
+    def test_no_satellites(self):
+        path = os.path.join(self.directory, ARCHITECTURE_BIN)
+        write_architecture(path, Architecture(constellation=Constellation()))
+        self.assertIsNone(read_architecture(path).constellation.satellites)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""Unit tests for tatc.trace module.
+"""
+
+import unittest
+import json
+import os
+import tempfile
+
+from tatc import *
+
+class TestTracer(unittest.TestCase):
+    def test_disabled(self):
+        tracer = Tracer()
+        with tracer.span("parse") as s:
+            pass
+        self.assertIs(s, NULL_SPAN)
+        self.assertEqual(len(tracer.spans), 0)
+    def test_span(self):
+        tracer = Tracer(enabled=True)
+        with tracer.span("orbits", arch="arch-0"):
+            pass
+        with tracer.span("orbits", arch="arch-1"):
+            pass
+        self.assertEqual(len(tracer.spans), 2)
+        self.assertEqual(tracer.spans[1].args, {"arch": "arch-1"})
+        self.assertGreaterEqual(tracer.spans[0].duration, 0)
+    def test_exception(self):
+        tracer = Tracer(enabled=True)
+        with self.assertRaises(ValueError):
+            with tracer.span("write"):
+                raise ValueError()
+        self.assertEqual(len(tracer.spans), 1)
+    def test_summary(self):
+        tracer = Tracer(enabled=True)
+        for i in range(1, 101):
+            s = Span(tracer, "launch", {})
+            s.start, s.duration, s.thread = 0, i*1000000, 0
+            tracer.spans.append(s)
+        summary = tracer.get_summary()["launch"]
+        self.assertEqual(summary["count"], 100)
+        self.assertAlmostEqual(summary["p50"], 0.0505)
+        self.assertAlmostEqual(summary["p95"], 0.09505)
+        self.assertAlmostEqual(summary["max"], 0.1)
+        self.assertIn("launch", tracer.format_summary())
+    def test_chrome_trace(self):
+        tracer = Tracer(enabled=True)
+        with tracer.span("parse"):
+            with tracer.span("enumerate"):
+                pass
+        path = os.path.join(tempfile.mkdtemp(), "trace.json")
+        tracer.write_chrome_trace(path)
+        with open(path) as infile:
+            events = json.load(infile)["traceEvents"]
+        self.assertEqual([e["name"] for e in events], ["parse", "enumerate"])
+        self.assertTrue(all(e["ph"] == "X" for e in events))
+        self.assertLessEqual(events[1]["ts"] + events[1]["dur"], events[0]["ts"] + events[0]["dur"])
+        os.remove(path)
+        os.rmdir(os.path.dirname(path))
+
+class TestSpan(unittest.TestCase):
+    def tearDown(self):
+        enable_tracing(False)
+        TRACER.clear()
+    def test_enable(self):
+        with span("parse"):
+            pass
+        self.assertEqual(len(TRACER.spans), 0)
+        enable_tracing()
+        with span("parse"):
+            pass
+        self.assertEqual(len(TRACER.spans), 1)
+
+if __name__ == '__main__':
+    unittest.main()
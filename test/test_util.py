@@ -6,6 +6,8 @@
 
 import unittest
 import json
+import itertools
+from numbers import Number
 
 from tatc import *
 
@@ -19,6 +21,9 @@ class TestEntity(unittest.TestCase):
     def test_hash(self):
         self.assertNotEqual(hash(Entity(_id="foo")), hash(Entity(_id="bar")))
         self.assertEqual(hash(Entity(_id="test")), hash(Entity(_id="test")))
+    def test_fingerprint(self):
+        self.assertEqual(QuantitativeValue(1, 2).fingerprint(), QuantitativeValue(1, 2).fingerprint())
+        self.assertNotEqual(QuantitativeValue(1, 2).fingerprint(), QuantitativeValue(1, 3).fingerprint())
     def test_to_json(self):
         d = json.loads(Entity().to_json())
         self.assertEqual(d.get("@type"), "Entity")
@@ -123,3 +128,13 @@ class TestQuantitativeRange(unittest.TestCase):
     def test_iter_end_points(self):
         o = QuantitativeRange.from_json('{"minValue": 1, "maxValue": 5}')
         self.assertEqual(sorted(list(o)), sorted([1,5]))
+
+class TestBinomial(unittest.TestCase):
+    def test_binomial(self):
+        self.assertEqual([get_binomial(5, k) for k in range(-1, 7)], [0, 1, 5, 10, 10, 5, 1, 0])
+        self.assertEqual(get_binomial(60, 30), 118264581564861424)
+    def test_multiset(self):
+        for n, k in [(1, 3), (3, 0), (4, 3), (5, 5)]:
+            self.assertEqual([get_multiset(n, k, index) for index in range(get_binomial(n + k - 1, k))],
+                             list(itertools.combinations_with_replacement(range(n), k)))
+        self.assertEqual(get_multiset(4, 40, get_binomial(43, 40) - 1), (3,)*40)